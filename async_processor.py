@@ -0,0 +1,223 @@
+"""
+Async PDF Processing Module
+asyncio front end for PDFProcessor, for use inside async services.
+
+Blocking work never runs on the event loop: each document is driven by a
+thread from a bounded pool, and OCR runs in one process pool shared by all
+documents. Page results are handed to the caller through a small queue, so
+a slow consumer pauses its document instead of letting results pile up.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pdf_processor import CancelToken, PDFProcessor, results_to_text
+from scheduler import MemoryBudget
+
+
+# Page results buffered per document before its extraction pauses
+DEFAULT_QUEUE_SIZE = 2
+
+# Documents extracted at the same time; later ones wait for a free slot
+DEFAULT_MAX_DOCUMENTS = 4
+
+
+class AsyncPDFProcessor:
+    """
+    Async wrapper sharing one PDFProcessor, OCR pool and optional memory
+    budget between any number of concurrent requests.
+    
+    Usage:
+        async with AsyncPDFProcessor(max_workers=4) as processor:
+            async for page in processor.iter_pages("scan.pdf", mode="ocr"):
+                ...
+    """
+    
+    def __init__(self, processor=None, max_documents=DEFAULT_MAX_DOCUMENTS,
+                 queue_size=DEFAULT_QUEUE_SIZE, memory_budget_mb=None, **processor_kwargs):
+        """
+        Initialize the async processor.
+        
+        Args:
+            processor (PDFProcessor): Processor to use. Created from
+                                      processor_kwargs when not given.
+            max_documents (int): Documents extracted at the same time
+            queue_size (int): Page results buffered per document
+            memory_budget_mb (float): Optional RAM budget for rendered pages,
+                                      shared by all documents
+            **processor_kwargs: Passed to PDFProcessor when processor is None
+        
+        Raises:
+            RuntimeError: If Tesseract is not installed or not found
+        """
+        self.processor = processor or PDFProcessor(**processor_kwargs)
+        self.queue_size = max(1, queue_size)
+        self.budget = MemoryBudget(memory_budget_mb) if memory_budget_mb else None
+        self._threads = ThreadPoolExecutor(
+            max_workers=max(1, max_documents), thread_name_prefix="async-document"
+        )
+        self._ocr_pool = None
+        self._pool_lock = threading.Lock()
+    
+    def _start_pool(self):
+        """Start the shared OCR pool on first use; blocks while workers start."""
+        with self._pool_lock:
+            if self._ocr_pool is None:
+                self._ocr_pool = self.processor.create_ocr_pool()
+            return self._ocr_pool
+    
+    async def iter_pages(self, pdf_path, mode="hybrid", cancel_token=None, **kwargs):
+        """
+        Extract a PDF and yield its pages as they are done, in page order.
+        
+        The document is extracted lazily, as in PDFProcessor.iter_pages(): when
+        queue_size results are waiting to be consumed, no further pages are
+        rendered or OCR'd. Leaving the loop early, or cancelling the task
+        that runs it, stops the document and cancels its queued OCR work.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            mode (str): "text", "ocr", "hybrid" or "regions"
+            cancel_token (CancelToken): Optional token to stop the job from
+                                        elsewhere
+            **kwargs: Passed on to PDFProcessor.iter_pages(). A
+                      progress_callback is called from a worker thread.
+        
+        Yields:
+            PageResult: One per requested page
+        
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            ExtractionCancelled: If cancel_token was cancelled
+            ExtractionTimeout: If job_timeout was exceeded
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        token = cancel_token or CancelToken()
+        if self.budget is not None:
+            kwargs.setdefault("memory", self.budget.share())
+        ocr_pool = None
+        if mode != "text":
+            ocr_pool = await loop.run_in_executor(None, self._start_pool)
+        
+        def produce():
+            # Runs in a document thread; blocks while the queue is full
+            def put(item):
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+            
+            results = self.processor.iter_pages(
+                pdf_path, mode=mode, cancel_token=token, ocr_pool=ocr_pool, **kwargs
+            )
+            try:
+                for result in results:
+                    put(("page", result))
+                    if stopped:
+                        break
+            except BaseException as e:
+                put(("error", e))
+            finally:
+                results.close()
+                put(("done", None))
+        
+        stopped = False
+        producer = asyncio.wrap_future(self._threads.submit(produce))
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "page":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    break
+        finally:
+            if not producer.done():
+                # Stop the document, then drain so a blocked producer can finish
+                stopped = True
+                token.cancel()
+                while not producer.done():
+                    getter = asyncio.ensure_future(queue.get())
+                    await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+                    if not getter.done():
+                        getter.cancel()
+    
+    async def _extract(self, pdf_path, mode, page_callback=None, **kwargs):
+        """Collect a document's pages into the text the extract methods return."""
+        results = []
+        async for result in self.iter_pages(pdf_path, mode=mode, **kwargs):
+            results.append(result)
+            if page_callback:
+                page_callback(result.page, result.text)
+        return results_to_text(results, mode, kwargs.get("profile"))
+    
+    async def extract_text_from_pdf(self, pdf_path, **kwargs):
+        """
+        Async version of PDFProcessor.extract_text_from_pdf().
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            **kwargs: page_callback, plus any argument of iter_pages()
+        
+        Returns:
+            str: Extracted text from all pages
+        """
+        return await self._extract(pdf_path, "text", **kwargs)
+    
+    async def extract_text_with_ocr(self, pdf_path, **kwargs):
+        """
+        Async version of PDFProcessor.extract_text_with_ocr().
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            **kwargs: page_callback, plus any argument of iter_pages()
+        
+        Returns:
+            str: OCR-extracted text from all pages
+        """
+        return await self._extract(pdf_path, "ocr", **kwargs)
+    
+    async def extract_text_hybrid(self, pdf_path, **kwargs):
+        """
+        Async version of PDFProcessor.extract_text_hybrid().
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            **kwargs: page_callback, plus any argument of iter_pages()
+        
+        Returns:
+            str: Extracted text from all pages
+        """
+        return await self._extract(pdf_path, "hybrid", **kwargs)
+    
+    async def extract_text_regions(self, pdf_path, **kwargs):
+        """
+        Async version of PDFProcessor.extract_text_regions().
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            **kwargs: page_callback, plus any argument of iter_pages()
+        
+        Returns:
+            str: Extracted text from all pages
+        """
+        return await self._extract(pdf_path, "regions", **kwargs)
+    
+    async def aclose(self):
+        """Shut down the document threads and the OCR pool."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close)
+    
+    def close(self):
+        """Blocking version of aclose()."""
+        self._threads.shutdown(wait=True, cancel_futures=True)
+        with self._pool_lock:
+            if self._ocr_pool is not None:
+                self._ocr_pool.shutdown(wait=True, cancel_futures=True)
+                self._ocr_pool = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
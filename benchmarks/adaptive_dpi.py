@@ -0,0 +1,89 @@
+"""
+Adaptive DPI Benchmark
+Compares OCR time and word accuracy of fixed render resolutions with the
+adaptive ("auto") resolution on scans in a range of font sizes.
+
+Usage:
+    python benchmarks/adaptive_dpi.py [--dpis 200 300 auto] [--pages 10] [--per-page]
+
+Accuracy is measured against the text drawn on the synthetic pages, as the
+share of words that line up between the expected and the recognized text.
+"""
+
+import argparse
+import difflib
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cli import dpi_argument
+from corpus import FONT_SIZES, expected_text, make_pdf
+from pdf_processor import PDFProcessor
+
+
+def word_accuracy(expected, recognized):
+    """Share of words that match between two texts, from 0.0 to 1.0."""
+    return difflib.SequenceMatcher(None, expected.split(), recognized.split()).ratio()
+
+
+def run(pdf_path, dpi, expected, workers):
+    """
+    OCR the PDF at one DPI setting.
+    
+    Returns:
+        tuple: (ExtractionProfile, {page_num: accuracy})
+    """
+    pages = {}
+    processor = PDFProcessor(max_workers=workers, dpi=dpi)
+    _, profile = processor.extract_with_profile(
+        pdf_path, mode="ocr",
+        page_callback=lambda page_num, text: pages.update({page_num: text})
+    )
+    accuracy = {
+        page_num: word_accuracy(expected[page_num - 1], text)
+        for page_num, text in pages.items()
+    }
+    return profile, accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dpis", nargs="+", type=dpi_argument, default=[200, 300, "auto"],
+                        help="Settings to compare (default: 200 300 auto)")
+    parser.add_argument("--pages", type=int, default=len(FONT_SIZES) * 2,
+                        help="Pages in the synthetic PDF (default: %(default)s)")
+    parser.add_argument("--workers", type=int, help="OCR worker processes")
+    parser.add_argument("--per-page", action="store_true",
+                        help="Also print the DPI and accuracy of every page")
+    args = parser.parse_args()
+    
+    expected = expected_text("fonts", args.pages)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "fonts.pdf")
+        make_pdf(pdf_path, "fonts", args.pages)
+        
+        print(f"OCR of {args.pages} scanned pages in font sizes {FONT_SIZES}\n")
+        print(f"{'DPI':<6} {'Seconds':>9} {'Pages/s':>9} {'Render s':>9} {'OCR s':>9} "
+              f"{'Mean DPI':>9} {'Accuracy':>9}")
+        
+        for dpi in args.dpis:
+            profile, accuracy = run(pdf_path, dpi, expected, args.workers)
+            summary = profile.summary()
+            mean_accuracy = sum(accuracy.values()) / len(accuracy) if accuracy else 0.0
+            print(f"{dpi!s:<6} {summary['total_s']:>9.2f} {summary['pages_per_sec']:>9.2f} "
+                  f"{summary['render_s']:>9.2f} {summary['ocr_s']:>9.2f} "
+                  f"{summary['mean_dpi'] or 0:>9.0f} {mean_accuracy:>8.1%}")
+            
+            if args.per_page:
+                for page in sorted(profile.pages, key=lambda page: page["page"]):
+                    fontsize = FONT_SIZES[(page["page"] - 1) % len(FONT_SIZES)]
+                    print(f"    page {page['page']:>3}  {fontsize:>2}pt  {page['dpi']:>4} DPI  "
+                          f"{page['ocr_s']:6.2f}s  {accuracy.get(page['page'], 0.0):6.1%}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Synthetic Benchmark Corpus
+Deterministic test PDFs generated with PyMuPDF, so benchmark runs on
+different machines and commits measure the same documents.
+
+Usage:
+    python benchmarks/corpus.py out_dir/ [--scale 1.0]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+import fitz  # PyMuPDF
+
+
+WORDS = (
+    "invoice total amount payment account customer order shipping address "
+    "contract agreement section clause party date signature report quarter "
+    "revenue expense balance summary table figure page reference number"
+).split()
+
+# name -> (kind, page count at scale 1.0)
+CASES = {
+    "text": ("text", 20),
+    "scanned": ("scanned", 10),
+    "mixed": ("mixed", 10),
+    "large": ("text", 500),
+    "fonts": ("fonts", 10),
+}
+
+SCAN_DPI = 150
+
+# Font sizes the pages of the "fonts" kind cycle through
+FONT_SIZES = (7, 9, 12, 16, 24)
+
+
+def page_text(rng, page_num, lines=30):
+    """Return a page worth of pseudo-random but reproducible prose."""
+    text = [f"Page {page_num}", ""]
+    for _ in range(lines):
+        text.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 12))))
+    return "\n".join(text)
+
+
+def iter_pages(kind, pages, seed=0):
+    """
+    Describe the pages of a synthetic PDF.
+    
+    Yields:
+        tuple: (text, scanned, fontsize) for each page
+    """
+    rng = random.Random(f"{kind}-{pages}-{seed}")
+    for page_num in range(1, pages + 1):
+        if kind == "fonts":
+            fontsize = FONT_SIZES[(page_num - 1) % len(FONT_SIZES)]
+            # Fewer lines for larger type, so every page fits its text box
+            lines = max(3, int(24 * (10 / fontsize) ** 2))
+            yield page_text(rng, page_num, lines), True, fontsize
+        else:
+            scanned = kind == "scanned" or (kind == "mixed" and page_num % 2 == 0)
+            yield page_text(rng, page_num), scanned, 10
+
+
+def expected_text(kind, pages, seed=0):
+    """Return the text drawn on each page of a synthetic PDF, for accuracy checks."""
+    return [text for text, _, _ in iter_pages(kind, pages, seed)]
+
+
+def add_text_page(doc, text, fontsize=10):
+    """Append a page with a real text layer."""
+    page = doc.new_page()
+    page.insert_textbox(page.rect + (72, 72, -72, -72), text, fontsize=fontsize)
+
+
+def add_scanned_page(doc, text, fontsize=10):
+    """Append a page that is a single grayscale image of text, like a scan."""
+    source = fitz.open()
+    source_page = source.new_page()
+    source_page.insert_textbox(
+        source_page.rect + (72, 72, -72, -72), text, fontsize=fontsize
+    )
+    pix = source_page.get_pixmap(dpi=SCAN_DPI, colorspace=fitz.csGRAY)
+    page = doc.new_page()
+    page.insert_image(page.rect, pixmap=pix)
+    source.close()
+
+
+def make_pdf(path, kind, pages, seed=0):
+    """
+    Write one synthetic PDF.
+    
+    Args:
+        path (str): Output file path
+        kind (str): "text", "scanned", "mixed" (odd pages text, even pages
+                    scanned) or "fonts" (scans in a range of font sizes)
+        pages (int): Number of pages
+        seed (int): Seed for the page text
+    """
+    doc = fitz.open()
+    for text, scanned, fontsize in iter_pages(kind, pages, seed):
+        if scanned:
+            add_scanned_page(doc, text, fontsize)
+        else:
+            add_text_page(doc, text, fontsize)
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+
+def build_corpus(out_dir, scale=1.0, cases=None):
+    """
+    Generate the benchmark PDFs, reusing files that already exist.
+    
+    Args:
+        out_dir (str): Directory for the PDFs
+        scale (float): Multiplier for every case's page count
+        cases (list): Case names to build (default: all of CASES)
+    
+    Returns:
+        dict: case name -> PDF path
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for name in cases or CASES:
+        kind, pages = CASES[name]
+        pages = max(1, round(pages * scale))
+        path = os.path.join(out_dir, f"{name}_{pages}p.pdf")
+        if not os.path.exists(path):
+            make_pdf(path, kind, pages)
+        paths[name] = path
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out_dir")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiplier for page counts (default: %(default)s)")
+    args = parser.parse_args()
+    
+    for name, path in build_corpus(args.out_dir, args.scale).items():
+        print(f"{name:<8} {path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+OCR Engine Benchmark
+Measures the fixed per-page overhead and the full per-page time of each OCR
+engine, so the cost of starting tesseract for every page can be compared
+with keeping one libtesseract handle loaded.
+
+Usage:
+    python benchmarks/ocr_engines.py [path/to/file.pdf] [--pages 5] [--repeat 20]
+
+The overhead is the time spent on a tiny blank image, where there is next to
+nothing to recognize. Without a PDF argument, a synthetic scan is generated.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+
+from corpus import make_pdf
+from pdf_processor import DEFAULT_DPI, ENGINE_CLASSES, OCR_ENGINES, PDFProcessor, iter_page_images
+
+
+def time_calls(engine, images):
+    """Return the seconds each recognize() call took."""
+    times = []
+    for image in images:
+        start = time.perf_counter()
+        engine.recognize(image)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", nargs="?", help="PDF to OCR (default: synthetic scan)")
+    parser.add_argument("--pages", type=int, default=5,
+                        help="Pages of the PDF to OCR (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Blank images used to measure overhead (default: %(default)s)")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI)
+    parser.add_argument("--lang", default="eng")
+    args = parser.parse_args()
+    
+    # Sets the tesseract path the engines rely on
+    PDFProcessor(lang=args.lang, engine="pytesseract")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf
+        if not pdf_path:
+            pdf_path = os.path.join(tmp, "synthetic_scan.pdf")
+            make_pdf(pdf_path, "scanned", args.pages)
+        pages = list(iter_page_images(
+            pdf_path, dpi=args.dpi, page_numbers=range(1, args.pages + 1)
+        ))
+    blank = [Image.new("L", (64, 64), 255) for _ in range(args.repeat)]
+    
+    print(f"OCR of {len(pages)} pages from {pdf_path} at {args.dpi} DPI\n")
+    print(f"{'Engine':<12} {'Load ms':>9} {'Overhead ms/page':>17} {'Page ms':>9} {'Pages/s':>9}")
+    
+    for name in OCR_ENGINES:
+        start = time.perf_counter()
+        try:
+            engine = ENGINE_CLASSES[name](args.lang)
+        except Exception as e:
+            print(f"{name:<12} unavailable: {e}")
+            continue
+        load = time.perf_counter() - start
+        
+        try:
+            overhead = statistics.median(time_calls(engine, blank))
+            page_times = time_calls(engine, pages)
+        finally:
+            engine.close()
+        
+        page = statistics.median(page_times)
+        print(f"{name:<12} {load * 1000:>9.1f} {overhead * 1000:>17.1f} "
+              f"{page * 1000:>9.1f} {len(page_times) / sum(page_times):>9.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
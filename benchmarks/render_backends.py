@@ -0,0 +1,126 @@
+"""
+Render Backend Benchmark
+Compares render time and peak memory of the PyMuPDF and Poppler backends
+used to rasterize pages for OCR.
+
+Usage:
+    python benchmarks/render_backends.py [path/to/file.pdf] [--dpi 200] [--pages 20]
+
+Without a PDF argument, a synthetic scanned document is generated.
+Each backend runs in a fresh subprocess so peak memory figures don't mix.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import fitz  # PyMuPDF
+
+from pdf_processor import RENDER_BACKENDS, iter_page_images
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def make_scanned_pdf(path, pages):
+    """Create a PDF whose pages are full-page images of text, like a scan."""
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        source = fitz.open()
+        source_page = source.new_page()
+        source_page.insert_textbox(
+            source_page.rect + (72, 72, -72, -72),
+            f"Page {page_num}\n\n" + "The quick brown fox jumps over the lazy dog. " * 40,
+            fontsize=11
+        )
+        pix = source_page.get_pixmap(dpi=150, colorspace=fitz.csGRAY)
+        page = doc.new_page()
+        page.insert_image(page.rect, pixmap=pix)
+        source.close()
+    doc.save(path)
+    doc.close()
+
+
+def peak_rss_mb(who):
+    """Peak resident set size in MB for RUSAGE_SELF/RUSAGE_CHILDREN, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_backend(pdf_path, dpi, backend):
+    """Render every page with one backend and print the measurements as JSON."""
+    start = time.perf_counter()
+    pages = 0
+    for image in iter_page_images(pdf_path, dpi=dpi, backend=backend):
+        image.close()
+        pages += 1
+    elapsed = time.perf_counter() - start
+    
+    print(json.dumps({
+        "backend": backend,
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_sec": pages / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        "peak_child_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pdf", nargs="?", help="PDF to render (default: synthetic scan)")
+    parser.add_argument("--dpi", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=20,
+                        help="Page count of the synthetic PDF")
+    parser.add_argument("--backend", choices=RENDER_BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    # Child mode: measure a single backend in this process
+    if args.backend:
+        run_backend(args.pdf, args.dpi, args.backend)
+        return
+    
+    def fmt(value):
+        return f"{value:9.1f}" if value is not None else f"{'n/a':>9}"
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf
+        if not pdf_path:
+            pdf_path = os.path.join(tmp, "synthetic_scan.pdf")
+            make_scanned_pdf(pdf_path, args.pages)
+        
+        print(f"Rendering {pdf_path} at {args.dpi} DPI\n")
+        print(f"{'Backend':<10} {'Pages':>6} {'Seconds':>9} {'Pages/s':>9} "
+              f"{'Peak MB':>9} {'Child MB':>9}")
+        
+        for backend in RENDER_BACKENDS:
+            proc = subprocess.run(
+                [sys.executable, __file__, pdf_path, "--dpi", str(args.dpi),
+                 "--backend", backend],
+                capture_output=True, text=True
+            )
+            if proc.returncode != 0:
+                error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+                print(f"{backend:<10} error: {error}")
+                continue
+            
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{backend:<10} {result['pages']:>6} {result['seconds']:>9.2f} "
+                  f"{result['pages_per_sec']:>9.1f} {fmt(result['peak_rss_mb'])} "
+                  f"{fmt(result['peak_child_rss_mb'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Startup Time Benchmark
+Measures how long the desktop application takes to import and to show an
+interactive window, and checks that the heavy PDF and OCR libraries are not
+loaded before the window appears.
+
+Usage:
+    python benchmarks/startup.py [--repeat 5] [--max-ms 1500] [--no-gui]
+
+Every measurement runs in a fresh interpreter, so nothing is warm from a
+previous run. The window measurement needs a display and is skipped without
+one. Exit status is 1 when a heavy module is imported eagerly or the median
+time to an interactive window exceeds --max-ms, so the script can gate CI.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must only be loaded by the background thread of main.py,
+# never by importing it
+HEAVY_MODULES = ("fitz", "pytesseract", "pdf2image", "PIL", "tesserocr", "numpy")
+
+# Run in a fresh interpreter; prints one JSON line
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+seconds = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+WINDOW_PROBE = """
+import json, time
+start = time.perf_counter()
+import tkinter as tk
+import main
+root = tk.Tk()
+app = main.PDFOCRApp(root)
+root.update()
+seconds = time.perf_counter() - start
+root.destroy()
+# The processor is already loading in the background here, so only the
+# import probe can tell which modules were loaded eagerly
+print(json.dumps({{"seconds": seconds, "heavy": []}}))
+"""
+
+
+def run_probe(code):
+    """
+    Run a probe script from the repository root.
+    
+    Returns:
+        dict: The probe's result, or None if it failed (e.g. no display)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-c", code.format(heavy=HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        print(f"  probe failed: {lines[-1] if lines else 'no output'}", file=sys.stderr)
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(name, code, repeat):
+    """Run a probe repeat times and print its median time."""
+    results = [run_probe(code) for _ in range(repeat)]
+    if any(result is None for result in results):
+        print(f"{name:<8} skipped")
+        return None
+    median = statistics.median(result["seconds"] for result in results)
+    heavy = sorted({module for result in results for module in result["heavy"]})
+    print(f"{name:<8} {median * 1000:8.1f} ms   eager heavy modules: {', '.join(heavy) or 'none'}")
+    return {"seconds": median, "heavy": heavy}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Fresh interpreters per measurement (default: %(default)s)")
+    parser.add_argument("--max-ms", type=float,
+                        help="Fail if the median time to an interactive window is higher")
+    parser.add_argument("--no-gui", action="store_true",
+                        help="Only measure the import, not the window")
+    args = parser.parse_args()
+    
+    results = {"import": measure("import", IMPORT_PROBE, args.repeat)}
+    if not args.no_gui:
+        results["window"] = measure("window", WINDOW_PROBE, args.repeat)
+    
+    failed = False
+    for name, result in results.items():
+        if result and result["heavy"]:
+            print(f"FAIL: {name} loaded {', '.join(result['heavy'])} before the window appeared")
+            failed = True
+    
+    timed = results.get("window") or results["import"]
+    if args.max_ms is not None and timed and timed["seconds"] * 1000 > args.max_ms:
+        print(f"FAIL: startup took {timed['seconds'] * 1000:.0f} ms, limit {args.max_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Extraction Throughput Benchmark
+Measures pages/sec, per-page latency percentiles and peak memory of text
+extraction and OCR on the synthetic corpus, and compares against a baseline.
+
+Usage:
+    python benchmarks/throughput.py [--output results.json] [--baseline old.json]
+                                    [--scale 0.5] [--repeat 3] [--max-regression 10]
+
+Each (case, method) pair runs in a fresh subprocess so peak memory figures
+don't mix. Exit status is 1 when --max-regression is exceeded against the
+baseline, so the script can gate CI.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cli import dpi_argument
+from corpus import CASES, build_corpus
+from ocr_profile import peak_rss_bytes
+from pdf_processor import DEFAULT_DPI, OCR_ENGINES, PDFProcessor
+
+
+# method -> cases it is measured on
+MATRIX = {
+    "text": ("text", "mixed", "large"),
+    "ocr": ("scanned", "mixed"),
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def page_latency(page):
+    """Seconds spent on one page across the stages that were timed."""
+    return sum(page[field] or 0.0 for field in (
+        "wait_s", "extract_s", "render_s", "preprocess_s", "ocr_s"
+    ))
+
+
+def run_case(pdf_path, method, repeat, dpi, workers, engine, preprocess):
+    """Run one (case, method) pair in this process and print the result as JSON."""
+    processor = PDFProcessor(
+        max_workers=workers, dpi=dpi, engine=engine, preprocess=preprocess
+    )
+    runs = []
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, profile = processor.extract_with_profile(pdf_path, mode=method)
+        seconds = time.perf_counter() - start
+        runs.append(seconds)
+        latencies.extend(page_latency(page) for page in profile.pages)
+    
+    pages = len(profile.pages)
+    seconds = statistics.median(runs)
+    
+    def mb(value):
+        return value / (1024 * 1024) if value is not None else None
+    
+    print(json.dumps({
+        "engine": processor.engine,
+        "pages": pages,
+        "runs": runs,
+        "seconds": seconds,
+        "pages_per_sec": pages / seconds if seconds else 0.0,
+        "latency_p50_s": percentile(latencies, 50),
+        "latency_p90_s": percentile(latencies, 90),
+        "latency_p99_s": percentile(latencies, 99),
+        "peak_rss_mb": mb(peak_rss_bytes()),
+        "peak_child_rss_mb": mb(peak_rss_bytes(children=True)),
+    }))
+
+
+def machine_info():
+    """Describe the environment the numbers were measured in."""
+    try:
+        import pytesseract
+        tesseract = str(pytesseract.get_tesseract_version())
+    except Exception:
+        tesseract = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "tesseract": tesseract,
+    }
+
+
+def compare(results, baseline, max_regression):
+    """
+    Print throughput changes against a baseline.
+    
+    Returns:
+        bool: True if any pair got slower by more than max_regression percent
+    """
+    previous = {(r["case"], r["method"]): r for r in baseline["results"] if "error" not in r}
+    regressed = False
+    
+    print(f"\nCompared with baseline from {baseline['machine'].get('timestamp', '?')}:")
+    for result in results:
+        old = previous.get((result["case"], result["method"]))
+        if old is None or "error" in result or not old["pages_per_sec"]:
+            continue
+        change = (result["pages_per_sec"] / old["pages_per_sec"] - 1) * 100
+        flag = ""
+        if max_regression is not None and change < -max_regression:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"  {result['case']:<8} {result['method']:<5} "
+              f"{old['pages_per_sec']:9.2f} -> {result['pages_per_sec']:9.2f} pages/s "
+              f"({change:+.1f}%){flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="Where to write the results (default: %(default)s)")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    parser.add_argument("--max-regression", type=float,
+                        help="Fail if pages/sec drops by more than this many percent")
+    parser.add_argument("--corpus-dir",
+                        help="Keep the generated PDFs here (default: temporary directory)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiplier for corpus page counts (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per case; the median time is reported (default: %(default)s)")
+    parser.add_argument("--methods", nargs="+", choices=MATRIX, default=list(MATRIX))
+    parser.add_argument("--dpi", type=dpi_argument, default=DEFAULT_DPI)
+    parser.add_argument("--workers", type=int, help="OCR worker processes")
+    parser.add_argument("--engine", choices=("auto",) + OCR_ENGINES, default="auto")
+    parser.add_argument("--preprocess", action="store_true",
+                        help="Binarize, deskew and trim pages before OCR")
+    parser.add_argument("--run", nargs=2, metavar=("PDF", "METHOD"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    # Child mode: measure a single case in this process
+    if args.run:
+        run_case(args.run[0], args.run[1], max(1, args.repeat), args.dpi, args.workers,
+                 args.engine, args.preprocess)
+        return 0
+    
+    def ms(value):
+        return f"{value * 1000:8.1f}" if value is not None else f"{'n/a':>8}"
+    
+    def mb(value):
+        return f"{value:8.1f}" if value is not None else f"{'n/a':>8}"
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus_dir or tmp
+        cases = sorted({case for method in args.methods for case in MATRIX[method]},
+                       key=list(CASES).index)
+        paths = build_corpus(corpus_dir, args.scale, cases)
+        
+        print(f"{'Case':<8} {'Method':<6} {'Pages':>6} {'Seconds':>9} {'Pages/s':>9} "
+              f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'Peak MB':>8} {'Child MB':>9}")
+        
+        results = []
+        for method in args.methods:
+            for case in MATRIX[method]:
+                command = [sys.executable, __file__, "--run", paths[case], method,
+                           "--repeat", str(args.repeat), "--dpi", str(args.dpi),
+                           "--engine", args.engine]
+                if args.workers:
+                    command += ["--workers", str(args.workers)]
+                if args.preprocess:
+                    command.append("--preprocess")
+                proc = subprocess.run(command, capture_output=True, text=True)
+                
+                result = {"case": case, "method": method}
+                if proc.returncode != 0:
+                    lines = proc.stderr.strip().splitlines()
+                    result["error"] = lines[-1] if lines else "failed"
+                    print(f"{case:<8} {method:<6} error: {result['error']}")
+                    results.append(result)
+                    continue
+                
+                result.update(json.loads(proc.stdout.strip().splitlines()[-1]))
+                results.append(result)
+                print(f"{case:<8} {method:<6} {result['pages']:>6} {result['seconds']:>9.2f} "
+                      f"{result['pages_per_sec']:>9.1f} {ms(result['latency_p50_s'])} "
+                      f"{ms(result['latency_p90_s'])} {ms(result['latency_p99_s'])} "
+                      f"{mb(result['peak_rss_mb'])} {mb(result['peak_child_rss_mb']):>9}")
+    
+    report = {
+        "machine": machine_info(),
+        "settings": {"scale": args.scale, "repeat": args.repeat, "dpi": args.dpi,
+                     "workers": args.workers, "engine": args.engine,
+                     "preprocess": args.preprocess},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,10 @@ import urllib.request
 import zipfile
 import shutil
 import subprocess
+import json
+import time
+import statistics
+import tempfile
 from pathlib import Path
 
 # Configuration
@@ -17,6 +21,15 @@ POPPLER_URL = "https://github.com/oschwartz10612/poppler-windows/releases/downlo
 TESSERACT_INSTALLER = "tesseract-installer.exe"
 POPPLER_ZIP = "poppler.zip"
 
+# Size and startup figures of the last build, compared against by the next one
+BUILD_REPORT = "build_report.json"
+
+# Launches of the built application used to time its startup
+STARTUP_RUNS = 3
+
+# Largest parts of the bundle listed in the report
+REPORT_TOP_ENTRIES = 10
+
 class Builder:
     def __init__(self):
         self.project_dir = Path(__file__).parent
@@ -134,10 +147,108 @@ class Builder:
         print(f"\nDistribution ready at: {app_dist}")
         return True
     
+    def measure_startup(self, app_dist):
+        """
+        Launch the built application in its report mode and time it.
+        
+        Returns:
+            dict: Median launch seconds (bootloader, unpacking and imports)
+                  and import seconds of the PDF libraries, or None on failure
+        """
+        exe_name = "PDF_OCR.exe" if sys.platform == 'win32' else "PDF_OCR"
+        exe_path = app_dist / exe_name
+        if not exe_path.exists():
+            return None
+        
+        launches = []
+        imports = []
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = Path(tmp) / "startup.json"
+            env = dict(os.environ, PDF_OCR_STARTUP_REPORT=str(report_path))
+            for _ in range(STARTUP_RUNS):
+                start = time.perf_counter()
+                try:
+                    subprocess.run([str(exe_path)], env=env, timeout=120, check=True)
+                except (subprocess.SubprocessError, OSError) as e:
+                    print(f"WARNING: Could not launch the application: {e}")
+                    return None
+                launches.append(time.perf_counter() - start)
+                imports.append(json.loads(report_path.read_text())["import_s"])
+        return {
+            "launch_s": statistics.median(launches),
+            "import_s": statistics.median(imports),
+        }
+    
+    def measure_build(self):
+        """Print the bundle's size and startup time next to the previous build's."""
+        print("\n" + "="*60)
+        print("STEP 5: Size and Startup Report")
+        print("="*60)
+        
+        app_dist = self.dist_dir / "PDF_OCR"
+        report_path = self.dist_dir / BUILD_REPORT
+        previous = None
+        if report_path.exists():
+            previous = json.loads(report_path.read_text())
+        
+        # Size per top-level entry, looking inside PyInstaller's _internal folder
+        entries = {}
+        total_bytes = 0
+        file_count = 0
+        for path in app_dist.rglob("*"):
+            if not path.is_file():
+                continue
+            size = path.stat().st_size
+            total_bytes += size
+            file_count += 1
+            parts = path.relative_to(app_dist).parts
+            key = "/".join(parts[:2]) if parts[0] == "_internal" and len(parts) > 1 else parts[0]
+            entries[key] = entries.get(key, 0) + size
+        
+        report = {
+            "total_bytes": total_bytes,
+            "file_count": file_count,
+            "entries": entries,
+        }
+        startup = self.measure_startup(app_dist)
+        if startup:
+            report.update(startup)
+        
+        def change(key, scale=1.0, unit="", digits=2):
+            if not previous or previous.get(key) is None or report.get(key) is None:
+                return ""
+            delta = (report[key] - previous[key]) * scale
+            percent = (report[key] / previous[key] - 1) * 100 if previous[key] else 0.0
+            return f"  ({delta:+.{digits}f}{unit}, {percent:+.1f}%)"
+        
+        mb = 1 / (1024 * 1024)
+        print(f"Bundle size:   {total_bytes * mb:8.2f} MB{change('total_bytes', mb, ' MB')}")
+        print(f"Files:         {file_count:8d}{change('file_count', digits=0)}")
+        if startup:
+            print(f"Launch time:   {startup['launch_s']:8.2f} s{change('launch_s', 1, ' s')}")
+            print(f"Import time:   {startup['import_s']:8.2f} s{change('import_s', 1, ' s')}")
+        else:
+            print("Launch time:        n/a")
+        
+        print("\nLargest parts of the bundle:")
+        largest = sorted(entries.items(), key=lambda item: item[1], reverse=True)
+        for name, size in largest[:REPORT_TOP_ENTRIES]:
+            before = (previous or {}).get("entries", {}).get(name)
+            note = f"  ({(size - before) * mb:+.2f} MB)" if before is not None else ""
+            print(f"  {size * mb:8.2f} MB  {name}{note}")
+        
+        if previous:
+            added = sorted(set(entries) - set(previous.get("entries", {})))
+            if added:
+                print(f"\nNew since the previous build: {', '.join(added)}")
+        
+        report_path.write_text(json.dumps(report, indent=2))
+        print(f"\nReport saved to: {report_path}")
+    
     def create_portable_zip(self):
         """Create a portable ZIP file."""
         print("\n" + "="*60)
-        print("STEP 5: Creating Portable ZIP")
+        print("STEP 6: Creating Portable ZIP")
         print("="*60)
         
         app_dist = self.dist_dir / "PDF_OCR"
@@ -168,6 +279,7 @@ class Builder:
             ("Installing PyInstaller", self.install_pyinstaller),
             ("Building executable", self.build_executable),
             ("Preparing distribution", self.prepare_distribution),
+            ("Measuring build", self.measure_build),
             ("Creating portable ZIP", self.create_portable_zip),
         ]
         
@@ -0,0 +1,322 @@
+"""
+PDF OCR Command-Line Interface
+Headless batch extraction of text from many PDFs at once.
+
+Usage:
+    python cli.py scans/ reports/*.pdf --mode hybrid --output-dir out/ --jobs 4
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import as_completed
+from pathlib import Path
+
+from ocr_cache import OCRCache
+from ocr_checkpoint import OCRCheckpoint
+from ocr_profile import ExtractionProfile
+from page_analysis import DEFAULT_BLANK_THRESHOLD
+from pdf_processor import (
+    ADAPTIVE_DPI, DEFAULT_DPI, EXTRACTION_MODES, OCR_ENGINES, RENDER_BACKENDS, PDFProcessor
+)
+from scheduler import DEFAULT_MEMORY_BUDGET_MB, DocumentScheduler
+from structured_output import OUTPUT_SUFFIXES, output_paths
+
+
+MODES = EXTRACTION_MODES
+
+# Outputs that are PDFs themselves (searchable copies), which a later run
+# over the same folder must not pick up as inputs
+OUTPUT_PDF_SUFFIXES = tuple(
+    suffix for suffix in OUTPUT_SUFFIXES.values() if suffix.lower().endswith(".pdf")
+)
+
+
+def is_output_pdf(path):
+    """True if a file is a searchable PDF written by this CLI."""
+    return str(path).lower().endswith(OUTPUT_PDF_SUFFIXES)
+
+
+def collect_inputs(patterns, recursive=False):
+    """
+    Expand file, directory and glob arguments into PDF paths.
+    
+    Args:
+        patterns (list): Paths, directories or glob patterns
+        recursive (bool): Descend into subdirectories of directory arguments
+    
+    Returns:
+        list: (pdf_path, relative_output_stem) tuples, without duplicates.
+              PDFs found under a directory keep their path relative to it.
+              Searchable PDFs written by earlier runs are left out, unless
+              named explicitly.
+    """
+    inputs = []
+    seen = set()
+    
+    def add(path, relative):
+        resolved = os.path.abspath(path)
+        if resolved not in seen:
+            seen.add(resolved)
+            inputs.append((path, relative))
+    
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            walker = Path(pattern).rglob("*") if recursive else Path(pattern).glob("*")
+            for path in sorted(walker):
+                if (path.is_file() and path.suffix.lower() == ".pdf"
+                        and not is_output_pdf(path)):
+                    add(str(path), path.relative_to(pattern).with_suffix(""))
+        elif os.path.isfile(pattern):
+            add(pattern, Path(Path(pattern).stem))
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                print(f"warning: no files match {pattern}", file=sys.stderr)
+            for match in matches:
+                if os.path.isfile(match) and not is_output_pdf(match):
+                    add(match, Path(Path(match).stem))
+    
+    return inputs
+
+
+def output_path_for(pdf_path, relative, output_dir):
+    """Return the .txt path for a PDF, next to it unless output_dir is given."""
+    if output_dir:
+        # Not with_suffix(): "report.v1" must keep its ".v1"
+        return Path(output_dir) / relative.with_name(relative.name + ".txt")
+    return Path(pdf_path).with_suffix(".txt")
+
+
+def is_up_to_date(pdf_path, output_path, formats=("txt",)):
+    """Check whether the outputs in every format exist and are newer than the PDF."""
+    pdf_mtime = os.path.getmtime(pdf_path)
+    return all(
+        path.exists() and path.stat().st_mtime >= pdf_mtime
+        for path in output_paths(output_path.with_suffix(""), formats).values()
+    )
+
+
+def process_document(processor, mode, pdf_path, output_path, page_timeout=None,
+                     job_timeout=None, profile=False, pages=None, resume=True,
+                     formats=("txt",), memory=None):
+    """
+    Extract text from one PDF and write it to output_path.
+    
+    Formats other than txt are written next to it under the same name with
+    their own suffix, all from a single extraction pass. Every output is
+    written to a temporary file first and renamed into place, so an
+    interrupted run never leaves a partial output that looks up to date.
+    With memory set, pages are only rendered while they fit its budget.
+    With profile set, per-stage timings are written to a .profile.json file
+    next to the output. With pages set, only that page range is extracted.
+    
+    OCR and hybrid jobs record finished pages in a .checkpoint.jsonl file
+    next to the output, so a run that is interrupted continues from there the
+    next time. With resume off, any existing checkpoint is discarded first.
+    
+    Returns:
+        tuple: (page_count, blank_pages, seconds) for the pages extracted, where
+               blank_pages counts pages skipped by blank page detection
+    """
+    start = time.perf_counter()
+    kwargs = {"pages": pages, "memory": memory}
+    checkpoint = None
+    if mode != "text":
+        checkpoint = OCRCheckpoint(output_path.with_suffix(".checkpoint.jsonl"))
+        if not resume:
+            checkpoint.remove()
+        kwargs.update(page_timeout=page_timeout, job_timeout=job_timeout,
+                      checkpoint=checkpoint)
+    report = ExtractionProfile()
+    processor.export(
+        pdf_path, output_path.with_suffix(""), formats, mode=mode, profile=report, **kwargs
+    )
+    if checkpoint is not None:
+        checkpoint.remove()
+    if profile:
+        report.write_report(output_path.with_suffix(".profile.json"))
+    
+    blank_pages = sum(1 for page in report.pages if page["source"] == "blank")
+    return len(report.pages), blank_pages, time.perf_counter() - start
+
+
+def dpi_argument(value):
+    """argparse type for --dpi: a positive integer or "auto"."""
+    if value == ADAPTIVE_DPI:
+        return value
+    try:
+        dpi = int(value)
+    except ValueError:
+        dpi = 0
+    if dpi <= 0:
+        raise argparse.ArgumentTypeError(
+            f"expected a positive integer or '{ADAPTIVE_DPI}', got '{value}'"
+        )
+    return dpi
+
+
+def build_parser():
+    """Create the argument parser."""
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(
+        description="Extract text from PDFs in batch, with OCR for scanned pages."
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="PDF files, directories or glob patterns")
+    parser.add_argument("-m", "--mode", choices=MODES, default="hybrid",
+                        help="text: embedded text only, ocr: OCR every page, "
+                             "hybrid: OCR only pages without text (default), "
+                             "regions: OCR only scanned images with text on each page")
+    parser.add_argument("-p", "--pages",
+                        help="Pages to extract from each PDF, e.g. 1-3,7,10- "
+                             "(default: all pages)")
+    parser.add_argument("-o", "--output-dir",
+                        help="Directory for outputs (default: next to each PDF)")
+    parser.add_argument("--formats", nargs="+", choices=OUTPUT_SUFFIXES, default=["txt"],
+                        help="Outputs to write per PDF: txt, json (words with boxes and "
+                             "confidences, .jsonl), hocr, pdf (searchable copy, "
+                             ".searchable.pdf) (default: txt)")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="Search directories recursively")
+    parser.add_argument("-j", "--jobs", type=int, default=min(4, cpu_count),
+                        help="Documents processed at the same time (default: %(default)s)")
+    parser.add_argument("--memory-budget", type=float, default=DEFAULT_MEMORY_BUDGET_MB,
+                        metavar="MB",
+                        help="RAM that rendered pages of all running documents may "
+                             "use together (default: %(default)s)")
+    parser.add_argument("--ocr-workers", type=int,
+                        help="OCR worker processes per document "
+                             "(default: CPU cores divided by --jobs)")
+    parser.add_argument("--dpi", type=dpi_argument, default=DEFAULT_DPI,
+                        help="OCR render resolution, or 'auto' to choose one per page "
+                             "from the size of its text (default: %(default)s)")
+    parser.add_argument("--lang", default="eng",
+                        help="Tesseract language(s), e.g. eng+por (default: %(default)s)")
+    parser.add_argument("--render-backend", choices=RENDER_BACKENDS, default="pymupdf")
+    parser.add_argument("--engine", choices=("auto",) + OCR_ENGINES, default="auto",
+                        help="OCR engine; auto uses tesserocr when installed (default: %(default)s)")
+    parser.add_argument("--preprocess", action="store_true",
+                        help="Binarize, deskew and trim page margins before OCR")
+    parser.add_argument("--blank-threshold", type=float, default=DEFAULT_BLANK_THRESHOLD,
+                        help="Skip OCR on pages with less than this share of ink pixels; "
+                             "0 disables blank page detection (default: %(default)s)")
+    parser.add_argument("--page-timeout", type=float,
+                        help="Seconds Tesseract may spend on one page before it is skipped")
+    parser.add_argument("--job-timeout", type=float,
+                        help="Seconds a single document may take before it fails")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Start interrupted OCR jobs over instead of continuing "
+                             "from their checkpoint")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't read or write the OCR result cache")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write per-stage timings to a .profile.json file "
+                             "next to each output")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="Reprocess documents whose output is already up to date")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Only print errors and the final summary")
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    args = build_parser().parse_args(argv)
+    jobs = max(1, args.jobs)
+    ocr_workers = args.ocr_workers or max(1, (os.cpu_count() or 1) // jobs)
+    
+    inputs = collect_inputs(args.inputs, recursive=args.recursive)
+    if not inputs:
+        print("error: no PDF files found", file=sys.stderr)
+        return 2
+    
+    outputs = [
+        (pdf_path, output_path_for(pdf_path, relative, args.output_dir))
+        for pdf_path, relative in inputs
+    ]
+    writers = {}
+    for pdf_path, output_path in outputs:
+        writers.setdefault(os.path.normcase(os.path.abspath(output_path)), []).append(pdf_path)
+    clashes = [pdf_paths for pdf_paths in writers.values() if len(pdf_paths) > 1]
+    for pdf_paths in clashes:
+        print(f"error: {', '.join(pdf_paths)} would all be written to the same output; "
+              f"process them separately or without --output-dir", file=sys.stderr)
+    if clashes:
+        return 2
+    
+    try:
+        processor = PDFProcessor(
+            max_workers=ocr_workers,
+            dpi=args.dpi,
+            render_backend=args.render_backend,
+            lang=args.lang,
+            cache=OCRCache(enabled=not args.no_cache),
+            engine=args.engine,
+            preprocess=args.preprocess,
+            blank_threshold=args.blank_threshold
+        )
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    
+    work = []
+    skipped = 0
+    for pdf_path, output_path in outputs:
+        if not args.force and is_up_to_date(pdf_path, output_path, args.formats):
+            skipped += 1
+            if not args.quiet:
+                print(f"[skip] {pdf_path} (up to date)")
+            continue
+        work.append((pdf_path, output_path))
+    
+    total_pages = 0
+    total_blank = 0
+    done = 0
+    failed = 0
+    start = time.perf_counter()
+    
+    with DocumentScheduler(max_documents=jobs, memory_budget_mb=args.memory_budget) as scheduler:
+        futures = {
+            scheduler.submit(
+                process_document, processor, args.mode, pdf_path, output_path,
+                args.page_timeout, args.job_timeout, args.profile, args.pages,
+                not args.no_resume, args.formats
+            ): (pdf_path, output_path)
+            for pdf_path, output_path in work
+        }
+        for future in as_completed(futures):
+            pdf_path, output_path = futures[future]
+            try:
+                pages, blank, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[fail] {pdf_path}: {e}", file=sys.stderr)
+                continue
+            
+            done += 1
+            total_pages += pages
+            total_blank += blank
+            if not args.quiet:
+                skipped_blank = f", {blank} blank" if blank else ""
+                target = output_path if args.formats == ["txt"] else output_path.with_suffix(".*")
+                print(f"[ok]   {pdf_path} -> {target} "
+                      f"({pages} pages{skipped_blank}, {seconds:.1f}s)")
+    
+    elapsed = time.perf_counter() - start
+    
+    def rate(count):
+        return count / elapsed if elapsed > 0 else 0.0
+    
+    print()
+    print(f"Processed {done} documents ({total_pages} pages, {total_blank} blank) "
+          f"in {elapsed:.1f}s, skipped {skipped}, failed {failed}")
+    print(f"Throughput: {rate(total_pages):.2f} pages/sec, {rate(done):.2f} docs/sec")
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
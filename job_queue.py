@@ -0,0 +1,218 @@
+"""
+Job Queue Module
+Background queue of extraction jobs for the desktop application: many PDFs
+are extracted by a bounded pool of document threads and saved straight to
+disk, so the GUI only keeps track of their status.
+"""
+
+import threading
+import time
+from itertools import count
+from pathlib import Path
+
+from ocr_checkpoint import OCRCheckpoint
+from pdf_processor import CancelToken, ExtractionCancelled, terminate_ocr_pool
+from scheduler import DEFAULT_MEMORY_BUDGET_MB, DocumentScheduler
+
+
+# Job states, in the order a job normally goes through them
+JOB_QUEUED = "Queued"
+JOB_RUNNING = "Running"
+JOB_DONE = "Done"
+JOB_FAILED = "Failed"
+JOB_CANCELLED = "Cancelled"
+
+# States a job doesn't leave again
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# Documents extracted at the same time by default
+DEFAULT_MAX_DOCUMENTS = 2
+
+
+class QueueJob:
+    """
+    One PDF in the queue.
+    
+    Fields are updated from the document thread running the job and read by
+    the GUI when it refreshes, so readers see a recent, not a locked, state.
+    """
+    
+    _ids = count(1)
+    
+    def __init__(self, pdf_path, mode, output_path):
+        """
+        Initialize the job.
+        
+        Args:
+            pdf_path (str): PDF to extract
+            mode (str): "text", "ocr", "hybrid" or "regions"
+            output_path (Path): Text file the result is saved to
+        """
+        self.id = next(self._ids)
+        self.pdf_path = pdf_path
+        self.mode = mode
+        self.output_path = output_path
+        self.status = JOB_QUEUED
+        self.pages_done = 0
+        self.pages_total = None
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.cancel_token = None
+        self.future = None
+    
+    @property
+    def is_finished(self):
+        """True once the job is done, failed or cancelled."""
+        return self.status in FINISHED_STATES
+    
+    @property
+    def elapsed(self):
+        """Seconds the job has been running, or ran for."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+    
+    @property
+    def pages_per_second(self):
+        """Pages finished per second of running time, or None before the first."""
+        elapsed = self.elapsed
+        if not self.pages_done or elapsed <= 0:
+            return None
+        return self.pages_done / elapsed
+
+
+class JobQueue:
+    """
+    Runs QueueJobs in a DocumentScheduler with one shared OCR process pool.
+    
+    Each finished job is written to its output file and resumes from a
+    checkpoint next to it if it was interrupted, like the command-line
+    interface. Nothing but the job's status is kept in memory.
+    """
+    
+    def __init__(self, processor, max_documents=DEFAULT_MAX_DOCUMENTS,
+                 memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, page_timeout=None):
+        """
+        Initialize the queue.
+        
+        Args:
+            processor (PDFProcessor): Processor used for every job
+            max_documents (int): Documents extracted at the same time
+            memory_budget_mb (float): RAM budget for rendered pages of all jobs
+            page_timeout (float): Optional OCR time limit per page, in seconds
+        """
+        self.processor = processor
+        self.page_timeout = page_timeout
+        self.jobs = []
+        self._scheduler = DocumentScheduler(max_documents, memory_budget_mb)
+        self._ocr_pool = None
+        self._lock = threading.Lock()
+    
+    def _pool(self):
+        """Start the shared OCR pool on first use."""
+        with self._lock:
+            if self._ocr_pool is None:
+                self._ocr_pool = self.processor.create_ocr_pool()
+            return self._ocr_pool
+    
+    def add(self, pdf_path, mode="hybrid", output_dir=None):
+        """
+        Queue a PDF for extraction.
+        
+        Args:
+            pdf_path (str): PDF to extract
+            mode (str): "text", "ocr", "hybrid" or "regions"
+            output_dir (str): Folder for the text file. Defaults to the PDF's folder.
+        
+        Returns:
+            QueueJob: The queued job
+        
+        Raises:
+            ValueError: If an unfinished job already writes the same output file
+        """
+        pdf = Path(pdf_path)
+        output_path = Path(output_dir or pdf.parent) / (pdf.stem + ".txt")
+        if any(job.output_path == output_path and not job.is_finished for job in self.jobs):
+            raise ValueError(f"{pdf.name} is already in the queue")
+        job = QueueJob(str(pdf), mode, output_path)
+        job.cancel_token = CancelToken()
+        self.jobs.append(job)
+        job.future = self._scheduler.submit(self._run, job)
+        return job
+    
+    def _run(self, job, memory):
+        """Extract one job in a document thread."""
+        if job.cancel_token.cancelled:
+            job.status = JOB_CANCELLED
+            return
+        
+        job.status = JOB_RUNNING
+        job.started = time.monotonic()
+        
+        def progress_callback(current, total):
+            job.pages_done = current
+            job.pages_total = total
+        
+        kwargs = {"memory": memory, "cancel_token": job.cancel_token,
+                  "progress_callback": progress_callback}
+        checkpoint = None
+        if job.mode != "text":
+            checkpoint = OCRCheckpoint(job.output_path.with_suffix(".checkpoint.jsonl"))
+            kwargs.update(checkpoint=checkpoint, page_timeout=self.page_timeout,
+                          ocr_pool=self._pool())
+        try:
+            self.processor.export(
+                job.pdf_path, job.output_path.with_suffix(""), ("txt",), mode=job.mode, **kwargs
+            )
+            if checkpoint is not None:
+                checkpoint.remove()
+            job.status = JOB_DONE
+        except ExtractionCancelled:
+            job.status = JOB_CANCELLED
+        except Exception as e:
+            job.error = str(e)
+            job.status = JOB_FAILED
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            job.finished = time.monotonic()
+    
+    def cancel(self, job):
+        """Stop a queued or running job; a running one keeps its checkpoint."""
+        if not job.is_finished:
+            job.cancel_token.cancel()
+            if job.future.cancel():
+                job.status = JOB_CANCELLED
+    
+    def remove_finished(self):
+        """
+        Forget the jobs that are no longer queued or running.
+        
+        Returns:
+            list: The removed jobs
+        """
+        removed = [job for job in self.jobs if job.is_finished]
+        self.jobs = [job for job in self.jobs if not job.is_finished]
+        return removed
+    
+    @property
+    def active(self):
+        """Number of jobs that are queued or running."""
+        return sum(1 for job in self.jobs if not job.is_finished)
+    
+    def shutdown(self):
+        """
+        Cancel every unfinished job and stop the document threads and OCR pool.
+        
+        The OCR workers are terminated rather than left to finish their
+        current page, which could take up to the page timeout and would keep
+        the process alive after the window is closed.
+        """
+        for job in self.jobs:
+            self.cancel(job)
+        self._scheduler.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            if self._ocr_pool is not None:
+                terminate_ocr_pool(self._ocr_pool)
+                self._ocr_pool = None
@@ -6,8 +6,52 @@ A simple desktop application to extract text from PDFs with OCR support.
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import threading
+import multiprocessing
+import queue
 import os
-from pdf_processor import PDFProcessor
+import sys
+import json
+import time
+import importlib
+# pdf_processor pulls in PyMuPDF, pytesseract and PIL, so it is imported by a
+# background thread once the window is up (see _load_processor)
+from ocr_cache import OCRCache
+from ocr_checkpoint import OCRCheckpoint, checkpoint_path_for
+
+try:
+    from tkinterdnd2 import DND_FILES, TkinterDnD
+except ImportError:  # optional, files can't be dropped on the job queue then
+    DND_FILES = TkinterDnD = None
+
+
+# Pages are appended to the text widget in batches on this interval, with a
+# cap on how much text a single batch inserts so the event loop stays responsive
+OUTPUT_FLUSH_INTERVAL_MS = 100
+OUTPUT_MAX_CHARS_PER_FLUSH = 200_000
+
+# Tesseract is stopped if it spends longer than this on a single page (seconds)
+OCR_PAGE_TIMEOUT = 300
+
+# How often the job queue list is refreshed while jobs are running
+QUEUE_REFRESH_INTERVAL_MS = 500
+
+# Modes offered for queued jobs
+QUEUE_MODES = ("hybrid", "regions", "ocr", "text")
+
+# Column id -> (heading, width) of the job queue list
+QUEUE_COLUMNS = {
+    "file": ("File", 180),
+    "mode": ("Mode", 60),
+    "status": ("Status", 110),
+    "pages": ("Pages", 70),
+    "elapsed": ("Elapsed", 70),
+    "rate": ("Pages/s", 70),
+    "output": ("Saved To", 240),
+}
+
+# The widget keeps at most this many characters; older pages are dropped
+# from the top once it is exceeded
+OUTPUT_MAX_CHARS = 2_000_000
 
 
 class PDFOCRApp:
@@ -20,16 +64,67 @@ class PDFOCRApp:
         self.root.geometry("900x700")
         self.root.minsize(700, 500)
         
-        # Initialize PDF processor
+        # The PDF processor is created in the background, see _load_processor
+        self.processor = None
+        self.cache = OCRCache()
+        self.current_file = None
+        self.cancel_token = None
+        
+        # Background queue of documents (see setup_queue_tab)
+        self.job_queue = None
+        self.output_dir = None
+        self._queue_refresh_scheduled = False
+        
+        # Incremental output state (see _start_output_stream)
+        self._output_queue = queue.Queue()
+        self._output_chars = 0
+        self._output_trimmed = False
+        self._output_has_text = False
+        self._output_result = None
+        self._streaming = False
+        self._flush_scheduled = False
+        
+        self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.status_var.set("Loading OCR engine...")
+        threading.Thread(target=self._load_processor, daemon=True).start()
+    
+    def _load_processor(self):
+        """
+        Import the PDF libraries and check for Tesseract off the UI thread.
+        
+        Both take a noticeable time, more so in the frozen build, and the
+        window stays usable meanwhile: a file can already be picked, and the
+        action buttons are enabled once the processor is ready.
+        """
         try:
-            self.processor = PDFProcessor()
+            from pdf_processor import PDFProcessor
+            from job_queue import JobQueue
+            processor = PDFProcessor(cache=self.cache)
+            job_queue = JobQueue(processor, page_timeout=OCR_PAGE_TIMEOUT)
         except RuntimeError as e:
-            messagebox.showerror("Tesseract Not Found", str(e))
-            self.root.destroy()
+            self.root.after(0, self._processor_failed, "Tesseract Not Found", str(e))
             return
-        
-        self.current_file = None
-        self.setup_ui()
+        except ImportError as e:
+            self.root.after(0, self._processor_failed, "Missing Dependency", str(e))
+            return
+        self.root.after(0, self._processor_ready, processor, job_queue)
+    
+    def _processor_ready(self, processor, job_queue):
+        """Start using the processor and job queue created by _load_processor."""
+        self.processor = processor
+        self.job_queue = job_queue
+        self.add_jobs_btn.config(state=tk.NORMAL)
+        self.set_buttons_state(tk.NORMAL)
+        if self.current_file:
+            self.status_var.set(f"File selected: {os.path.basename(self.current_file)}")
+        else:
+            self.status_var.set("Ready")
+    
+    def _processor_failed(self, title, message):
+        """Report why the processor couldn't be created and close the application."""
+        messagebox.showerror(title, message)
+        self.root.destroy()
     
     def setup_ui(self):
         """Set up the user interface."""
@@ -37,6 +132,21 @@ class PDFOCRApp:
         style = ttk.Style()
         style.theme_use('clam')
         
+        # Menu bar
+        menubar = tk.Menu(self.root)
+        cache_menu = tk.Menu(menubar, tearoff=0)
+        self.use_cache_var = tk.BooleanVar(value=self.cache.enabled)
+        cache_menu.add_checkbutton(
+            label="Use OCR Cache",
+            variable=self.use_cache_var,
+            command=self.toggle_cache
+        )
+        cache_menu.add_command(label="Cache Statistics", command=self.show_cache_stats)
+        cache_menu.add_separator()
+        cache_menu.add_command(label="Clear OCR Cache", command=self.clear_cache)
+        menubar.add_cascade(label="Cache", menu=cache_menu)
+        self.root.config(menu=menubar)
+        
         # Main container with padding
         main_frame = ttk.Frame(self.root, padding="20")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -103,6 +213,16 @@ class PDFOCRApp:
         )
         self.ocr_btn.grid(row=0, column=1, padx=(0, 10))
         
+        # Hybrid button (text layer where available, OCR elsewhere)
+        self.hybrid_btn = ttk.Button(
+            button_frame,
+            text="⚡ Auto (Hybrid)",
+            command=self.extract_hybrid,
+            state=tk.DISABLED,
+            width=20
+        )
+        self.hybrid_btn.grid(row=0, column=2, padx=(0, 10))
+        
         # Copy button
         self.copy_btn = ttk.Button(
             button_frame,
@@ -111,7 +231,7 @@ class PDFOCRApp:
             state=tk.DISABLED,
             width=20
         )
-        self.copy_btn.grid(row=0, column=2, padx=(0, 10))
+        self.copy_btn.grid(row=0, column=3, padx=(0, 10))
         
         # Clear button
         self.clear_btn = ttk.Button(
@@ -121,13 +241,17 @@ class PDFOCRApp:
             state=tk.DISABLED,
             width=15
         )
-        self.clear_btn.grid(row=0, column=3)
+        self.clear_btn.grid(row=0, column=4)
+        
+        # Tabs for the text of the selected file and the background job queue
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Text output frame
-        output_frame = ttk.LabelFrame(main_frame, text="Extracted Text", padding="10")
-        output_frame.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        output_frame = ttk.Frame(self.notebook, padding="10")
         output_frame.columnconfigure(0, weight=1)
         output_frame.rowconfigure(0, weight=1)
+        self.notebook.add(output_frame, text="Extracted Text")
         
         # Scrolled text widget
         self.text_output = scrolledtext.ScrolledText(
@@ -139,6 +263,8 @@ class PDFOCRApp:
         )
         self.text_output.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        self.setup_queue_tab()
+        
         # Status bar
         self.status_var = tk.StringVar(value="Ready")
         status_bar = ttk.Label(
@@ -150,15 +276,213 @@ class PDFOCRApp:
         )
         status_bar.grid(row=4, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
         
-        # Progress bar (initially hidden)
+        # Progress bar and Cancel button (initially hidden)
+        self.progress_frame = ttk.Frame(main_frame)
+        self.progress_frame.columnconfigure(0, weight=1)
+        
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(
-            main_frame,
+            self.progress_frame,
             variable=self.progress_var,
             maximum=100,
             mode='determinate'
         )
-        # Don't grid it yet, will show when needed
+        self.progress_bar.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10))
+        
+        self.cancel_btn = ttk.Button(
+            self.progress_frame,
+            text="✖ Cancel",
+            command=self.cancel_job,
+            width=12
+        )
+        self.cancel_btn.grid(row=0, column=1)
+        # Don't grid the frame yet, will show when needed
+    
+    def setup_queue_tab(self):
+        """Set up the tab listing queued documents and their progress."""
+        queue_frame = ttk.Frame(self.notebook, padding="10")
+        queue_frame.columnconfigure(0, weight=1)
+        queue_frame.rowconfigure(1, weight=1)
+        self.notebook.add(queue_frame, text="Job Queue")
+        
+        # Toolbar: add files, mode of new jobs, output folder, job actions
+        toolbar = ttk.Frame(queue_frame)
+        toolbar.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        self.add_jobs_btn = ttk.Button(
+            toolbar,
+            text="➕ Add PDFs...",
+            command=self.add_jobs,
+            state=tk.DISABLED,
+            width=15
+        )
+        self.add_jobs_btn.grid(row=0, column=0, padx=(0, 10))
+        
+        ttk.Label(toolbar, text="Mode:").grid(row=0, column=1, padx=(0, 5))
+        self.queue_mode_var = tk.StringVar(value="hybrid")
+        ttk.Combobox(
+            toolbar,
+            textvariable=self.queue_mode_var,
+            values=QUEUE_MODES,
+            state="readonly",
+            width=8
+        ).grid(row=0, column=2, padx=(0, 10))
+        
+        ttk.Button(
+            toolbar,
+            text="📁 Output Folder...",
+            command=self.choose_output_dir,
+            width=18
+        ).grid(row=0, column=3, padx=(0, 10))
+        
+        ttk.Button(
+            toolbar,
+            text="✖ Cancel Selected",
+            command=self.cancel_selected_jobs,
+            width=17
+        ).grid(row=0, column=4, padx=(0, 10))
+        
+        ttk.Button(
+            toolbar,
+            text="🧹 Clear Finished",
+            command=self.clear_finished_jobs,
+            width=16
+        ).grid(row=0, column=5)
+        
+        # One row per job
+        self.queue_tree = ttk.Treeview(
+            queue_frame,
+            columns=tuple(QUEUE_COLUMNS),
+            show="headings",
+            selectmode="extended"
+        )
+        for column, (heading, width) in QUEUE_COLUMNS.items():
+            self.queue_tree.heading(column, text=heading)
+            self.queue_tree.column(column, width=width, stretch=(column == "output"))
+        self.queue_tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        scrollbar = ttk.Scrollbar(queue_frame, orient=tk.VERTICAL, command=self.queue_tree.yview)
+        scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        self.queue_tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.output_dir_var = tk.StringVar(value="Results are saved next to each PDF")
+        ttk.Label(
+            queue_frame,
+            textvariable=self.output_dir_var,
+            foreground="gray"
+        ).grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
+        
+        # Files dropped on the list are queued when tkinterdnd2 is available
+        if hasattr(self.queue_tree, "drop_target_register"):
+            self.queue_tree.drop_target_register(DND_FILES)
+            self.queue_tree.dnd_bind("<<Drop>>", self._drop_files)
+            self.output_dir_var.set(
+                self.output_dir_var.get() + " - drop PDF files on the list to add them"
+            )
+    
+    def add_jobs(self):
+        """Ask for PDFs and add them to the job queue."""
+        filenames = filedialog.askopenfilenames(
+            title="Select PDF files",
+            filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")]
+        )
+        self._queue_files(filenames)
+    
+    def _drop_files(self, event):
+        """Queue the PDFs dropped on the job list."""
+        paths = self.root.tk.splitlist(event.data)
+        self._queue_files([path for path in paths if path.lower().endswith(".pdf")])
+    
+    def _queue_files(self, filenames):
+        """Create a job for every file and show it in the list."""
+        if not filenames or self.job_queue is None:
+            return
+        
+        skipped = []
+        for filename in filenames:
+            try:
+                job = self.job_queue.add(filename, self.queue_mode_var.get(), self.output_dir)
+            except ValueError as e:
+                skipped.append(str(e))
+                continue
+            self.queue_tree.insert("", tk.END, iid=str(job.id), values=self._job_row(job))
+        if skipped:
+            messagebox.showwarning("Already Queued", "\n".join(skipped))
+        
+        self.notebook.select(1)
+        self._schedule_queue_refresh()
+    
+    def choose_output_dir(self):
+        """Pick the folder results of new jobs are saved to."""
+        directory = filedialog.askdirectory(title="Save extracted text to")
+        if directory:
+            self.output_dir = directory
+            self.output_dir_var.set(f"Results are saved to {directory}")
+    
+    def cancel_selected_jobs(self):
+        """Cancel the selected jobs that haven't finished."""
+        if self.job_queue is None:
+            return
+        selected = set(self.queue_tree.selection())
+        for job in self.job_queue.jobs:
+            if str(job.id) in selected:
+                self.job_queue.cancel(job)
+        self._refresh_queue()
+    
+    def clear_finished_jobs(self):
+        """Remove finished jobs from the list; their output files are kept."""
+        if self.job_queue is None:
+            return
+        for job in self.job_queue.remove_finished():
+            self.queue_tree.delete(str(job.id))
+    
+    @staticmethod
+    def _job_row(job):
+        """Values of a job's row in the queue list."""
+        total = job.pages_total if job.pages_total is not None else "?"
+        minutes, seconds = divmod(int(job.elapsed), 60)
+        rate = job.pages_per_second
+        status = job.status
+        if job.error:
+            status = f"{status}: {job.error}"
+        return (
+            os.path.basename(job.pdf_path),
+            job.mode,
+            status,
+            f"{job.pages_done}/{total}",
+            f"{minutes}:{seconds:02d}",
+            f"{rate:.2f}" if rate is not None else "",
+            str(job.output_path),
+        )
+    
+    def _schedule_queue_refresh(self):
+        """Refresh the job list periodically while jobs are unfinished."""
+        if not self._queue_refresh_scheduled:
+            self._queue_refresh_scheduled = True
+            self.root.after(QUEUE_REFRESH_INTERVAL_MS, self._refresh_queue)
+    
+    def _refresh_queue(self):
+        """Update every row of the job list from its job."""
+        self._queue_refresh_scheduled = False
+        for job in self.job_queue.jobs:
+            self.queue_tree.item(str(job.id), values=self._job_row(job))
+        if self.job_queue.active:
+            self._schedule_queue_refresh()
+    
+    def on_close(self):
+        """Stop the background jobs and close the window."""
+        if self.job_queue is not None and self.job_queue.active:
+            if not messagebox.askyesno(
+                "Jobs Running",
+                "Documents are still being processed. Cancel them and quit?\n\n"
+                "OCR jobs continue where they stopped when queued again."
+            ):
+                return
+        if self.job_queue is not None:
+            self.job_queue.shutdown()
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+        self.root.destroy()
     
     def browse_file(self):
         """Open file dialog to select a PDF file."""
@@ -170,9 +494,13 @@ class PDFOCRApp:
         if filename:
             self.current_file = filename
             self.file_path_var.set(filename)
-            self.extract_btn.config(state=tk.NORMAL)
-            self.ocr_btn.config(state=tk.NORMAL)
-            self.status_var.set(f"File selected: {os.path.basename(filename)}")
+            if self.processor is not None:
+                self.set_buttons_state(tk.NORMAL)
+                self.status_var.set(f"File selected: {os.path.basename(filename)}")
+            else:
+                self.status_var.set(
+                    f"File selected: {os.path.basename(filename)} - loading OCR engine..."
+                )
     
     def extract_text(self):
         """Extract text from the selected PDF."""
@@ -183,6 +511,7 @@ class PDFOCRApp:
         # Disable buttons during processing
         self.set_buttons_state(tk.DISABLED)
         self.status_var.set("Extracting text...")
+        self._start_output_stream()
         
         # Run in a separate thread to keep UI responsive
         thread = threading.Thread(target=self._extract_text_thread)
@@ -192,10 +521,14 @@ class PDFOCRApp:
     def _extract_text_thread(self):
         """Thread function for text extraction."""
         try:
-            text = self.processor.extract_text_from_pdf(self.current_file)
-            self.root.after(0, self._display_text, text)
+            text = self.processor.extract_text_from_pdf(
+                self.current_file,
+                page_callback=self._queue_page
+            )
+            self.root.after(0, self._finish_output_stream, text)
             self.root.after(0, self.status_var.set, "Text extraction completed")
         except Exception as e:
+            self.root.after(0, self._finish_output_stream, None)
             self.root.after(0, messagebox.showerror, "Error", str(e))
             self.root.after(0, self.status_var.set, "Error during text extraction")
         finally:
@@ -212,34 +545,188 @@ class PDFOCRApp:
         self.status_var.set("Performing OCR... This may take a while.")
         
         # Show progress bar
-        self.progress_bar.grid(row=5, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        self.progress_frame.grid(row=5, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
         self.progress_var.set(0)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.cancel_token = self._new_cancel_token()
+        self._start_output_stream()
         
         # Run in a separate thread
-        thread = threading.Thread(target=self._extract_ocr_thread)
+        thread = threading.Thread(
+            target=self._extract_ocr_thread,
+            args=(self.processor.extract_text_with_ocr, "OCR")
+        )
+        thread.daemon = True
+        thread.start()
+    
+    def extract_hybrid(self):
+        """Extract text using the text layer where present and OCR elsewhere."""
+        if not self.current_file:
+            messagebox.showwarning("No File", "Please select a PDF file first.")
+            return
+        
+        # Disable buttons during processing
+        self.set_buttons_state(tk.DISABLED)
+        self.status_var.set("Extracting text and running OCR on scanned pages...")
+        
+        # Show progress bar
+        self.progress_frame.grid(row=5, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
+        self.progress_var.set(0)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.cancel_token = self._new_cancel_token()
+        self._start_output_stream()
+        
+        # Run in a separate thread
+        thread = threading.Thread(
+            target=self._extract_ocr_thread,
+            args=(self.processor.extract_text_hybrid, "Hybrid extraction")
+        )
         thread.daemon = True
         thread.start()
     
-    def _extract_ocr_thread(self):
-        """Thread function for OCR extraction."""
+    def _extract_ocr_thread(self, extract_func, label):
+        """
+        Thread function for OCR extraction.
+        
+        Args:
+            extract_func (callable): PDFProcessor method that performs OCR
+            label (str): Name of the operation shown in the status bar
+        """
+        from pdf_processor import ExtractionCancelled, ExtractionTimeout
+        
+        # Finished pages are kept on disk until the job completes, so running
+        # it again after a crash or a cancel picks up where it stopped
+        checkpoint = OCRCheckpoint(checkpoint_path_for(self.current_file))
         try:
             def progress_callback(current, total):
                 progress = (current / total) * 100
                 self.root.after(0, self.progress_var.set, progress)
-                self.root.after(0, self.status_var.set, f"Processing page {current} of {total}...")
+                self.root.after(0, self.status_var.set, f"OCR: {current} of {total} pages done...")
             
-            text = self.processor.extract_text_with_ocr(
+            text = extract_func(
                 self.current_file,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                page_callback=self._queue_page,
+                cancel_token=self.cancel_token,
+                page_timeout=OCR_PAGE_TIMEOUT,
+                checkpoint=checkpoint
+            )
+            checkpoint.remove()
+            self.root.after(0, self._finish_output_stream, text)
+            self.root.after(0, self.status_var.set, f"{label} completed")
+        except ExtractionCancelled as e:
+            # Finished pages were already streamed to the output
+            reason = "timed out" if isinstance(e, ExtractionTimeout) else "cancelled"
+            self.root.after(0, self._finish_output_stream, None)
+            self.root.after(
+                0, self.status_var.set,
+                f"{label} {reason} - kept {e.completed_pages} finished pages, "
+                f"run it again to continue"
             )
-            self.root.after(0, self._display_text, text)
-            self.root.after(0, self.status_var.set, "OCR completed")
         except Exception as e:
+            self.root.after(0, self._finish_output_stream, None)
             self.root.after(0, messagebox.showerror, "Error", str(e))
-            self.root.after(0, self.status_var.set, "Error during OCR")
+            self.root.after(0, self.status_var.set, f"Error during {label}")
         finally:
             self.root.after(0, self.set_buttons_state, tk.NORMAL)
-            self.root.after(0, self.progress_bar.grid_remove)
+            self.root.after(0, self.progress_frame.grid_remove)
+    
+    @staticmethod
+    def _new_cancel_token():
+        """Create a CancelToken; pdf_processor is loaded once a job can start."""
+        from pdf_processor import CancelToken
+        return CancelToken()
+    
+    def cancel_job(self):
+        """Stop the running OCR job, keeping the pages that already finished."""
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+            self.cancel_btn.config(state=tk.DISABLED)
+            self.status_var.set("Cancelling...")
+    
+    def _start_output_stream(self):
+        """Clear the output and start appending pages as they arrive."""
+        self.text_output.delete(1.0, tk.END)
+        self._output_queue = queue.Queue()
+        self._output_chars = 0
+        self._output_trimmed = False
+        self._output_has_text = False
+        self._output_result = None
+        self._streaming = True
+        self._schedule_flush()
+    
+    def _queue_page(self, page_num, text):
+        """Page callback for PDFProcessor, called from the worker thread."""
+        self._output_queue.put(f"--- Page {page_num} ---\n{text}\n\n")
+    
+    def _finish_output_stream(self, result):
+        """
+        Mark the running job as finished.
+        
+        Args:
+            result (str): Full text returned by the processor, shown instead of
+                          the streamed pages if none of them contained text.
+                          None if the job failed.
+        """
+        self._streaming = False
+        self._output_result = result
+    
+    def _schedule_flush(self):
+        """Run _flush_output after the flush interval, unless already pending."""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after(OUTPUT_FLUSH_INTERVAL_MS, self._flush_output)
+    
+    def _flush_output(self):
+        """Append queued pages to the text widget in a single insert."""
+        self._flush_scheduled = False
+        chunks = []
+        size = 0
+        while size < OUTPUT_MAX_CHARS_PER_FLUSH:
+            try:
+                chunk = self._output_queue.get_nowait()
+            except queue.Empty:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        
+        if chunks:
+            text = "".join(chunks)
+            follow = self.text_output.yview()[1] >= 0.999
+            self.text_output.insert(tk.END, text)
+            self._output_chars += len(text)
+            self._output_has_text = self._output_has_text or any(
+                chunk.split("\n", 1)[1].strip() for chunk in chunks
+            )
+            self._trim_output()
+            if follow:
+                self.text_output.see(tk.END)
+            self.copy_btn.config(state=tk.NORMAL)
+            self.clear_btn.config(state=tk.NORMAL)
+        
+        if self._streaming or not self._output_queue.empty():
+            self._schedule_flush()
+        elif self._output_result is not None and not self._output_has_text:
+            # Nothing readable was streamed, show the processor's explanation
+            self._display_text(self._output_result)
+    
+    def _trim_output(self):
+        """Drop the oldest lines once the widget holds more than OUTPUT_MAX_CHARS."""
+        if self._output_chars <= OUTPUT_MAX_CHARS:
+            return
+        
+        # Trim an extra 10% so this doesn't run again on every flush
+        excess = self._output_chars - int(OUTPUT_MAX_CHARS * 0.9)
+        cut = f"1.0 + {excess} chars lineend + 1 chars"
+        removed = len(self.text_output.get("1.0", cut))
+        self.text_output.delete("1.0", cut)
+        self._output_chars -= removed
+        
+        # The marker is the first line, so the next trim removes it again
+        marker = "[Earlier pages were removed from view to limit memory use]\n\n"
+        self.text_output.insert("1.0", marker)
+        self._output_chars += len(marker)
+        self._output_trimmed = True
     
     def _display_text(self, text):
         """Display extracted text in the text widget."""
@@ -254,7 +741,10 @@ class PDFOCRApp:
         if text:
             self.root.clipboard_clear()
             self.root.clipboard_append(text)
-            self.status_var.set("Text copied to clipboard")
+            if self._output_trimmed:
+                self.status_var.set("Copied the visible text (earlier pages were removed from view)")
+            else:
+                self.status_var.set("Text copied to clipboard")
             messagebox.showinfo("Success", "Text copied to clipboard!")
         else:
             messagebox.showwarning("No Text", "No text to copy.")
@@ -262,25 +752,77 @@ class PDFOCRApp:
     def clear_text(self):
         """Clear the text output area."""
         self.text_output.delete(1.0, tk.END)
+        self._output_chars = 0
         self.copy_btn.config(state=tk.DISABLED)
         self.clear_btn.config(state=tk.DISABLED)
         self.status_var.set("Text cleared")
     
+    def toggle_cache(self):
+        """Turn the OCR result cache on or off."""
+        self.cache.enabled = self.use_cache_var.get()
+        self.status_var.set(
+            "OCR cache enabled" if self.cache.enabled else "OCR cache disabled"
+        )
+    
+    def show_cache_stats(self):
+        """Show OCR cache usage and hit/miss counters."""
+        stats = self.cache.stats()
+        messagebox.showinfo(
+            "OCR Cache",
+            f"Cached pages: {stats['entries']}\n"
+            f"Size: {stats['size_bytes'] / (1024 * 1024):.1f} MB "
+            f"of {stats['max_size_bytes'] / (1024 * 1024):.0f} MB\n"
+            f"Hits this session: {stats['hits']}\n"
+            f"Misses this session: {stats['misses']}\n\n"
+            f"Location: {self.cache.cache_dir}"
+        )
+    
+    def clear_cache(self):
+        """Delete all cached OCR results."""
+        if messagebox.askyesno("Clear OCR Cache", "Delete all cached OCR results?"):
+            self.cache.clear()
+            self.status_var.set("OCR cache cleared")
+    
     def set_buttons_state(self, state):
         """Enable or disable all action buttons."""
-        self.extract_btn.config(state=state if self.current_file else tk.DISABLED)
-        self.ocr_btn.config(state=state if self.current_file else tk.DISABLED)
+        ready = self.current_file and self.processor is not None
+        self.extract_btn.config(state=state if ready else tk.DISABLED)
+        self.ocr_btn.config(state=state if ready else tk.DISABLED)
+        self.hybrid_btn.config(state=state if ready else tk.DISABLED)
         if state == tk.DISABLED:
             self.copy_btn.config(state=state)
             self.clear_btn.config(state=state)
 
 
+def write_startup_report(path):
+    """
+    Time loading the PDF libraries and save it to path as JSON, without
+    opening a window. Used by build.py to measure the frozen build.
+    
+    Args:
+        path (str): File to write the report to
+    """
+    start = time.perf_counter()
+    importlib.import_module("pdf_processor")
+    report = {"import_s": time.perf_counter() - start, "frozen": getattr(sys, "frozen", False)}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+
+
 def main():
     """Main entry point for the application."""
-    root = tk.Tk()
+    # Set by build.py to measure the bundle instead of starting the GUI
+    report_path = os.environ.get("PDF_OCR_STARTUP_REPORT")
+    if report_path:
+        write_startup_report(report_path)
+        return
+    
+    root = TkinterDnD.Tk() if TkinterDnD is not None else tk.Tk()
     app = PDFOCRApp(root)
     root.mainloop()
 
 
 if __name__ == "__main__":
+    # Required for the OCR worker processes in the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
     main()
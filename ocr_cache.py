@@ -0,0 +1,189 @@
+"""
+OCR Cache Module
+Persistent, content-addressed cache of per-page OCR results.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+DEFAULT_CACHE_SIZE_MB = 256
+
+
+def default_cache_dir():
+    """Return the per-user directory used for the OCR cache."""
+    if sys.platform == 'win32':
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / "PDF_OCR" / "cache"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "pdf_ocr"
+
+
+class OCRCache:
+    """
+    Stores OCR text keyed by a hash of the page content and the OCR settings.
+    
+    Entries live in a SQLite database. When the stored text exceeds the size
+    limit, the least recently used entries are evicted.
+    """
+    
+    def __init__(self, cache_dir=None, max_size_mb=DEFAULT_CACHE_SIZE_MB, enabled=True):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir (str): Directory holding the cache database.
+                             Defaults to default_cache_dir().
+            max_size_mb (float): Maximum total size of cached text
+            enabled (bool): When False, lookups always miss and nothing is stored
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+    
+    @staticmethod
+    def make_key(page_fingerprint, settings):
+        """
+        Build a cache key from a page fingerprint and the OCR settings.
+        
+        Args:
+            page_fingerprint (str): Hash of the page content
+            settings (dict): OCR settings that affect the result (DPI, language, engine)
+        
+        Returns:
+            str: Hex digest identifying the page/settings combination
+        """
+        payload = json.dumps(settings, sort_keys=True) + page_fingerprint
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _connect(self):
+        """Open the cache database on first use."""
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.cache_dir / "ocr_cache.sqlite3"),
+                check_same_thread=False
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+            )
+            self._conn.commit()
+        return self._conn
+    
+    def get(self, key):
+        """
+        Look up cached text.
+        
+        Args:
+            key (str): Key from make_key()
+        
+        Returns:
+            str: Cached text, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT text FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            conn.commit()
+            self.hits += 1
+            return row[0]
+    
+    def put(self, key, text):
+        """
+        Store text in the cache, evicting least recently used entries if needed.
+        
+        Args:
+            key (str): Key from make_key()
+            text (str): OCR result to store
+        """
+        if not self.enabled:
+            return
+        
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, text, size, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, text, size, time.time())
+            )
+            self._evict(conn)
+            conn.commit()
+    
+    def _evict(self, conn):
+        """Delete least recently used entries until the cache fits its limit."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY last_used")
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_size_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+    
+    def clear(self):
+        """Remove every cached entry and reset the hit/miss counters."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries")
+            conn.commit()
+            conn.execute("VACUUM")
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self):
+        """
+        Report cache usage.
+        
+        Returns:
+            dict: entries, size_bytes, max_size_bytes, hits and misses
+        """
+        with self._lock:
+            conn = self._connect()
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "size_bytes": size,
+            "max_size_bytes": self.max_size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+    
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,176 @@
+"""
+OCR Checkpoint Module
+Append-only on-disk record of the pages a job has finished, so an
+interrupted job can continue where it stopped instead of starting over.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from ocr_cache import default_cache_dir
+
+
+# Bump when the file layout changes, so old checkpoints are discarded
+CHECKPOINT_VERSION = 1
+
+# Chunk size used when hashing PDF files
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def file_fingerprint(path):
+    """
+    Hash the contents of a file.
+    
+    Args:
+        path (str): File to hash
+    
+    Returns:
+        str: Hex digest of the file
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checkpoint_path_for(pdf_path, checkpoint_dir=None):
+    """
+    Choose where the checkpoint of a PDF lives when there is no output file
+    to put it next to, such as in the GUI.
+    
+    Args:
+        pdf_path (str): PDF being extracted
+        checkpoint_dir (str): Directory for checkpoints.
+                              Defaults to a folder in the OCR cache directory.
+    
+    Returns:
+        Path: Checkpoint file named after a hash of the PDF's absolute path
+    """
+    directory = Path(checkpoint_dir) if checkpoint_dir else default_cache_dir() / "checkpoints"
+    name = hashlib.sha256(os.path.abspath(pdf_path).encode("utf-8")).hexdigest()[:32]
+    return directory / f"{name}.checkpoint.jsonl"
+
+
+class OCRCheckpoint:
+    """
+    Records finished pages of one extraction job in a JSON Lines file.
+    
+    The first line identifies the job: a hash of the PDF file and the settings
+    that affect its text. Every following line holds one finished page and is
+    flushed to disk as soon as the page is done. A checkpoint written for a
+    different file content or different settings is discarded when it is
+    opened, as is a trailing line cut short by a crash.
+    """
+    
+    def __init__(self, path):
+        """
+        Initialize the checkpoint.
+        
+        Args:
+            path (str): Checkpoint file, created on first use
+        """
+        self.path = Path(path)
+        self._file = None
+    
+    def open(self, pdf_path, settings):
+        """
+        Load the pages finished by an earlier run of the same job and start
+        recording new ones.
+        
+        Args:
+            pdf_path (str): PDF being extracted
+            settings (dict): Settings that affect the extracted text
+        
+        Returns:
+            dict: {page_num: (text, source, layout)} for pages that don't need
+                  redoing, where layout is None unless it was recorded
+        """
+        self.close()
+        header = {
+            "version": CHECKPOINT_VERSION,
+            "pdf_sha256": file_fingerprint(pdf_path),
+            "settings": settings,
+        }
+        pages, valid_bytes = self._read(header)
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if valid_bytes:
+            self._file = open(self.path, "r+b")
+            self._file.truncate(valid_bytes)
+            self._file.seek(valid_bytes)
+        else:
+            self._file = open(self.path, "wb")
+            self._write(header)
+        return pages
+    
+    def _read(self, header):
+        """
+        Read the pages of an existing checkpoint written for the same job.
+        
+        Returns:
+            tuple: (pages, valid_bytes) where valid_bytes is the length of the
+                   intact part of the file, or 0 if it must be started afresh
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return {}, 0
+        
+        pages = {}
+        valid_bytes = 0
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # cut short by a crash; everything before it is intact
+                if not line.endswith(b"\n"):
+                    break
+                if valid_bytes == 0:
+                    if record != json.loads(json.dumps(header)):
+                        return {}, 0
+                else:
+                    pages[record["page"]] = (
+                        record["text"], record["source"], record.get("layout")
+                    )
+                valid_bytes += len(line)
+        return pages, valid_bytes
+    
+    def _write(self, record):
+        """Append one record and make sure it reaches the disk."""
+        self._file.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def add(self, page_num, text, source, layout=None):
+        """
+        Record a finished page.
+        
+        Args:
+            page_num (int): 1-based page number
+            text (str): Text of the page
+            source (str): Where the text came from ("text", "ocr", ...)
+            layout (dict): Optional word boxes of the page, see PageResult
+        """
+        if self._file is not None:
+            record = {"page": page_num, "text": text, "source": source}
+            if layout is not None:
+                record["layout"] = layout
+            self._write(record)
+    
+    def close(self):
+        """Stop recording; the file is kept so the job can be resumed."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def remove(self):
+        """Delete the checkpoint, once the job's output has been saved."""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,150 @@
+"""
+OCR Profiling Module
+Per-page and per-stage timing records for the extraction pipeline.
+"""
+
+import csv
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Per-page fields, in report column order
+PAGE_FIELDS = (
+    "page", "source", "dpi", "width", "height", "image_bytes", "ocr_regions",
+    "wait_s", "extract_s", "render_s", "preprocess_s", "ocr_s",
+    "worker_peak_rss_bytes", "tesseract_peak_rss_bytes",
+)
+
+
+def peak_rss_bytes(children=False):
+    """
+    Return the peak resident set size of this process, or of its finished
+    child processes, in bytes.
+    
+    Returns:
+        int: Peak RSS, or None where the platform doesn't report it (Windows)
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ExtractionProfile:
+    """
+    Timings collected while a document is extracted.
+    
+    Pass an instance as the profile argument of a PDFProcessor extraction
+    method; it is filled in as pages complete. Stage times are in seconds.
+    """
+    
+    def __init__(self):
+        """Initialize an empty profile."""
+        self.pdf_path = None
+        self.mode = None
+        self.settings = {}
+        self.open_s = 0.0
+        self.join_s = 0.0
+        self.total_s = 0.0
+        self.peak_rss_bytes = None
+        self.pages = []
+        self._start = None
+    
+    def start(self, pdf_path, mode, settings):
+        """Record the job being profiled and start the wall clock."""
+        self.pdf_path = pdf_path
+        self.mode = mode
+        self.settings = dict(settings)
+        self._start = time.perf_counter()
+    
+    def finish(self):
+        """Stop the wall clock and record peak memory."""
+        if self._start is not None:
+            self.total_s = time.perf_counter() - self._start
+        self.peak_rss_bytes = peak_rss_bytes()
+    
+    def add_page(self, page, source, **values):
+        """
+        Record one page.
+        
+        Args:
+            page (int): 1-based page number
+            source (str): "text" (text layer), "ocr", "cache", "blank" or "checkpoint"
+            **values: Any of the other PAGE_FIELDS
+        """
+        record = dict.fromkeys(PAGE_FIELDS)
+        record.update(values, page=page, source=source)
+        self.pages.append(record)
+    
+    def summary(self):
+        """
+        Aggregate the per-page records.
+        
+        Returns:
+            dict: Totals per stage, page counts by source and throughput
+        """
+        def total(field):
+            return sum(page[field] or 0.0 for page in self.pages)
+        
+        pages_by_source = {}
+        for page in self.pages:
+            pages_by_source[page["source"]] = pages_by_source.get(page["source"], 0) + 1
+        
+        worker_peaks = [
+            page["worker_peak_rss_bytes"] for page in self.pages
+            if page["worker_peak_rss_bytes"] is not None
+        ]
+        dpis = [page["dpi"] for page in self.pages if page["dpi"] is not None]
+        tesseract_peaks = [
+            page["tesseract_peak_rss_bytes"] for page in self.pages
+            if page["tesseract_peak_rss_bytes"] is not None
+        ]
+        
+        return {
+            "pdf_path": self.pdf_path,
+            "mode": self.mode,
+            "settings": self.settings,
+            "pages": len(self.pages),
+            "pages_by_source": pages_by_source,
+            "mean_dpi": sum(dpis) / len(dpis) if dpis else None,
+            "open_s": self.open_s,
+            "wait_s": total("wait_s"),
+            "extract_s": total("extract_s"),
+            "render_s": total("render_s"),
+            "preprocess_s": total("preprocess_s"),
+            "ocr_s": total("ocr_s"),
+            "join_s": self.join_s,
+            "total_s": self.total_s,
+            "pages_per_sec": len(self.pages) / self.total_s if self.total_s else 0.0,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "worker_peak_rss_bytes": max(worker_peaks, default=None),
+            "tesseract_peak_rss_bytes": max(tesseract_peaks, default=None),
+        }
+    
+    def write_report(self, path):
+        """
+        Write the profile to a file.
+        
+        A .csv path gets one row per page; any other path gets JSON with the
+        summary and the per-page records.
+        
+        Args:
+            path (str): Output file path
+        """
+        pages = sorted(self.pages, key=lambda page: page["page"])
+        if str(path).lower().endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=PAGE_FIELDS)
+                writer.writeheader()
+                writer.writerows(pages)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"summary": self.summary(), "pages": pages}, f, indent=2)
@@ -0,0 +1,197 @@
+"""
+Page Analysis Module
+Cheap measurements taken from low-resolution page previews, used to decide
+how a page should be rendered for OCR.
+"""
+
+import fitz  # PyMuPDF
+import numpy as np
+
+
+# Resolution of the grayscale preview the measurements are taken from
+PREVIEW_DPI = 72
+
+# Adaptive rendering aims for lines of text this many pixels tall. Tesseract's
+# accuracy drops quickly below roughly 8pt text at 300 DPI, about 32 pixels.
+TARGET_TEXT_HEIGHT_PX = 32
+
+# Bounds and granularity of adaptively chosen resolutions
+MIN_ADAPTIVE_DPI = 100
+MAX_ADAPTIVE_DPI = 400
+ADAPTIVE_DPI_STEP = 25
+
+# Resolution used when a page has no measurable lines of text
+FALLBACK_DPI = 200
+
+# Pages whose preview has a smaller share of ink pixels than this are blank.
+# A lone page number is around 0.00006; a scanned blank sheet with specks,
+# shadows and punch holes is below 0.00001.
+DEFAULT_BLANK_THRESHOLD = 0.00005
+
+# Share of each edge ignored by blank detection (scanner shadows, punch holes)
+BLANK_MARGIN = 0.05
+
+# How much darker than the paper a preview pixel must be to count as ink.
+# Isolated specks are averaged away at preview resolution; bleed-through
+# from the back of the sheet stays lighter than this.
+BLANK_INK_CONTRAST = 64
+
+
+def render_preview(page, dpi=PREVIEW_DPI, clip=None):
+    """
+    Render a page as a small grayscale array.
+    
+    Args:
+        page (fitz.Page): Page to render
+        dpi (int): Preview resolution
+        clip (fitz.Rect): Optional part of the page to render
+    
+    Returns:
+        numpy.ndarray: 2-D uint8 array, 0 = black, 255 = white
+    """
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False, clip=clip)
+    samples = np.frombuffer(pix.samples, dtype=np.uint8)
+    return samples.reshape(pix.height, pix.stride)[:, :pix.width]
+
+
+def otsu_threshold(gray):
+    """
+    Find the gray level that best separates ink from background.
+    
+    Args:
+        gray (numpy.ndarray): uint8 grayscale image
+    
+    Returns:
+        int: Pixels at or below this level are ink
+    """
+    hist = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    levels = np.arange(256)
+    weight_dark = np.cumsum(hist)
+    weight_light = weight_dark[-1] - weight_dark
+    sum_dark = np.cumsum(hist * levels)
+    mean_dark = sum_dark / np.maximum(weight_dark, 1)
+    mean_light = (sum_dark[-1] - sum_dark) / np.maximum(weight_light, 1)
+    between = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+    return int(np.argmax(between))
+
+
+def ink_mask(gray, min_contrast=32):
+    """
+    Mark the ink pixels of a grayscale image.
+    
+    Args:
+        gray (numpy.ndarray): uint8 grayscale image
+        min_contrast (int): Images whose darkest and lightest levels differ by
+                            less than this are treated as having no ink
+    
+    Returns:
+        numpy.ndarray: Boolean array, True where there is ink
+    """
+    if int(gray.max()) - int(gray.min()) < min_contrast:
+        return np.zeros(gray.shape, dtype=bool)
+    return gray <= otsu_threshold(gray)
+
+
+def estimate_text_height(gray, dpi=PREVIEW_DPI, strips=4):
+    """
+    Estimate the height of the smaller lines of text on a page.
+    
+    Rows containing ink are found with a horizontal projection profile and
+    each run of consecutive ink rows is taken as one line. The page is split
+    into vertical strips first so that lines in side-by-side columns don't
+    merge. Runs too short to be text (specks) or too tall (images) are ignored.
+    
+    Args:
+        gray (numpy.ndarray): Grayscale preview of the page
+        dpi (int): Resolution of the preview
+        strips (int): Number of vertical strips the page is split into
+    
+    Returns:
+        float: Line height in points (25th percentile, so small print wins),
+               or None if fewer than three lines were found
+    """
+    mask = ink_mask(gray)
+    min_run = 2
+    max_run = dpi * 0.75
+    heights = []
+    
+    for strip in np.array_split(mask, strips, axis=1):
+        if strip.shape[1] == 0:
+            continue
+        ink_rows = strip.sum(axis=1) >= max(1, strip.shape[1] * 0.005)
+        edges = np.diff(np.concatenate(([0], ink_rows.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        runs = ends - starts
+        heights.extend(runs[(runs >= min_run) & (runs <= max_run)])
+    
+    if len(heights) < 3:
+        return None
+    return float(np.percentile(heights, 25)) * 72 / dpi
+
+
+def dpi_for_text_height(text_height_pt):
+    """
+    Pick the lowest resolution at which text of the given height reaches
+    TARGET_TEXT_HEIGHT_PX.
+    
+    Args:
+        text_height_pt (float): Line height in points, or None if unknown
+    
+    Returns:
+        int: Resolution, a multiple of ADAPTIVE_DPI_STEP within the adaptive bounds
+    """
+    if not text_height_pt:
+        return FALLBACK_DPI
+    dpi = TARGET_TEXT_HEIGHT_PX * 72 / text_height_pt
+    dpi = -(-dpi // ADAPTIVE_DPI_STEP) * ADAPTIVE_DPI_STEP
+    return int(min(max(dpi, MIN_ADAPTIVE_DPI), MAX_ADAPTIVE_DPI))
+
+
+def ink_ratio(gray, margin=BLANK_MARGIN, contrast=BLANK_INK_CONTRAST):
+    """
+    Measure how much of a page is covered by ink.
+    
+    Args:
+        gray (numpy.ndarray): Grayscale preview of the page
+        margin (float): Share of each edge to ignore
+        contrast (int): How much darker than the paper (the median level) a
+                        pixel must be to count as ink
+    
+    Returns:
+        float: Share of ink pixels inside the margins, from 0.0 to 1.0
+    """
+    height, width = gray.shape
+    top, left = int(height * margin), int(width * margin)
+    inner = gray[top:height - top, left:width - left]
+    if inner.size == 0:
+        return 0.0
+    paper = int(np.median(inner))
+    return float(np.count_nonzero(inner < paper - contrast)) / inner.size
+
+
+def is_blank_page(page, threshold=DEFAULT_BLANK_THRESHOLD):
+    """
+    Check whether a page is clearly empty, from a low-resolution preview.
+    
+    Args:
+        page (fitz.Page): Page to check
+        threshold (float): Largest ink_ratio() still considered blank
+    
+    Returns:
+        bool: True if the page is blank
+    """
+    return ink_ratio(render_preview(page)) < threshold
+
+
+def choose_page_dpi(page):
+    """
+    Choose the OCR resolution for one page from a low-resolution preview.
+    
+    Args:
+        page (fitz.Page): Page to analyse
+    
+    Returns:
+        int: Resolution to render the page at
+    """
+    return dpi_for_text_height(estimate_text_height(render_preview(page)))
@@ -0,0 +1,144 @@
+"""
+Page Regions Module
+Finds the parts of a page that need OCR from its layout, so born-digital
+pages with scanned inserts only have the inserts rendered and recognized.
+
+A region needs OCR when it is an embedded image that looks like text: large
+enough not to be an icon, not already covered by the page's own text, and
+with lines of ink in its preview. Photos, charts and blank images are left out.
+"""
+
+from collections import namedtuple
+
+import fitz  # PyMuPDF
+
+from page_analysis import PREVIEW_DPI, estimate_text_height, ink_ratio, render_preview
+
+
+# Images smaller than this on either side (points, 1/2 inch) are logos,
+# icons or bullets rather than scanned text
+MIN_REGION_SIZE_PT = 36
+
+# Images whose area is at least this much covered by text blocks already have
+# a text layer, e.g. scans that were OCR'd before
+REGION_TEXT_COVERAGE = 0.5
+
+# Images whose preview has less ink than this are blank backgrounds
+MIN_REGION_INK = 0.001
+
+# Text layer flags: the "dict" output without image blocks, whose bboxes
+# come from get_image_info() without decoding any image data
+TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+class RegionPlan(namedtuple("RegionPlan", "blocks regions text_heights")):
+    """
+    What a page is made of, as found by plan_page_regions().
+    
+    Attributes:
+        blocks (list): (bbox, text) of each block of the text layer
+        regions (list): fitz.Rect of each area that needs OCR, top to bottom
+        text_heights (list): Estimated line height in points of each region
+    """
+    
+    __slots__ = ()
+
+
+def text_blocks(page):
+    """
+    Read the text blocks of a page's text layer.
+    
+    Args:
+        page (fitz.Page): Page to read
+    
+    Returns:
+        list: (bbox, text) per block with text, bbox as an (x0, y0, x1, y1) tuple
+    """
+    blocks = []
+    for block in page.get_text("dict", flags=TEXT_FLAGS)["blocks"]:
+        lines = [
+            "".join(span["text"] for span in line["spans"]) for line in block.get("lines", ())
+        ]
+        text = "\n".join(line for line in lines if line.strip())
+        if text:
+            blocks.append((tuple(block["bbox"]), text))
+    return blocks
+
+
+def _merge_overlapping(rects):
+    """Join rectangles that overlap, e.g. a scan stored as several strips."""
+    merged = []
+    for rect in rects:
+        rect = fitz.Rect(rect)
+        overlapping = [other for other in merged if other.intersects(rect)]
+        while overlapping:
+            for other in overlapping:
+                merged.remove(other)
+                rect |= other
+            overlapping = [other for other in merged if other.intersects(rect)]
+        merged.append(rect)
+    return merged
+
+
+def _region_text_height(page, rect):
+    """
+    Look for lines of text in a preview of an image region.
+    
+    Returns:
+        float: Line height in points, or None for blank, photo or chart regions
+    """
+    gray = render_preview(page, PREVIEW_DPI, clip=rect)
+    if gray.size == 0 or ink_ratio(gray, margin=0) < MIN_REGION_INK:
+        return None
+    return estimate_text_height(gray, PREVIEW_DPI)
+
+
+def plan_page_regions(page):
+    """
+    Split a page into its text layer and the regions that need OCR.
+    
+    Args:
+        page (fitz.Page): Page to analyse
+    
+    Returns:
+        RegionPlan: The page's text blocks and OCR regions
+    """
+    blocks = text_blocks(page)
+    block_rects = [fitz.Rect(bbox) for bbox, _ in blocks]
+    
+    candidates = []
+    for image in page.get_image_info():
+        rect = fitz.Rect(image["bbox"]) & page.rect
+        if rect.is_empty or rect.width < MIN_REGION_SIZE_PT or rect.height < MIN_REGION_SIZE_PT:
+            continue
+        candidates.append(rect)
+    
+    regions = []
+    for rect in _merge_overlapping(candidates):
+        covered = sum((block & rect).get_area() for block in block_rects)
+        if covered >= rect.get_area() * REGION_TEXT_COVERAGE:
+            continue
+        text_height = _region_text_height(page, rect)
+        if text_height is not None:
+            regions.append((rect, text_height))
+    
+    regions.sort(key=lambda region: (region[0].y0, region[0].x0))
+    return RegionPlan(blocks, [rect for rect, _ in regions],
+                      [text_height for _, text_height in regions])
+
+
+def merge_in_reading_order(items):
+    """
+    Join pieces of a page's text in reading order.
+    
+    Pieces are ordered top to bottom, and left to right where they start
+    at the same height, as PyMuPDF's own sort=True does for text blocks.
+    
+    Args:
+        items (list): (bbox, text) pairs, bbox as (x0, y0, x1, y1)
+    
+    Returns:
+        str: The texts, one piece per paragraph
+    """
+    ordered = sorted(items, key=lambda item: (round(item[0][1]), item[0][0]))
+    return "\n\n".join(text.strip() for _, text in ordered if text.strip()) + "\n"
@@ -2,42 +2,68 @@
 """
 PyInstaller specification file for PDF OCR Desktop Application
 This creates a standalone executable with all dependencies bundled.
+
+The bundle is kept to what the application actually loads: every file in it
+is unpacked or mapped at startup, so unused modules cost launch time as well
+as download size. Check the effect of changes with the report printed by
+build.py.
 """
 
 import os
 import sys
-from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+from PyInstaller.utils.hooks import collect_submodules
 
 block_cipher = None
 
-# Collect all data files for packages that need them
-datas = []
+# PIL image plugins that are used: PNG for the images handed to tesseract,
+# PPM for pages rendered by Poppler and BMP for images handed to tesserocr.
+# PyInstaller's PIL hook bundles every plugin unless the rest are excluded.
+PIL_PLUGINS_USED = {'PIL.PngImagePlugin', 'PIL.PpmImagePlugin', 'PIL.BmpImagePlugin'}
+pil_plugins_unused = [
+    name for name in collect_submodules('PIL', filter=lambda name: name.endswith('ImagePlugin'))
+    if name not in PIL_PLUGINS_USED
+]
 
-# Add pytesseract data files if any
-datas += collect_data_files('pytesseract', include_py_files=True)
+# Poppler is only the fallback renderer; pdf2image runs these two programs
+POPPLER_PROGRAMS = ('pdftoppm', 'pdfinfo')
 
-# Add any additional data files from the project
-# Add Poppler binaries if they exist in the project
-if os.path.exists('poppler'):
-    datas += [('poppler', 'poppler')]
+# Add Poppler binaries if they exist in the project: the programs above and
+# the DLLs they load, without the rest of the Poppler tree
+binaries = []
+poppler_bin = os.path.join('poppler', 'Library', 'bin')
+if os.path.isdir(poppler_bin):
+    for name in os.listdir(poppler_bin):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() == '.dll' or stem in POPPLER_PROGRAMS:
+            binaries.append((os.path.join(poppler_bin, name), poppler_bin))
 
-# Collect hidden imports
-hiddenimports = []
-hiddenimports += collect_submodules('PIL')
-hiddenimports += ['tkinter', 'tkinter.ttk', 'tkinter.filedialog', 
-                   'tkinter.messagebox', 'tkinter.scrolledtext']
+excludes = pil_plugins_unused + [
+    # PIL integrations for other toolkits and viewers
+    'PIL.ImageQt', 'PIL.ImageShow', 'PIL.ImageTk', 'PIL.ImageGrab',
+    # Test suites and developer tools. unittest, doctest, pydoc, pdb, distutils
+    # and setuptools stay in: libraries import them at runtime, e.g.
+    # numpy.testing imports unittest
+    'test', 'tkinter.test', 'idlelib', 'lib2to3', 'pip', 'numpy.f2py', 'numpy.distutils',
+    # Stdlib modules the application never uses
+    'xmlrpc', 'ftplib', 'imaplib', 'smtplib', 'poplib', 'mailbox', 'curses',
+    'sqlite3.test', 'turtle', 'turtledemo',
+    # Optional integrations that PIL and numpy probe for
+    'matplotlib', 'scipy', 'pandas', 'IPython', 'PyQt5', 'PyQt6', 'PySide2', 'PySide6',
+    # Modules of this project that aren't part of the desktop application
+    'cli', 'server', 'async_processor', 'benchmarks', 'corpus',
+]
 
 # Analysis
 a = Analysis(
     ['main.py'],
     pathex=[],
-    binaries=[],
-    datas=datas,
-    hiddenimports=hiddenimports,
+    binaries=binaries,
+    datas=[],
+    hiddenimports=sorted(PIL_PLUGINS_USED),
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=excludes,
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -52,6 +78,8 @@ pyz = PYZ(
 )
 
 # EXE
+# UPX is off: compressed DLLs have to be unpacked into memory on every launch,
+# which costs more startup time than the smaller download saves
 exe = EXE(
     pyz,
     a.scripts,
@@ -61,7 +89,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,
     console=False,  # GUI application, no console window
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -79,7 +107,7 @@ coll = COLLECT(
     a.zipfiles,
     a.datas,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     name='PDF_OCR',
 )
@@ -5,18 +5,887 @@ Handles text extraction from PDFs and OCR for scanned documents.
 
 import fitz  # PyMuPDF
 import pytesseract
-from pdf2image import convert_from_path
 from PIL import Image
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import hashlib
+import json
+import math
 import os
+import re
+import signal
 import sys
+import threading
+import time
+from pathlib import Path
+
+from ocr_profile import ExtractionProfile, peak_rss_bytes
+from page_analysis import (
+    DEFAULT_BLANK_THRESHOLD, MAX_ADAPTIVE_DPI, choose_page_dpi, dpi_for_text_height,
+    is_blank_page
+)
+from page_regions import merge_in_reading_order, plan_page_regions
+from preprocessing import preprocess_image
+from shared_buffers import SharedBufferPool, SharedPage, load_shared_page, prepare_workers
+from structured_output import (
+    LAYOUT_FORMATS, WRITER_CLASSES, output_paths, parse_tsv, text_layer_words,
+    words_to_points
+)
+
+try:
+    import tesserocr
+except ImportError:  # optional, OCR falls back to pytesseract
+    tesserocr = None
+
+
+# Extraction modes: embedded text only, OCR every page, OCR only the pages
+# without a usable text layer, or OCR only the scanned regions of each page
+EXTRACTION_MODES = ("text", "ocr", "hybrid", "regions")
+
+# Returned by the extract methods, per mode, when no page had any text
+EMPTY_RESULT_TEXT = {
+    "text": "[No text found - This might be a scanned PDF. Try using OCR instead.]",
+    "ocr": "[No text could be extracted via OCR. The PDF might be empty or the image quality is too poor.]",
+    "hybrid": "[No text could be extracted. The PDF might be empty or the image quality is too poor.]",
+    "regions": "[No text could be extracted. The PDF might be empty or the image quality is too poor.]",
+}
+
+# Rasterization backends for OCR input: PyMuPDF renders in-process, Poppler
+# (via pdf2image) runs pdftoppm as a subprocess and is kept as a fallback.
+RENDER_BACKENDS = ("pymupdf", "poppler")
+
+# Using a lower DPI for faster processing, increase to 300 for better quality
+DEFAULT_DPI = 200
+
+# dpi value that picks a resolution per page from the size of its text
+ADAPTIVE_DPI = "auto"
+
+# Text used in place of a page whose OCR exceeded the per-page timeout
+PAGE_TIMEOUT_TEXT = "[OCR timed out on this page]"
+
+# Text used in place of a region (regions mode) whose OCR didn't finish within
+# the page's timeout; the rest of the page is kept
+REGION_TIMEOUT_TEXT = "[OCR timed out on this region]"
+
+# Text used in place of a page that was detected as blank and not OCR'd
+BLANK_PAGE_TEXT = "[Blank page - OCR skipped]"
+
+# How often (seconds) waits on OCR workers wake up to check for cancellation
+CANCEL_POLL_INTERVAL = 0.1
+
+# Pages whose text layer has fewer non-whitespace characters than this are
+# treated as scanned by the hybrid extraction mode
+MIN_TEXT_LAYER_CHARS = 10
+
+# Indirect object reference in the source of a PDF object, e.g. "12 0 R"
+PDF_REFERENCE = re.compile(r"\b(\d+) (\d+) R\b")
+
+# OCR engines in order of preference for engine="auto". tesserocr keeps
+# libtesseract and the language model loaded between pages; pytesseract
+# starts a new tesseract process for every page but needs no compiled module.
+OCR_ENGINES = ("tesserocr", "pytesseract")
+
+
+def _get_poppler_path():
+    """Return the bundled Poppler bin directory on Windows, if present."""
+    if sys.platform == 'win32':
+        from pathlib import Path
+        local_poppler = Path(__file__).parent / "poppler" / "Library" / "bin"
+        if local_poppler.exists():
+            return str(local_poppler)
+    return None
+
+
+def iter_page_images(pdf_path, dpi=DEFAULT_DPI, backend="pymupdf", page_numbers=None):
+    """
+    Render the pages of a PDF one at a time.
+    
+    Args:
+        pdf_path (str): Path to the PDF file
+        dpi (int): Rendering resolution, or ADAPTIVE_DPI to choose one per
+                   page from a low-resolution preview (see page_analysis)
+        backend (str): One of RENDER_BACKENDS
+        page_numbers (list): Optional 1-based page numbers to render.
+                             Defaults to every page.
+        
+    Yields:
+        PIL.Image.Image: One RGB image per requested page, in the given order,
+                         with the resolution used in image.info["dpi"]
+    """
+    if backend not in RENDER_BACKENDS:
+        raise ValueError(f"Unknown render backend: {backend}")
+    
+    with fitz.open(pdf_path) as doc:
+        if page_numbers is None:
+            page_numbers = range(1, doc.page_count + 1)
+        
+        for page_num in page_numbers:
+            yield _render_page(pdf_path, doc[page_num - 1], dpi, backend)
+
+
+def _render_page(pdf_path, page, dpi, backend):
+    """
+    Render one page for OCR.
+    
+    Args:
+        pdf_path (str): Path to the PDF file (used by the Poppler backend)
+        page (fitz.Page): Page of the open document
+        dpi (int): Rendering resolution, or ADAPTIVE_DPI
+        backend (str): One of RENDER_BACKENDS
+        
+    Returns:
+        PIL.Image.Image: RGB image with the resolution used in image.info["dpi"]
+    """
+    page_dpi = choose_page_dpi(page) if dpi == ADAPTIVE_DPI else dpi
+    
+    if backend == "pymupdf":
+        # Pixels go straight from the pixmap into a PIL image, with no
+        # subprocess and no temporary files
+        pix = page.get_pixmap(dpi=page_dpi)
+        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        pix = None
+    else:
+        # pdf2image is only needed for this fallback, so it isn't loaded at startup
+        from pdf2image import convert_from_path
+        image = convert_from_path(
+            pdf_path,
+            dpi=page_dpi,
+            first_page=page.number + 1,
+            last_page=page.number + 1,
+            poppler_path=_get_poppler_path()
+        )[0]
+    
+    image.info["dpi"] = (page_dpi, page_dpi)
+    return image
+
+
+def _render_page_shared(pdf_path, page, dpi, backend, buffers, check=None):
+    """
+    Render one page for OCR into a buffer of a SharedBufferPool.
+    
+    With PyMuPDF the pixmap's samples are copied straight into the buffer,
+    without building a PIL image in this process.
+    
+    Args:
+        pdf_path (str): Path to the PDF file (used by the Poppler backend)
+        page (fitz.Page): Page of the open document
+        dpi (int): Rendering resolution, or ADAPTIVE_DPI
+        backend (str): One of RENDER_BACKENDS
+        buffers (SharedBufferPool): Pool the pixels are written to
+        check (callable): Optional, called while waiting for a free buffer
+        
+    Returns:
+        SharedPage: The rendered page
+        
+    Raises:
+        OSError: If shared memory can't be allocated
+    """
+    if backend != "pymupdf":
+        image = _render_page(pdf_path, page, dpi, backend).convert("RGB")
+        return buffers.share(
+            image.tobytes(), "RGB", image.width, image.height, image.info["dpi"][0], check
+        )
+    
+    page_dpi = choose_page_dpi(page) if dpi == ADAPTIVE_DPI else dpi
+    pix = page.get_pixmap(dpi=page_dpi)
+    return buffers.share(pix.samples_mv, "RGB", pix.width, pix.height, page_dpi, check)
+
+
+def estimate_page_bytes(page, dpi, clip=None):
+    """
+    Estimate the memory of a page rendered for OCR, before rendering it.
+    
+    Args:
+        page (fitz.Page): Page to be rendered
+        dpi (int): Rendering resolution, or ADAPTIVE_DPI, which is estimated
+                   at the highest resolution it may choose
+        clip (fitz.Rect): Optional part of the page that is rendered
+        
+    Returns:
+        int: Bytes of the RGB image
+    """
+    if dpi == ADAPTIVE_DPI:
+        dpi = MAX_ADAPTIVE_DPI
+    rect = clip or page.rect
+    width = math.ceil(rect.width / 72 * dpi)
+    height = math.ceil(rect.height / 72 * dpi)
+    return width * height * 3
+
+
+class RegionImages(namedtuple("RegionImages", "images rects blocks words")):
+    """
+    The scanned regions of a page rendered for OCR in regions mode, with the
+    text layer their text is merged into.
+    
+    Attributes:
+        images (list): PIL image of each region, with its resolution in info["dpi"]
+        rects (list): (x0, y0, x1, y1) of each region on the page, in points
+        blocks (list): (bbox, text) of each text block of the page's text layer
+        words (list): The text layer's words with layout, otherwise None
+    """
+    
+    __slots__ = ()
+    
+    def close(self):
+        for image in self.images:
+            image.close()
+
+
+def _render_regions(page, plan, dpi, words=None):
+    """
+    Render the OCR regions of a page, as planned by plan_page_regions().
+    
+    Regions are always rendered with PyMuPDF, which can render part of a
+    page. With ADAPTIVE_DPI each region gets its own resolution, chosen from
+    the line height found when it was planned.
+    
+    Args:
+        page (fitz.Page): Page of the open document
+        plan (RegionPlan): The page's text blocks and regions
+        dpi (int): Rendering resolution, or ADAPTIVE_DPI
+        words (list): Optional text layer words, kept for the layout
+        
+    Returns:
+        RegionImages: The rendered regions
+    """
+    images = []
+    for rect, text_height in zip(plan.regions, plan.text_heights):
+        region_dpi = dpi_for_text_height(text_height) if dpi == ADAPTIVE_DPI else dpi
+        pix = page.get_pixmap(dpi=region_dpi, clip=rect)
+        image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        image.info["dpi"] = (region_dpi, region_dpi)
+        images.append(image)
+    return RegionImages(images, [tuple(rect) for rect in plan.regions], plan.blocks, words)
+
+
+def parse_page_range(spec, page_count):
+    """
+    Parse a page range such as "1-3,7,10-" into page numbers.
+    
+    Args:
+        spec (str): Comma-separated page numbers and ranges. "N-" runs to the
+                    last page and "-N" starts at the first.
+        page_count (int): Number of pages in the document
+        
+    Returns:
+        list: Sorted, unique 1-based page numbers
+        
+    Raises:
+        ValueError: If the range is malformed, empty or outside the document
+    """
+    pages = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, last = part.split("-", 1)
+                first = int(first) if first.strip() else 1
+                last = int(last) if last.strip() else page_count
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid page range: '{part}'")
+        if first < 1 or last > page_count or first > last:
+            raise ValueError(f"Page range '{part}' is outside pages 1-{page_count}")
+        pages.update(range(first, last + 1))
+    
+    if not pages:
+        raise ValueError("No pages selected")
+    return sorted(pages)
+
+
+def _page_resources(doc, page):
+    """Return the source of a page's /Resources, inherited from the page tree if needed."""
+    xref = page.xref
+    while xref:
+        kind, value = doc.xref_get_key(xref, "Resources")
+        if kind != "null":
+            return value
+        kind, value = doc.xref_get_key(xref, "Parent")
+        xref = int(value.split()[0]) if kind == "xref" else 0
+    return ""
+
+
+def _hash_objects(doc, source, digest):
+    """
+    Hash a PDF object source and every object it references, directly or
+    through other objects, with the raw data of their streams.
+    
+    References are replaced by the order in which they are reached, so the
+    same objects stored under different xref numbers in another file hash
+    alike. Pages and page tree nodes aren't followed, so a stray reference
+    back to a page can't pull in the whole document.
+    """
+    order = {}
+    queue = []
+    
+    def renumber(text):
+        def replace(match):
+            xref = int(match.group(1))
+            if xref not in order:
+                order[xref] = len(order)
+                queue.append(xref)
+            return f"#{order[xref]}"
+        return PDF_REFERENCE.sub(replace, text).encode("utf-8", "surrogatepass")
+    
+    digest.update(renumber(source))
+    position = 0
+    while position < len(queue):
+        xref = queue[position]
+        position += 1
+        if doc.xref_get_key(xref, "Type") in (("name", "/Page"), ("name", "/Pages")):
+            continue
+        digest.update(renumber(doc.xref_object(xref, compressed=True)))
+        if doc.xref_is_stream(xref):
+            digest.update(doc.xref_stream_raw(xref) or b"")
+
+
+def page_fingerprint(doc, page_num):
+    """
+    Hash the content of a page for use as a cache key.
+    
+    Covers the page geometry, its content streams, its whole /Resources
+    tree (fonts with their encodings and embedded font programs, images, and
+    form XObjects with their own resources) and its annotations with their
+    appearance streams, which are rendered with the page. Identical pages in different
+    files share a fingerprint, and any edit that changes how the page looks
+    changes it, including swapping a font under byte-identical content.
+    
+    Args:
+        doc (fitz.Document): Open PDF document
+        page_num (int): 1-based page number
+        
+    Returns:
+        str: Hex digest of the page content
+    """
+    page = doc[page_num - 1]
+    digest = hashlib.sha256()
+    digest.update(repr((tuple(page.rect), page.rotation)).encode("ascii"))
+    digest.update(page.read_contents())
+    _hash_objects(doc, _page_resources(doc, page), digest)
+    kind, annots = doc.xref_get_key(page.xref, "Annots")
+    if kind != "null":
+        digest.update(b"/Annots")
+        _hash_objects(doc, annots, digest)
+    return digest.hexdigest()
+
+
+class CancelToken:
+    """
+    Flag used to stop a running extraction.
+    
+    Create one per job, pass it to an extraction method and call cancel()
+    from any thread. The job checks it between pages and while waiting for
+    OCR workers.
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+    
+    def cancel(self):
+        """Request cancellation of the job."""
+        self._event.set()
+    
+    @property
+    def cancelled(self):
+        """True once cancel() has been called."""
+        return self._event.is_set()
+
+
+class ExtractionCancelled(Exception):
+    """
+    Raised when an extraction is stopped with a CancelToken.
+    
+    Attributes:
+        partial_text (str): Text of the pages that finished before the job
+                            stopped, in the usual "--- Page N ---" format
+        completed_pages (int): Number of pages in partial_text
+    """
+    
+    def __init__(self, message, partial_text="", completed_pages=0):
+        super().__init__(message)
+        self.partial_text = partial_text
+        self.completed_pages = completed_pages
+
+
+class ExtractionTimeout(ExtractionCancelled):
+    """Raised when an extraction exceeds its whole-job timeout."""
+
+
+class PageResult(namedtuple("PageResult", "page text source timing layout",
+                            defaults=(None,))):
+    """
+    One extracted page, as yielded by PDFProcessor.iter_pages().
+    
+    Attributes:
+        page (int): 1-based page number
+        text (str): Text of the page
+        source (str): "text" (text layer), "ocr", "cache", "blank" or "checkpoint"
+        timing (dict): Per-stage times in seconds and image details, with
+                       the keys of ocr_profile.PAGE_FIELDS that apply
+        layout (dict): With iter_pages(layout=True), the page width and
+                       height in points, the render dpi of OCR'd pages and
+                       its words, each with text, bbox in points, conf and
+                       the block, par and line it belongs to. Otherwise None.
+    """
+    
+    __slots__ = ()
+
+
+class PytesseractEngine:
+    """
+    OCR engine that runs the tesseract executable once per page.
+    
+    Every call writes the image to a temporary file, starts tesseract and
+    loads the language model again, so it carries a fixed cost per page.
+    """
+    
+    name = "pytesseract"
+    
+    def __init__(self, lang):
+        """
+        Initialize the engine.
+        
+        Args:
+            lang (str): Tesseract language code(s), e.g. "eng" or "eng+por"
+        """
+        self.lang = lang
+    
+    def recognize(self, image, timeout=None):
+        """
+        Run Tesseract on a single page image and return the recognized text.
+        
+        If Tesseract runs longer than timeout seconds it is killed and
+        PAGE_TIMEOUT_TEXT is returned, so one bad page can't hang the job.
+        """
+        try:
+            return pytesseract.image_to_string(image, lang=self.lang, timeout=timeout or 0)
+        except RuntimeError as e:
+            if "timeout" in str(e).lower():
+                return PAGE_TIMEOUT_TEXT
+            raise
+    
+    def recognize_with_words(self, image, timeout=None):
+        """
+        Run Tesseract once for both the text and the word boxes of a page.
+        
+        Returns:
+            tuple: (text, words) where words come from parse_tsv(), in pixels.
+                   On timeout, (PAGE_TIMEOUT_TEXT, []).
+        """
+        try:
+            text, tsv = pytesseract.run_and_get_multiple_output(
+                image, extensions=["txt", "tsv"], lang=self.lang, timeout=timeout or 0
+            )
+        except RuntimeError as e:
+            if "timeout" in str(e).lower():
+                return PAGE_TIMEOUT_TEXT, []
+            raise
+        return text, parse_tsv(tsv)
+    
+    def close(self):
+        """Release engine resources (nothing to release for pytesseract)."""
+
+
+class TesserocrEngine:
+    """
+    OCR engine that keeps one libtesseract API handle loaded between pages.
+    
+    The language model is loaded once when the engine is created, and images
+    are passed to Tesseract in memory instead of through temporary files.
+    A handle must only be used by one thread at a time.
+    """
+    
+    name = "tesserocr"
+    
+    def __init__(self, lang):
+        """
+        Initialize the engine and load the language model.
+        
+        Args:
+            lang (str): Tesseract language code(s), e.g. "eng" or "eng+por"
+            
+        Raises:
+            RuntimeError: If tesserocr isn't installed or the model can't be loaded
+        """
+        if tesserocr is None:
+            raise RuntimeError("tesserocr is not installed")
+        
+        self.lang = lang
+        kwargs = {"lang": lang}
+        tessdata = _tessdata_dir()
+        if tessdata:
+            kwargs["path"] = tessdata
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+    
+    def recognize(self, image, timeout=None):
+        """
+        Run Tesseract on a single page image and return the recognized text.
+        
+        If recognition takes longer than timeout seconds it is abandoned and
+        PAGE_TIMEOUT_TEXT is returned.
+        """
+        self._api.SetImage(image)
+        if not self._api.Recognize(timeout=int(timeout * 1000) if timeout else 0):
+            if timeout:
+                return PAGE_TIMEOUT_TEXT
+            raise RuntimeError("Tesseract failed to recognize the page")
+        return self._api.GetUTF8Text()
+    
+    def recognize_with_words(self, image, timeout=None):
+        """
+        Recognize a page once and read both its text and its word boxes.
+        
+        Returns:
+            tuple: (text, words) where words come from parse_tsv(), in pixels.
+                   On timeout, (PAGE_TIMEOUT_TEXT, []).
+        """
+        text = self.recognize(image, timeout)
+        if text == PAGE_TIMEOUT_TEXT:
+            return text, []
+        return text, parse_tsv(self._api.GetTSVText(0))
+    
+    def close(self):
+        """Free the Tesseract API handle."""
+        self._api.End()
+
+
+ENGINE_CLASSES = {engine.name: engine for engine in (TesserocrEngine, PytesseractEngine)}
+
+# Engines created by _get_engine, per thread: a tesserocr handle isn't thread-safe
+_engines = threading.local()
+
+
+def _tessdata_dir():
+    """
+    Return the tessdata directory next to the tesseract executable, if any.
+    
+    libtesseract finds its models through TESSDATA_PREFIX or its compiled-in
+    default, which misses the Windows installer layout that the executable
+    path detected by check_tesseract_installation() points at.
+    """
+    if os.environ.get("TESSDATA_PREFIX"):
+        return None
+    tesseract_cmd = pytesseract.pytesseract.tesseract_cmd
+    if not os.path.isabs(tesseract_cmd):
+        return None
+    tessdata = os.path.join(os.path.dirname(tesseract_cmd), "tessdata")
+    return tessdata if os.path.isdir(tessdata) else None
+
+
+def _get_engine(name, lang):
+    """Return this thread's engine for name and lang, creating it on first use."""
+    engines = getattr(_engines, "by_key", None)
+    if engines is None:
+        engines = _engines.by_key = {}
+    
+    key = (name, lang)
+    if key not in engines:
+        engines[key] = ENGINE_CLASSES[name](lang)
+    return engines[key]
+
+
+def _kill_worker_group(signum, frame):
+    """SIGTERM handler of OCR workers: end the worker with its tesseract child."""
+    os.killpg(os.getpgrp(), signal.SIGKILL)
+
+
+def _init_ocr_worker(tesseract_cmd, engine, lang):
+    """
+    Prepare a worker process for OCR.
+    
+    Worker processes don't inherit the Tesseract path detected in the parent
+    on Windows, so it is passed in explicitly. Tesseract's own OpenMP threading
+    is limited to one thread because the pool already keeps every core busy.
+    The engine is created here so every page the worker handles reuses it.
+    
+    On POSIX each worker leads its own process group, so terminating it also
+    kills the tesseract process it is waiting for, which would otherwise run
+    on until the page timeout.
+    """
+    if os.name == "posix":
+        os.setpgrp()
+        signal.signal(signal.SIGTERM, _kill_worker_group)
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    _get_engine(engine, lang)
+
+
+def _ocr_image(image, lang, timeout=None, engine="pytesseract"):
+    """
+    Run Tesseract on a single page image and return the recognized text.
+    
+    If Tesseract runs longer than timeout seconds, PAGE_TIMEOUT_TEXT is
+    returned, so one bad page can't hang the job.
+    """
+    return _get_engine(engine, lang).recognize(image, timeout)
+
+
+def _timed_ocr_image(image, lang, timeout=None, engine="pytesseract", preprocess=False,
+                     layout=False):
+    """
+    Optionally preprocess an image, run _ocr_image on it and measure both.
+    
+    Preprocessing runs here rather than where pages are rendered, so it is
+    spread over the OCR worker processes.
+    
+    With layout set, the word boxes are read in the same Tesseract pass and
+    converted to PDF points of the rendered page.
+    
+    Returns:
+        tuple: (text, stats, words) where stats holds the preprocessing and
+               OCR times and the peak memory of this worker process and of its
+               Tesseract children, and words is None without layout
+    """
+    dpi = image.info["dpi"][0]
+    start = time.perf_counter()
+    if preprocess:
+        image = preprocess_image(image)
+    preprocess_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    words = None
+    if layout:
+        text, words = _get_engine(engine, lang).recognize_with_words(image, timeout)
+        words = words_to_points(words, dpi, image.info.get("offset", (0, 0)))
+    else:
+        text = _ocr_image(image, lang, timeout, engine)
+    return text, {
+        "preprocess_s": preprocess_s,
+        "ocr_s": time.perf_counter() - start,
+        "worker_peak_rss_bytes": peak_rss_bytes(),
+        "tesseract_peak_rss_bytes": peak_rss_bytes(children=True),
+    }, words
+
+
+def _timed_ocr_shared_page(page, lang, timeout=None, engine="pytesseract", preprocess=False,
+                           layout=False):
+    """_timed_ocr_image() for a page handed over in a shared memory buffer."""
+    return _timed_ocr_image(
+        load_shared_page(page), lang, timeout, engine, preprocess, layout
+    )
+
+
+def _timed_ocr_regions(regions, lang, timeout=None, engine="pytesseract", preprocess=False,
+                       layout=False):
+    """
+    Run _timed_ocr_image() on each region of a page and merge their text
+    with the page's text layer in reading order.
+    
+    The timeout applies to the page, not to each region. Regions that don't
+    finish within it are replaced by REGION_TIMEOUT_TEXT, in their place in
+    the reading order, and the text blocks and other regions are kept.
+    
+    Returns:
+        tuple: (text, stats, words) as from _timed_ocr_image(), with times
+               summed and peak memory taken over the regions. With layout,
+               words holds the text layer's words and then each region's,
+               moved to page coordinates and given their own block numbers.
+    """
+    start = time.monotonic()
+    items = list(regions.blocks)
+    stats = {"preprocess_s": 0.0, "ocr_s": 0.0}
+    words = list(regions.words or []) if layout else None
+    next_block = max((word["block"] for word in words or []), default=-1) + 1
+    
+    for image, rect in zip(regions.images, regions.rects):
+        remaining = None
+        if timeout:
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                items.append((rect, REGION_TIMEOUT_TEXT))
+                continue
+        text, region_stats, region_words = _timed_ocr_image(
+            image, lang, remaining, engine, preprocess, layout
+        )
+        for key, value in region_stats.items():
+            if key.endswith("_s"):
+                stats[key] += value
+            elif stats.get(key) is None or (value or 0) > stats[key]:
+                stats[key] = value
+        if text == PAGE_TIMEOUT_TEXT:
+            items.append((rect, REGION_TIMEOUT_TEXT))
+            continue
+        items.append((rect, text))
+        
+        if layout:
+            x0, y0 = rect[0], rect[1]
+            for word in region_words:
+                left, top, right, bottom = word["bbox"]
+                word["bbox"] = [round(left + x0, 2), round(top + y0, 2),
+                                round(right + x0, 2), round(bottom + y0, 2)]
+                word["block"] += next_block
+            words.extend(region_words)
+            next_block = max((word["block"] for word in words), default=-1) + 1
+    
+    return merge_in_reading_order(items), stats, words
+
+
+def _is_timed_out(text):
+    """True if the OCR of a page, or of one of its regions, timed out."""
+    return text == PAGE_TIMEOUT_TEXT or REGION_TIMEOUT_TEXT in text
+
+
+def _format_pages(pages):
+    """Join a {page_num: text} dict into the "--- Page N ---" output format."""
+    return "\n".join(
+        f"--- Page {page_num} ---\n{pages[page_num]}\n" for page_num in sorted(pages)
+    )
+
+
+def _join_results(results, profile=None):
+    """
+    Join PageResults into the "--- Page N ---" output format.
+    
+    The time taken is recorded as the profile's join stage, and the profile's
+    total is updated to include it.
+    """
+    start = time.perf_counter()
+    full_text = "\n".join(
+        f"--- Page {result.page} ---\n{result.text}\n" for result in results
+    )
+    if profile is not None:
+        profile.join_s = time.perf_counter() - start
+        profile.finish()
+    return full_text
+
+
+def results_to_text(results, mode, profile=None):
+    """
+    Turn the PageResults of a job into the text returned by the extract
+    methods, or a hint when nothing was found.
+    
+    Callers that consume iter_pages() themselves can use it to produce the
+    same text as the extract methods.
+    
+    Args:
+        results (list): PageResults in page order
+        mode (str): Extraction mode the results came from
+        profile (ExtractionProfile): Optional, gets the join time
+        
+    Returns:
+        str: "--- Page N ---" text, or EMPTY_RESULT_TEXT[mode] in hybrid and
+             regions mode when no page has text, e.g. every page is blank
+    """
+    # Pages skipped as blank have a marker but no text of their own
+    if mode in ("hybrid", "regions") and not any(
+        result.text.strip() for result in results if result.source != "blank"
+    ):
+        return EMPTY_RESULT_TEXT[mode]
+    
+    full_text = _join_results(results, profile)
+    if not full_text.strip():
+        return EMPTY_RESULT_TEXT[mode]
+    return full_text
+
+
+def _terminate_executor(executor, pending):
+    """
+    Stop a process pool without waiting for the pages it is working on.
+    
+    Queued pages are cancelled and the worker processes are terminated, so
+    their cores are freed right away instead of after the current page.
+    """
+    for future in pending:
+        future.cancel()
+    
+    terminate_workers = getattr(executor, "terminate_workers", None)
+    if terminate_workers is not None:
+        # Python 3.14+
+        terminate_workers()
+    else:
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def terminate_ocr_pool(pool):
+    """
+    Stop a pool from PDFProcessor.create_ocr_pool() right away.
+    
+    Pages still queued are cancelled and the workers are terminated in the
+    middle of their current page, so the interpreter doesn't wait for them
+    at exit. Jobs still using the pool fail or are cancelled.
+    
+    Args:
+        pool (ProcessPoolExecutor): Pool to stop
+    """
+    _terminate_executor(pool, ())
 
 
 class PDFProcessor:
     """Handles PDF text extraction and OCR operations."""
     
-    def __init__(self):
-        """Initialize the PDF processor."""
+    def __init__(self, max_workers=None, dpi=DEFAULT_DPI, render_backend="pymupdf",
+                 lang="eng", cache=None, engine="auto", preprocess=False,
+                 blank_threshold=DEFAULT_BLANK_THRESHOLD):
+        """
+        Initialize the PDF processor.
+        
+        Args:
+            max_workers (int): Number of worker processes used for OCR.
+                               Defaults to the number of CPU cores.
+            dpi (int): Resolution used to render pages for OCR, or ADAPTIVE_DPI
+                       ("auto") to choose the lowest resolution that keeps
+                       each page's text large enough for Tesseract
+            render_backend (str): "pymupdf" (default) or "poppler"
+            lang (str): Tesseract language code(s), e.g. "eng" or "eng+por"
+            cache (OCRCache): Optional cache of per-page OCR results
+            engine (str): "tesserocr", "pytesseract", or "auto" (default) to use
+                          tesserocr when it can be loaded and pytesseract otherwise
+            preprocess (bool): Binarize, deskew and trim the margins of each
+                               page image before OCR (see preprocessing)
+            blank_threshold (float): Pages with a smaller share of ink pixels
+                                     are reported as BLANK_PAGE_TEXT without
+                                     OCR. 0 disables blank page detection.
+        """
+        if render_backend not in RENDER_BACKENDS:
+            raise ValueError(
+                f"Unknown render backend '{render_backend}'. "
+                f"Choose one of: {', '.join(RENDER_BACKENDS)}"
+            )
+        if dpi != ADAPTIVE_DPI and not (isinstance(dpi, int) and dpi > 0):
+            raise ValueError(f"dpi must be a positive integer or '{ADAPTIVE_DPI}'")
+        if blank_threshold is not None and blank_threshold < 0:
+            raise ValueError("blank_threshold must not be negative")
+        if engine != "auto" and engine not in OCR_ENGINES:
+            raise ValueError(
+                f"Unknown OCR engine '{engine}'. "
+                f"Choose one of: auto, {', '.join(OCR_ENGINES)}"
+            )
+        
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.dpi = dpi
+        self.render_backend = render_backend
+        self.lang = lang
+        self.cache = cache
+        self.preprocess = preprocess
+        self.blank_threshold = blank_threshold
         self.check_tesseract_installation()
+        self.engine = self._select_engine(engine)
+    
+    def _select_engine(self, engine):
+        """
+        Resolve the requested OCR engine to one that can actually be loaded.
+        
+        Returns:
+            str: Name of the engine to use
+            
+        Raises:
+            RuntimeError: If "tesserocr" was requested explicitly and can't be loaded
+        """
+        if engine == "pytesseract":
+            return engine
+        
+        try:
+            TesserocrEngine(self.lang).close()
+        except Exception as e:
+            if engine == "tesserocr":
+                raise RuntimeError(f"The tesserocr OCR engine is not available: {e}")
+            return "pytesseract"
+        return "tesserocr"
     
     def check_tesseract_installation(self):
         """
@@ -48,101 +917,849 @@ class PDFProcessor:
                     f"Original error: {str(e)}"
                 )
     
-    def extract_text_from_pdf(self, pdf_path):
+    def iter_pages(self, pdf_path, mode="hybrid", pages=None, progress_callback=None,
+                   max_workers=None, cancel_token=None, page_timeout=None,
+                   job_timeout=None, min_text_chars=MIN_TEXT_LAYER_CHARS, profile=None,
+                   checkpoint=None, layout=False, memory=None, ocr_pool=None):
         """
-        Extract text from a text-based PDF using PyMuPDF.
+        Extract a PDF lazily, one page at a time.
+        
+        Pages are only read, rendered and sent to OCR as the caller iterates,
+        so taking the first result of a 1,000-page file costs about one page.
+        With more than one OCR worker, up to two pages per worker beyond the
+        one being waited for are worked on ahead, to keep the workers busy.
+        Closing the iterator early stops the job and its workers.
         
         Args:
             pdf_path (str): Path to the PDF file
+            mode (str): "text" (text layer only), "ocr" (OCR every page),
+                        "hybrid" (OCR only pages without usable text) or
+                        "regions" (OCR only the scanned images on each
+                        page that contain text, merged with its text layer)
+            pages: Optional page range, either a string such as "1-3,7" or
+                   an iterable of 1-based page numbers. Defaults to every page.
+            progress_callback (callable): Optional, called with
+                                          (completed_pages, total_pages) each
+                                          time a page finishes
+            max_workers (int): Optional override of the processor's worker count
+            cancel_token (CancelToken): Optional token to stop the job; pages in
+                                        progress are abandoned and workers stopped
+            page_timeout (float): Seconds Tesseract may spend on one page before
+                                  it is killed and the page marked as timed out
+            job_timeout (float): Seconds the whole job may take
+            min_text_chars (int): In hybrid and regions mode, pages with fewer
+                                  non-whitespace characters in their text
+                                  layer are sent to OCR
+            profile (ExtractionProfile): Optional, filled in with per-stage timings
+            checkpoint (OCRCheckpoint): Optional, records each finished page
+                                        on disk. Pages it holds from an
+                                        interrupted run of the same PDF with
+                                        the same settings are not redone and
+                                        have the source "checkpoint".
+            layout (bool): Also collect word boxes and confidences into each
+                           result's layout, from the same OCR pass
+            memory (MemoryShare): Optional share of a scheduler.MemoryBudget.
+                                  Each page is only rendered once its
+                                  estimated image size fits the budget, and
+                                  its memory is returned when its OCR ends.
+            ocr_pool (ProcessPoolExecutor): Optional pool from create_ocr_pool(),
+                                            shared with other jobs. Pages are
+                                            then always OCR'd in the pool, and
+                                            stopping the job cancels its queued
+                                            pages without stopping the workers.
             
-        Returns:
-            str: Extracted text from all pages
+        Yields:
+            PageResult: One per requested page, in page order
             
         Raises:
             FileNotFoundError: If PDF file doesn't exist
-            Exception: For other PDF processing errors
+            ValueError: If mode or pages is invalid
+            ExtractionCancelled: If cancel_token was cancelled. Pages that had
+                                 already finished are yielded first, and its
+                                 partial_text holds all of them.
+            ExtractionTimeout: If job_timeout was exceeded, as for cancellation
         """
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(
+                f"Unknown extraction mode '{mode}'. "
+                f"Choose one of: {', '.join(EXTRACTION_MODES)}"
+            )
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
+        deadline = time.monotonic() + job_timeout if job_timeout else None
+        if profile is not None:
+            profile.start(pdf_path, mode, {} if mode == "text" else self._ocr_settings())
+        
+        finished = {}
+        buffer = {}
         try:
-            # Open the PDF
-            doc = fitz.open(pdf_path)
-            text_content = []
-            
-            # Extract text from each page
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-                text_content.append(f"--- Page {page_num + 1} ---\n{text}\n")
+            start = time.perf_counter()
+            with fitz.open(pdf_path) as doc:
+                page_count = doc.page_count
+            resumed = {}
+            if checkpoint is not None:
+                resumed = checkpoint.open(
+                    pdf_path, self._checkpoint_settings(mode, min_text_chars, layout)
+                )
+            if profile is not None:
+                profile.open_s = time.perf_counter() - start
             
-            doc.close()
+            page_numbers = self._resolve_pages(pages, page_count)
+            results = self._iter_results(
+                pdf_path,
+                page_numbers,
+                mode,
+                min_text_chars,
+                resumed=resumed,
+                layout=layout,
+                memory=memory,
+                progress_callback=progress_callback,
+                max_workers=max_workers or self.max_workers,
+                cancel_token=cancel_token,
+                page_timeout=page_timeout,
+                deadline=deadline,
+                shared_pool=ocr_pool
+            )
             
-            full_text = "\n".join(text_content)
+            # Results arrive in completion order; hand them out in page order
+            position = 0
+            for page_num, text, source, timing, page_layout in results:
+                finished[page_num] = text
+                # Timed out pages are retried when the job is resumed
+                if (checkpoint is not None and source != "checkpoint"
+                        and not _is_timed_out(text)):
+                    checkpoint.add(page_num, text, source, page_layout)
+                if profile is not None:
+                    profile.add_page(page_num, source, **timing)
+                buffer[page_num] = PageResult(page_num, text, source, timing, page_layout)
+                while (position < len(page_numbers)
+                       and page_numbers[position] in buffer):
+                    yield buffer.pop(page_numbers[position])
+                    position += 1
+        
+        except ExtractionCancelled as e:
+            e.partial_text = _format_pages(finished)
+            e.completed_pages = len(finished)
+            # Pages that finished out of order are still handed out, past the gaps
+            for page_num in sorted(buffer):
+                yield buffer.pop(page_num)
+            raise
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            if profile is not None:
+                profile.finish()
+    
+    def extract_text_from_pdf(self, pdf_path, page_callback=None, cancel_token=None,
+                              profile=None, pages=None):
+        """
+        Extract text from a text-based PDF using PyMuPDF.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            page_callback (callable): Optional, called with (page_num, text)
+                                      in page order as soon as each page is done
+            cancel_token (CancelToken): Optional token to stop extraction between pages
+            profile (ExtractionProfile): Optional, filled in with per-page timings
+            pages: Optional page range, as for iter_pages()
             
-            if not full_text.strip():
-                return "[No text found - This might be a scanned PDF. Try using OCR instead.]"
+        Returns:
+            str: Extracted text from all pages
             
-            return full_text
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            ExtractionCancelled: If cancel_token was cancelled
+            Exception: For other PDF processing errors
+        """
+        try:
+            results = self._collect_pages(
+                self.iter_pages(
+                    pdf_path, mode="text", pages=pages, cancel_token=cancel_token,
+                    profile=profile
+                ),
+                page_callback
+            )
+            return results_to_text(results, "text", profile)
             
+        except (ExtractionCancelled, FileNotFoundError):
+            raise
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
     
-    def extract_text_with_ocr(self, pdf_path, progress_callback=None):
+    def extract_text_with_ocr(self, pdf_path, progress_callback=None, max_workers=None,
+                              page_callback=None, cancel_token=None, page_timeout=None,
+                              job_timeout=None, profile=None, pages=None, checkpoint=None):
         """
         Extract text from a scanned PDF using OCR.
-        Converts each page to an image and performs OCR.
+        Converts each page to an image and performs OCR, running several
+        pages at the same time in a pool of worker processes.
         
         Args:
             pdf_path (str): Path to the PDF file
             progress_callback (callable): Optional callback function to report progress
-                                        Called with (current_page, total_pages)
+                                        Called with (completed_pages, total_pages)
+                                        each time a page finishes
+            max_workers (int): Optional override of the processor's worker count
+            page_callback (callable): Optional, called with (page_num, text)
+                                      in page order as soon as each page is done
+            cancel_token (CancelToken): Optional token to stop the job; pages in
+                                        progress are abandoned and workers stopped
+            page_timeout (float): Seconds Tesseract may spend on one page before
+                                  it is killed and the page marked as timed out
+            job_timeout (float): Seconds the whole job may take
+            profile (ExtractionProfile): Optional, filled in with per-stage timings
+            pages: Optional page range, as for iter_pages()
+            checkpoint (OCRCheckpoint): Optional, lets an interrupted job resume
             
         Returns:
             str: OCR-extracted text from all pages
             
         Raises:
             FileNotFoundError: If PDF file doesn't exist
+            ExtractionCancelled: If cancel_token was cancelled. Its partial_text
+                                 holds the pages that already finished.
+            ExtractionTimeout: If job_timeout was exceeded, with partial_text
             Exception: For other OCR processing errors
         """
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        try:
+            results = self._collect_pages(
+                self.iter_pages(
+                    pdf_path, mode="ocr", pages=pages,
+                    progress_callback=progress_callback, max_workers=max_workers,
+                    cancel_token=cancel_token, page_timeout=page_timeout,
+                    job_timeout=job_timeout, profile=profile, checkpoint=checkpoint
+                ),
+                page_callback
+            )
+            return results_to_text(results, "ocr", profile)
+            
+        except (ExtractionCancelled, FileNotFoundError):
+            raise
+        except Exception as e:
+            raise Exception(f"Error performing OCR on PDF: {str(e)}")
+    
+    def extract_text_hybrid(self, pdf_path, progress_callback=None, max_workers=None,
+                            min_text_chars=MIN_TEXT_LAYER_CHARS, page_callback=None,
+                            cancel_token=None, page_timeout=None, job_timeout=None,
+                            profile=None, pages=None, checkpoint=None):
+        """
+        Extract text from a PDF that mixes text-based and scanned pages.
+        Uses the embedded text layer where a page has one and performs OCR
+        only on the pages without usable text.
         
+        Args:
+            pdf_path (str): Path to the PDF file
+            progress_callback (callable): Optional callback function to report progress
+                                        Called with (completed_pages, total_pages)
+                                        each time a page finishes
+            max_workers (int): Optional override of the processor's worker count
+            min_text_chars (int): Pages with fewer non-whitespace characters
+                                  in their text layer are sent to OCR
+            page_callback (callable): Optional, called with (page_num, text)
+                                      in page order as soon as each page is done
+            cancel_token (CancelToken): Optional token to stop the job
+            page_timeout (float): Seconds Tesseract may spend on one page
+            job_timeout (float): Seconds the whole job may take
+            profile (ExtractionProfile): Optional, filled in with per-stage timings
+            pages: Optional page range, as for iter_pages()
+            checkpoint (OCRCheckpoint): Optional, lets an interrupted job resume
+            
+        Returns:
+            str: Extracted text from all pages
+            
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            ExtractionCancelled: If cancel_token was cancelled, with partial_text
+            ExtractionTimeout: If job_timeout was exceeded, with partial_text
+            Exception: For other processing errors
+        """
         try:
-            # Convert PDF pages to images
-            # Using a lower DPI for faster processing, increase to 300 for better quality
-            
-            # Set Poppler path for Windows
-            poppler_path = None
-            if sys.platform == 'win32':
-                from pathlib import Path
-                local_poppler = Path(__file__).parent / "poppler" / "Library" / "bin"
-                if local_poppler.exists():
-                    poppler_path = str(local_poppler)
-            
-            images = convert_from_path(pdf_path, dpi=200, poppler_path=poppler_path)
-            
-            text_content = []
-            total_pages = len(images)
-            
-            # Perform OCR on each page
-            for page_num, image in enumerate(images, start=1):
-                if progress_callback:
-                    progress_callback(page_num, total_pages)
-                
-                # Perform OCR on the image
-                text = pytesseract.image_to_string(image)
-                text_content.append(f"--- Page {page_num} ---\n{text}\n")
+            results = self._collect_pages(
+                self.iter_pages(
+                    pdf_path, mode="hybrid", pages=pages,
+                    progress_callback=progress_callback, max_workers=max_workers,
+                    cancel_token=cancel_token, page_timeout=page_timeout,
+                    job_timeout=job_timeout, min_text_chars=min_text_chars,
+                    profile=profile, checkpoint=checkpoint
+                ),
+                page_callback
+            )
+            return results_to_text(results, "hybrid", profile)
             
-            full_text = "\n".join(text_content)
+        except (ExtractionCancelled, FileNotFoundError):
+            raise
+        except Exception as e:
+            raise Exception(f"Error performing hybrid extraction on PDF: {str(e)}")
+    
+    def extract_text_regions(self, pdf_path, progress_callback=None, max_workers=None,
+                             min_text_chars=MIN_TEXT_LAYER_CHARS, page_callback=None,
+                             cancel_token=None, page_timeout=None, job_timeout=None,
+                             profile=None, pages=None, checkpoint=None):
+        """
+        Extract text from a PDF whose pages have scanned inserts.
+        Uses the embedded text layer of each page and performs OCR only on
+        the images that contain text, merged with it in reading order.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            progress_callback (callable): Optional callback function to report progress
+                                        Called with (completed_pages, total_pages)
+                                        each time a page finishes
+            max_workers (int): Optional override of the processor's worker count
+            min_text_chars (int): Pages without such images and with fewer
+                                  non-whitespace characters in their text
+                                  layer are OCR'd whole
+            page_callback (callable): Optional, called with (page_num, text)
+                                      in page order as soon as each page is done
+            cancel_token (CancelToken): Optional token to stop the job
+            page_timeout (float): Seconds Tesseract may spend on one page
+            job_timeout (float): Seconds the whole job may take
+            profile (ExtractionProfile): Optional, filled in with per-stage timings
+            pages: Optional page range, as for iter_pages()
+            checkpoint (OCRCheckpoint): Optional, lets an interrupted job resume
             
-            if not full_text.strip():
-                return "[No text could be extracted via OCR. The PDF might be empty or the image quality is too poor.]"
+        Returns:
+            str: Extracted text from all pages
             
-            return full_text
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            ExtractionCancelled: If cancel_token was cancelled, with partial_text
+            ExtractionTimeout: If job_timeout was exceeded, with partial_text
+            Exception: For other processing errors
+        """
+        try:
+            results = self._collect_pages(
+                self.iter_pages(
+                    pdf_path, mode="regions", pages=pages,
+                    progress_callback=progress_callback, max_workers=max_workers,
+                    cancel_token=cancel_token, page_timeout=page_timeout,
+                    job_timeout=job_timeout, min_text_chars=min_text_chars,
+                    profile=profile, checkpoint=checkpoint
+                ),
+                page_callback
+            )
+            return results_to_text(results, "regions", profile)
             
+        except (ExtractionCancelled, FileNotFoundError):
+            raise
         except Exception as e:
-            raise Exception(f"Error performing OCR on PDF: {str(e)}")
+            raise Exception(f"Error performing region extraction on PDF: {str(e)}")
+    
+    def extract_with_profile(self, pdf_path, mode="ocr", report_path=None, **kwargs):
+        """
+        Extract text and return per-stage timings alongside it.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            mode (str): One of EXTRACTION_MODES
+            report_path (str): Optional .json or .csv file to write the profile to
+            **kwargs: Passed on to the extraction method
+            
+        Returns:
+            tuple: (text, ExtractionProfile)
+            
+        Raises:
+            ValueError: If mode is unknown
+        """
+        extract = {
+            "text": self.extract_text_from_pdf,
+            "ocr": self.extract_text_with_ocr,
+            "hybrid": self.extract_text_hybrid,
+            "regions": self.extract_text_regions,
+        }.get(mode)
+        if extract is None:
+            raise ValueError(
+                f"Unknown extraction mode '{mode}'. "
+                f"Choose one of: {', '.join(EXTRACTION_MODES)}"
+            )
+        
+        profile = ExtractionProfile()
+        text = extract(pdf_path, profile=profile, **kwargs)
+        if report_path:
+            profile.write_report(report_path)
+        return text, profile
+    
+    def export(self, pdf_path, output_base, formats=("txt",), mode="hybrid", **kwargs):
+        """
+        Extract a PDF once and save it in one or more output formats.
+        
+        Every page is handed to all the writers as soon as it is done, so the
+        text, JSON and hOCR outputs never hold more than one page in memory.
+        Word boxes are only collected when a format needs them, and come from
+        the same OCR pass as the text. Outputs are written under temporary
+        names and only moved into place when the whole job succeeded.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            output_base (str): Output path without suffix; each format adds
+                               its own (.txt, .jsonl, .hocr, .searchable.pdf)
+            formats (list): Names from structured_output.OUTPUT_SUFFIXES
+            mode (str): "text", "ocr" or "hybrid"
+            **kwargs: Passed on to iter_pages()
+            
+        Returns:
+            dict: {format: Path} of the files written
+            
+        Raises:
+            ValueError: If a format is unknown
+            FileNotFoundError: If PDF file doesn't exist
+            ExtractionCancelled: If cancel_token was cancelled; nothing is written
+            ExtractionTimeout: If job_timeout was exceeded; nothing is written
+        """
+        unknown = [name for name in formats if name not in WRITER_CLASSES]
+        if unknown:
+            raise ValueError(
+                f"Unknown output format '{unknown[0]}'. "
+                f"Choose from: {', '.join(WRITER_CLASSES)}"
+            )
+        
+        paths = output_paths(Path(output_base), formats)
+        layout = any(name in LAYOUT_FORMATS for name in formats)
+        results = self.iter_pages(pdf_path, mode=mode, layout=layout, **kwargs)
+        writers = []
+        try:
+            writers = [WRITER_CLASSES[name](path, pdf_path) for name, path in paths.items()]
+            for result in results:
+                for writer in writers:
+                    writer.write_page(result)
+            for writer in writers:
+                writer.close()
+        except BaseException:
+            results.close()
+            for writer in writers:
+                writer.abort()
+            raise
+        return paths
+    
+    @staticmethod
+    def _collect_pages(results, page_callback=None):
+        """
+        Drain an iter_pages() iterator, passing each page to page_callback.
+        
+        Returns:
+            list: The PageResults, in page order
+        """
+        collected = []
+        for result in results:
+            collected.append(result)
+            if page_callback:
+                page_callback(result.page, result.text)
+        return collected
+    
+    @staticmethod
+    def _resolve_pages(pages, page_count):
+        """
+        Turn the pages argument of iter_pages() into a list of page numbers.
+        
+        Returns:
+            list: Sorted, unique 1-based page numbers
+            
+        Raises:
+            ValueError: If a page is outside the document or none are selected
+        """
+        if pages is None:
+            return list(range(1, page_count + 1))
+        if isinstance(pages, str):
+            return parse_page_range(pages, page_count)
+        
+        page_numbers = sorted(set(int(page_num) for page_num in pages))
+        if not page_numbers:
+            raise ValueError("No pages selected")
+        if page_numbers[0] < 1 or page_numbers[-1] > page_count:
+            raise ValueError(f"Pages must be between 1 and {page_count}")
+        return page_numbers
+    
+    def create_ocr_pool(self, max_workers=None):
+        """
+        Start a pool of OCR worker processes for this processor's settings.
+        
+        Pass it as the ocr_pool argument of iter_pages() to share one set of
+        workers between jobs; shut it down when it is no longer needed.
+        
+        Args:
+            max_workers (int): Worker processes, defaults to the processor's
+            
+        Returns:
+            ProcessPoolExecutor: Pool whose workers have the engine loaded
+        """
+        prepare_workers()
+        return ProcessPoolExecutor(
+            max_workers=max_workers or self.max_workers,
+            initializer=_init_ocr_worker,
+            initargs=(pytesseract.pytesseract.tesseract_cmd, self.engine, self.lang)
+        )
+    
+    def _checkpoint_settings(self, mode, min_text_chars, layout=False):
+        """Return the settings that affect a job's text, used to validate checkpoints."""
+        settings = {"mode": mode, "layout": layout}
+        if mode != "text":
+            settings.update(self._ocr_settings(), blank_threshold=self.blank_threshold)
+        if mode in ("hybrid", "regions"):
+            settings["min_text_chars"] = min_text_chars
+        return settings
+    
+    def _ocr_settings(self):
+        """Return the settings that affect OCR output, used in cache keys."""
+        return {
+            "dpi": self.dpi,
+            "lang": self.lang,
+            "render_backend": self.render_backend,
+            "engine": self.engine,
+            "preprocess": self.preprocess,
+        }
+    
+    def _iter_page_tasks(self, pdf_path, page_numbers, mode, min_text_chars, resumed=None,
+                         layout=False, memory=None, check=None, buffers=None):
+        """
+        Decide, one page at a time, where each page's text comes from.
+        
+        The text layer is used when the mode allows it and the page has
+        enough text. Otherwise the OCR cache is consulted, then the blank page
+        check, and only if neither answers is the page rendered for OCR.
+        Pages restored from a checkpoint skip all of this.
+        
+        In regions mode, only the images of a page that contain text are
+        rendered, unless the page is rotated, or has neither such images nor
+        enough text, in which case it is handled as in hybrid mode.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            page_numbers (list): 1-based page numbers, in order
+            mode (str): One of EXTRACTION_MODES
+            min_text_chars (int): Hybrid and regions mode text layer threshold
+            resumed (dict): Optional {page_num: (text, source, layout)} from a
+                            checkpoint
+            layout (bool): Also collect the page size and word boxes
+            memory (MemoryShare): Optional, admits each page before it is rendered
+            check (callable): Optional, called while waiting for memory
+            buffers (SharedBufferPool): Optional pool to render pages into, for
+                                        OCR in worker processes. If shared
+                                        memory fails, pages are rendered as
+                                        PIL images from then on.
+            
+        Yields:
+            tuple: (page_num, image, text, source, stats, cache_key, layout)
+                   where image is the rendered page (a PIL image, or a
+                   SharedPage with buffers), or its RegionImages in regions
+                   mode, when it needs OCR and None when text already
+                   holds the result. For pages that need OCR,
+                   layout only has the page size so far.
+        """
+        use_cache = mode != "text" and self.cache is not None and self.cache.enabled
+        settings = self._ocr_settings()
+        if layout:
+            # Cached layouts are stored as JSON, apart from plain text entries
+            settings["layout"] = True
+        # Region pages hold text layer and OCR text, apart from whole page OCR
+        region_settings = {**settings, "regions": True}
+        
+        with fitz.open(pdf_path) as doc:
+            for page_num in page_numbers:
+                if resumed and page_num in resumed:
+                    text, _, page_layout = resumed[page_num]
+                    yield page_num, None, text, "checkpoint", {}, None, page_layout
+                    continue
+                
+                page = doc[page_num - 1]
+                stats = {}
+                page_layout = None
+                if layout:
+                    page_layout = {"width": page.rect.width, "height": page.rect.height}
+                
+                plan = None
+                if mode == "regions" and not page.rotation:
+                    start = time.perf_counter()
+                    plan = plan_page_regions(page)
+                    text = merge_in_reading_order(plan.blocks)
+                    if layout:
+                        page_layout["words"] = text_layer_words(page)
+                    stats["extract_s"] = time.perf_counter() - start
+                    if not plan.regions:
+                        plan = None
+                        if len("".join(text.split())) >= min_text_chars:
+                            yield page_num, None, text, "text", stats, None, page_layout
+                            continue
+                elif mode != "ocr":
+                    start = time.perf_counter()
+                    text = page.get_text()
+                    if layout:
+                        page_layout["words"] = text_layer_words(page)
+                    stats["extract_s"] = time.perf_counter() - start
+                    if mode == "text" or len("".join(text.split())) >= min_text_chars:
+                        yield page_num, None, text, "text", stats, None, page_layout
+                        continue
+                
+                cache_key = None
+                if use_cache:
+                    cache_key = self.cache.make_key(
+                        page_fingerprint(doc, page_num),
+                        settings if plan is None else region_settings
+                    )
+                    text = self.cache.get(cache_key)
+                    if text is not None:
+                        if layout:
+                            cached = json.loads(text)
+                            text = cached["text"]
+                            page_layout.update(dpi=cached["dpi"], words=cached["words"])
+                        yield page_num, None, text, "cache", stats, None, page_layout
+                        continue
+                
+                # Waits for memory and shared buffers are wait_s, not render_s
+                wait_s = 0.0
+                if plan is not None:
+                    if memory is not None:
+                        start = time.perf_counter()
+                        memory.acquire(page_num, sum(
+                            estimate_page_bytes(page, self.dpi, rect) for rect in plan.regions
+                        ), check)
+                        wait_s = time.perf_counter() - start
+                    start = time.perf_counter()
+                    regions = _render_regions(
+                        page, plan, self.dpi, page_layout["words"] if layout else None
+                    )
+                    stats.update({
+                        "wait_s": wait_s,
+                        "render_s": time.perf_counter() - start,
+                        "dpi": max(image.info["dpi"][0] for image in regions.images),
+                        "image_bytes": sum(
+                            image.width * image.height * 3 for image in regions.images
+                        ),
+                        "ocr_regions": len(regions.images),
+                    })
+                    if layout:
+                        page_layout["dpi"] = stats["dpi"]
+                    yield page_num, regions, None, "ocr", stats, cache_key, page_layout
+                    continue
+                
+                start = time.perf_counter()
+                if self.blank_threshold and is_blank_page(page, self.blank_threshold):
+                    stats["render_s"] = time.perf_counter() - start
+                    if layout:
+                        page_layout["words"] = []
+                    yield page_num, None, BLANK_PAGE_TEXT, "blank", stats, None, page_layout
+                    continue
+                
+                if memory is not None:
+                    admitted = time.perf_counter()
+                    memory.acquire(page_num, estimate_page_bytes(page, self.dpi), check)
+                    # The blank check's preview counts as rendering
+                    wait_s = time.perf_counter() - admitted
+                    start += wait_s
+                image = None
+                if buffers is not None:
+                    buffer_wait_s = buffers.wait_s
+                    try:
+                        image = _render_page_shared(
+                            pdf_path, page, self.dpi, self.render_backend, buffers, check
+                        )
+                        dpi, channels = image.dpi, len(image.mode)
+                        buffer_wait_s = buffers.wait_s - buffer_wait_s
+                        wait_s += buffer_wait_s
+                        start += buffer_wait_s
+                    except OSError:
+                        # Shared memory unavailable or full: pickle images instead
+                        buffers = None
+                if image is None:
+                    image = _render_page(pdf_path, page, self.dpi, self.render_backend)
+                    dpi, channels = image.info["dpi"][0], len(image.getbands())
+                stats.update({
+                    "wait_s": wait_s,
+                    "render_s": time.perf_counter() - start,
+                    "dpi": dpi,
+                    "width": image.width,
+                    "height": image.height,
+                    "image_bytes": image.width * image.height * channels,
+                })
+                if layout:
+                    page_layout["dpi"] = stats["dpi"]
+                yield page_num, image, None, "ocr", stats, cache_key, page_layout
+    
+    def _iter_results(self, pdf_path, page_numbers, mode, min_text_chars, resumed=None,
+                      layout=False, memory=None, progress_callback=None, max_workers=1,
+                      cancel_token=None, page_timeout=None, deadline=None, shared_pool=None):
+        """
+        Produce the text of selected pages, running OCR where it is needed.
+        
+        Pages that need OCR are rendered only while fewer than two pages per
+        worker are waiting for it, so peak memory doesn't depend on the number
+        of pages, and no page is touched before the caller asks for more
+        results. The worker pool is started on the first page that needs OCR.
+        Pages for worker processes are rendered into a SharedBufferPool with
+        one buffer per page in flight, so their pixels aren't pickled.
+        
+        Cancellation and the job deadline are checked before each page and
+        every CANCEL_POLL_INTERVAL seconds while waiting for workers. When
+        either triggers, or the caller stops iterating, the worker processes
+        are terminated immediately. With a cancel_token, pages are always
+        OCR'd in a worker process, even with one worker, so cancelling doesn't
+        have to wait for the page in progress.
+        
+        Args:
+            pdf_path (str): Path to the PDF file
+            page_numbers (list): 1-based page numbers, in order
+            mode (str): One of EXTRACTION_MODES
+            min_text_chars (int): Hybrid and regions mode text layer threshold
+            resumed (dict): Optional {page_num: (text, source, layout)} from a
+                            checkpoint
+            layout (bool): Also collect the page size and word boxes
+            memory (MemoryShare): Optional memory budget share; a page's
+                                  memory is returned as soon as its OCR
+                                  ends, even before its result is collected
+            progress_callback (callable): Optional, called with (completed, total)
+            max_workers (int): Maximum number of worker processes
+            cancel_token (CancelToken): Optional token checked between pages
+            page_timeout (float): Optional per-page Tesseract timeout in seconds
+            deadline (float): Optional time.monotonic() value the job must finish by
+            shared_pool (ProcessPoolExecutor): Optional pool from create_ocr_pool()
+                                               to use instead of starting one
+            
+        Yields:
+            tuple: (page_num, text, source, stats, layout) as each page
+                   finishes, in any order; stats holds its timings, image size
+                   and worker memory, and layout is None without layout
+            
+        Raises:
+            ExtractionCancelled: If cancel_token was cancelled
+            ExtractionTimeout: If the deadline passed
+        """
+        workers = min(max_workers, len(page_numbers))
+        completed = 0
+        
+        def check():
+            if cancel_token is not None and cancel_token.cancelled:
+                raise ExtractionCancelled("Extraction cancelled")
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ExtractionTimeout("Extraction timed out")
+        
+        def timeout_for_page():
+            # A page never gets more time than the job has left
+            timeouts = [page_timeout] if page_timeout else []
+            if deadline is not None:
+                timeouts.append(max(deadline - time.monotonic(), 0.1))
+            return min(timeouts) if timeouts else None
+        
+        def finish(page_num, text, source, stats, page_layout, cache_key=None):
+            nonlocal completed
+            if cache_key is not None and not _is_timed_out(text):
+                if page_layout is not None:
+                    self.cache.put(cache_key, json.dumps({
+                        "text": text, "dpi": page_layout["dpi"], "words": page_layout["words"]
+                    }))
+                else:
+                    self.cache.put(cache_key, text)
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, len(page_numbers))
+            return page_num, text, source, stats, page_layout
+        
+        def finish_ocr(page_num, stats, page_layout, cache_key, result):
+            text, ocr_stats, words = result
+            if page_layout is not None:
+                page_layout["words"] = words
+            return finish(page_num, text, "ocr", {**stats, **ocr_stats}, page_layout, cache_key)
+        
+        def collect(futures):
+            results = []
+            for future in futures:
+                page_num, stats, page_layout, cache_key = pending.pop(future)
+                result = future.result()
+                # A page killed because the job ran out of time isn't a page timeout
+                if (_is_timed_out(result[0]) and deadline is not None
+                        and time.monotonic() >= deadline):
+                    continue
+                results.append(finish_ocr(page_num, stats, page_layout, cache_key, result))
+            return results
+        
+        # Only OCR in this thread when nothing may need to stop it midway
+        use_pool = workers > 1 or shared_pool is not None or cancel_token is not None
+        buffers = None
+        if use_pool and SharedBufferPool.available():
+            buffers = SharedBufferPool(workers * 2)
+        tasks = self._iter_page_tasks(
+            pdf_path, page_numbers, mode, min_text_chars, resumed, layout, memory, check,
+            buffers
+        )
+        executor = None
+        pending = {}
+        try:
+            for page_num, image, text, source, stats, cache_key, page_layout in tasks:
+                check()
+                if image is None:
+                    yield finish(page_num, text, source, stats, page_layout)
+                    continue
+                
+                if not use_pool:
+                    ocr = _timed_ocr_regions if isinstance(image, RegionImages) else _timed_ocr_image
+                    result = ocr(
+                        image, self.lang, timeout_for_page(), self.engine, self.preprocess,
+                        layout
+                    )
+                    image.close()
+                    if memory is not None:
+                        memory.release(page_num)
+                    if _is_timed_out(result[0]):
+                        check()
+                    yield finish_ocr(page_num, stats, page_layout, cache_key, result)
+                    continue
+                
+                if executor is None:
+                    executor = shared_pool or self.create_ocr_pool(workers)
+                if isinstance(image, SharedPage):
+                    future = executor.submit(
+                        _timed_ocr_shared_page, image, self.lang, timeout_for_page(),
+                        self.engine, self.preprocess, layout
+                    )
+                    future.add_done_callback(
+                        lambda _, name=image.name: buffers.release(name)
+                    )
+                else:
+                    # Region images are small and sent pickled, like pages
+                    # rendered without shared memory
+                    ocr = _timed_ocr_regions if isinstance(image, RegionImages) else _timed_ocr_image
+                    future = executor.submit(
+                        ocr, image, self.lang, timeout_for_page(), self.engine,
+                        self.preprocess, layout
+                    )
+                if memory is not None:
+                    # Released by the pool's thread, so pages that finish while
+                    # this job waits for memory make room for it
+                    future.add_done_callback(
+                        lambda _, page_num=page_num: memory.release(page_num)
+                    )
+                pending[future] = (page_num, stats, page_layout, cache_key)
+                while len(pending) >= workers * 2:
+                    done, _ = wait(
+                        pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED
+                    )
+                    yield from collect(done)
+                    check()
+            
+            while pending:
+                done, _ = wait(
+                    pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED
+                )
+                yield from collect(done)
+                check()
+            check()
+        except BaseException:
+            if executor is shared_pool:
+                # Other jobs use the pool too: drop this job's queued pages and
+                # let the ones already running finish
+                for future in pending:
+                    future.cancel()
+            elif executor is not None:
+                _terminate_executor(executor, pending)
+            raise
+        finally:
+            tasks.close()
+            if memory is not None:
+                memory.release_all()
+            if buffers is not None:
+                buffers.close()
+        
+        if executor is not None and executor is not shared_pool:
+            executor.shutdown()
 
 
 # Simple test function
@@ -0,0 +1,173 @@
+"""
+Image Preprocessing Module
+Cleans up rendered pages before OCR: grayscale conversion, adaptive
+binarization, deskewing and trimming of blank margins.
+
+All steps work on whole NumPy arrays or use Pillow's C implementations,
+so their cost doesn't grow with Python-level loops over pixels.
+"""
+
+import numpy as np
+from PIL import Image
+
+
+# Bradley-Roth binarization: a pixel is ink when it is this much darker
+# than the mean of its neighbourhood
+BINARIZE_SENSITIVITY = 0.15
+
+# Deskewing searches this many degrees either side of level
+MAX_SKEW_DEGREES = 5.0
+
+# Deskewing is estimated on a copy of the page at most this wide
+DESKEW_SAMPLE_WIDTH = 1000
+
+# Pixels of white space kept around the content when margins are trimmed
+TRIM_PADDING = 10
+
+
+def to_grayscale(image):
+    """Return the page as a 2-D uint8 array."""
+    return np.asarray(image.convert("L"))
+
+
+def binarize(gray, window=None, sensitivity=BINARIZE_SENSITIVITY):
+    """
+    Adaptive binarization using local means from an integral image.
+    
+    Unlike a single global threshold, this copes with uneven lighting,
+    shadows near the binding and tinted paper.
+    
+    Args:
+        gray (numpy.ndarray): uint8 grayscale image
+        window (int): Side of the neighbourhood in pixels.
+                      Defaults to about 1/32 of the shorter image side.
+        sensitivity (float): How much darker than its neighbourhood a pixel
+                             must be to count as ink
+    
+    Returns:
+        numpy.ndarray: Boolean array, True where there is ink
+    """
+    height, width = gray.shape
+    if window is None:
+        window = max(15, min(height, width) // 32)
+    half = window // 2
+    window = half * 2 + 1  # odd, so it is centred on each pixel
+    
+    # Box sums from running totals along each axis. Edge padding keeps the
+    # window the same size everywhere, so every step is a whole-array slice.
+    padded = np.pad(gray.astype(np.int32), ((half + 1, half), (half + 1, half)), mode="edge")
+    totals = padded.cumsum(axis=0)
+    rows = totals[window:] - totals[:-window]
+    totals = rows.cumsum(axis=1)
+    box_sum = totals[:, window:] - totals[:, :-window]
+    
+    return gray.astype(np.float32) * (window * window) < box_sum * (1.0 - sensitivity)
+
+
+def estimate_skew(ink, max_degrees=MAX_SKEW_DEGREES):
+    """
+    Estimate the rotation of the text lines on a page.
+    
+    The ink is rotated by candidate angles and the one whose horizontal
+    projection profile has the sharpest line/gap transitions wins: first in
+    half-degree steps, then in tenths around the best coarse angle.
+    
+    Args:
+        ink (numpy.ndarray): Boolean ink mask
+        max_degrees (float): Largest skew considered, either way
+    
+    Returns:
+        float: Angle in degrees to rotate the page by to level it
+    """
+    sample = Image.fromarray(ink.astype(np.uint8) * 255)
+    if sample.width > DESKEW_SAMPLE_WIDTH:
+        scale = DESKEW_SAMPLE_WIDTH / sample.width
+        sample = sample.resize(
+            (DESKEW_SAMPLE_WIDTH, max(1, round(sample.height * scale))), Image.BILINEAR
+        )
+    
+    def score(angle):
+        rotated = np.asarray(sample.rotate(angle, resample=Image.NEAREST, fillcolor=0))
+        rows = rotated.sum(axis=1, dtype=np.int64)
+        return int(np.sum(np.diff(rows) ** 2))
+    
+    coarse = np.arange(-max_degrees, max_degrees + 0.01, 0.5)
+    best = max(coarse, key=score)
+    fine = np.arange(best - 0.4, best + 0.41, 0.1)
+    return float(max(fine, key=score))
+
+
+def trim_margins(ink, padding=TRIM_PADDING):
+    """
+    Find the bounding box of the content on a page.
+    
+    Args:
+        ink (numpy.ndarray): Boolean ink mask
+        padding (int): Blank pixels kept around the content
+    
+    Returns:
+        tuple: (left, top, right, bottom) crop box, or None if the page has no ink
+    """
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if rows.size == 0:
+        return None
+    
+    height, width = ink.shape
+    return (
+        max(int(cols[0]) - padding, 0),
+        max(int(rows[0]) - padding, 0),
+        min(int(cols[-1]) + padding + 1, width),
+        min(int(rows[-1]) + padding + 1, height),
+    )
+
+
+def preprocess_image(image, binarize_page=True, deskew=True, trim=True):
+    """
+    Prepare a rendered page for OCR.
+    
+    Args:
+        image (PIL.Image.Image): Rendered page
+        binarize_page (bool): Convert to black and white with adaptive thresholding
+        deskew (bool): Rotate the page so its text lines are level
+        trim (bool): Crop blank borders
+    
+    Returns:
+        PIL.Image.Image: Grayscale ("L") image, black text on white when binarized.
+                         Its info["offset"] holds the approximate position of
+                         its top left corner in the original image, in pixels.
+    """
+    gray = to_grayscale(image)
+    ink = binarize(gray)
+    offset_x, offset_y = 0, 0
+    
+    if deskew:
+        angle = estimate_skew(ink)
+        if abs(angle) >= 0.1:
+            height, width = gray.shape
+            gray = np.asarray(Image.fromarray(gray).rotate(
+                angle, resample=Image.BILINEAR, expand=True, fillcolor=255
+            ))
+            ink = binarize(gray)
+            # Expanding the canvas to fit the rotated page grows it on every side
+            offset_x -= (gray.shape[1] - width) // 2
+            offset_y -= (gray.shape[0] - height) // 2
+    
+    if binarize_page:
+        pixels = np.where(ink, 0, 255).astype(np.uint8)
+    else:
+        pixels = gray
+    
+    if trim:
+        box = trim_margins(ink)
+        if box is not None:
+            left, top, right, bottom = box
+            pixels = pixels[top:bottom, left:right]
+            offset_x += left
+            offset_y += top
+    
+    result = Image.fromarray(np.ascontiguousarray(pixels))
+    result.info["offset"] = (offset_x, offset_y)
+    if "dpi" in image.info:
+        result.info["dpi"] = image.info["dpi"]
+    return result
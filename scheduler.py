@@ -0,0 +1,173 @@
+"""
+Document Scheduler Module
+Runs several documents at the same time while keeping the page images they
+hold in memory within a fixed budget.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Default RAM budget for rendered page images, in megabytes
+DEFAULT_MEMORY_BUDGET_MB = 1024
+
+# Seconds between checks for cancellation while waiting for memory
+ADMISSION_POLL_INTERVAL = 0.2
+
+
+class MemoryBudget:
+    """
+    Admits page work in the order it was requested, only while the estimated
+    memory of all admitted pages fits the budget.
+    
+    Requests are served strictly first come, first served: a page that
+    doesn't fit yet holds back the ones behind it rather than being
+    overtaken forever by smaller pages. Since each document waits for at
+    most one page at a time, documents take turns and a large file can't
+    crowd out small ones. A single page larger than the whole budget is
+    admitted once nothing else is in use, so it can't wait forever.
+    """
+    
+    def __init__(self, limit_mb=DEFAULT_MEMORY_BUDGET_MB):
+        """
+        Initialize the budget.
+        
+        Args:
+            limit_mb (float): Memory that admitted pages may add up to
+        """
+        self.limit_bytes = int(limit_mb * 1024 * 1024)
+        self.used_bytes = 0
+        self.peak_bytes = 0
+        self._queue = deque()
+        self._condition = threading.Condition()
+    
+    def share(self):
+        """Return a MemoryShare that tracks one document's pages."""
+        return MemoryShare(self)
+    
+    def acquire(self, nbytes, check=None):
+        """
+        Wait until nbytes can be admitted, then reserve them.
+        
+        Args:
+            nbytes (int): Estimated memory of the work being admitted
+            check (callable): Optional, called while waiting; an exception it
+                              raises abandons the request and is passed on
+        """
+        ticket = object()
+        with self._condition:
+            self._queue.append(ticket)
+            try:
+                while not (self._queue[0] is ticket and self._fits(nbytes)):
+                    self._condition.wait(ADMISSION_POLL_INTERVAL)
+                    if check is not None:
+                        check()
+            except BaseException:
+                self._queue.remove(ticket)
+                self._condition.notify_all()
+                raise
+            
+            self._queue.popleft()
+            self.used_bytes += nbytes
+            self.peak_bytes = max(self.peak_bytes, self.used_bytes)
+            self._condition.notify_all()
+    
+    def release(self, nbytes):
+        """Return memory reserved by acquire()."""
+        with self._condition:
+            self.used_bytes -= nbytes
+            self._condition.notify_all()
+    
+    def _fits(self, nbytes):
+        return self.used_bytes == 0 or self.used_bytes + nbytes <= self.limit_bytes
+
+
+class MemoryShare:
+    """
+    One document's reservations in a MemoryBudget, keyed by page number.
+    
+    Pass an instance as the memory argument of PDFProcessor.iter_pages() or
+    the methods built on it.
+    """
+    
+    def __init__(self, budget):
+        """
+        Initialize the share.
+        
+        Args:
+            budget (MemoryBudget): Budget the reservations come from
+        """
+        self.budget = budget
+        self._held = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, key, nbytes, check=None):
+        """
+        Reserve memory for one page, waiting for its turn if necessary.
+        
+        Args:
+            key: Page the memory is for
+            nbytes (int): Estimated memory of the page
+            check (callable): Optional, see MemoryBudget.acquire()
+        """
+        self.budget.acquire(nbytes, check)
+        with self._lock:
+            self._held[key] = self._held.get(key, 0) + nbytes
+    
+    def release(self, key):
+        """Return the memory reserved for a page, if any is still held."""
+        with self._lock:
+            nbytes = self._held.pop(key, 0)
+        if nbytes:
+            self.budget.release(nbytes)
+    
+    def release_all(self):
+        """Return everything this document still holds."""
+        with self._lock:
+            nbytes = sum(self._held.values())
+            self._held.clear()
+        if nbytes:
+            self.budget.release(nbytes)
+
+
+class DocumentScheduler:
+    """
+    Runs document jobs in a bounded thread pool with a shared MemoryBudget.
+    
+    Each job gets its own MemoryShare, passed as the memory keyword argument,
+    so the render and OCR work of all running documents is admitted against
+    the same budget.
+    """
+    
+    def __init__(self, max_documents=4, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            max_documents (int): Documents processed at the same time
+            memory_budget_mb (float): RAM budget for rendered page images
+        """
+        self.budget = MemoryBudget(memory_budget_mb)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_documents), thread_name_prefix="document"
+        )
+    
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedule fn(*args, memory=<MemoryShare>, **kwargs).
+        
+        Returns:
+            concurrent.futures.Future: The job's result
+        """
+        return self._executor.submit(fn, *args, memory=self.budget.share(), **kwargs)
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        """Stop accepting jobs, optionally waiting for the running ones."""
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(cancel_futures=exc_type is not None)
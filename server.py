@@ -0,0 +1,545 @@
+"""
+PDF OCR Local Server
+Keeps a PDFProcessor and its OCR workers warm between requests and serves
+extraction over HTTP on localhost.
+
+Usage:
+    python server.py [--port 8765] [--ocr-workers 4] [--max-concurrent 4] [--max-queue 16]
+                     [--allow-paths DIR]
+
+Endpoints:
+    POST /extract   Body is either the PDF itself (Content-Type: application/pdf)
+                    or, with --allow-paths, JSON {"path": "/path/to/file.pdf"}
+                    naming a file under that folder. Query parameters:
+                    mode (text, ocr, hybrid, regions), pages (e.g. 1-3,7), page_timeout.
+                    Responds with one JSON object per line (NDJSON) for every
+                    page as soon as it is done, then a final summary line.
+    GET /metrics    Queue depth, pages/sec and latency histograms in the
+                    Prometheus text format.
+    GET /health     "ok" once the workers are ready.
+
+The server only listens on 127.0.0.1 and needs no network access. Requests
+whose Host header isn't 127.0.0.1 or localhost with the server's port are
+refused, so web pages can't reach it by rebinding their own domain name to
+127.0.0.1.
+"""
+
+import argparse
+import bisect
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from cli import dpi_argument
+from ocr_cache import OCRCache
+from page_analysis import DEFAULT_BLANK_THRESHOLD
+from pdf_processor import (
+    DEFAULT_DPI, EXTRACTION_MODES, OCR_ENGINES, PDFProcessor
+)
+from scheduler import DEFAULT_MEMORY_BUDGET_MB, MemoryBudget
+
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest PDF upload accepted, in megabytes
+DEFAULT_MAX_UPLOAD_MB = 200
+
+# Histogram bucket upper bounds, in seconds
+PAGE_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+REQUEST_LATENCY_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+# Pages/sec is reported over this many most recent seconds
+RATE_WINDOW_S = 60
+
+# Stages that make up a page's latency, including its wait for memory
+PAGE_STAGES = ("wait_s", "extract_s", "render_s", "preprocess_s", "ocr_s")
+
+
+class Histogram:
+    """Cumulative latency histogram in the Prometheus style."""
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+    
+    def render(self, name, help_text):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum {self.total:.6f}")
+        lines.append(f"{name}_count {self.count}")
+        return lines
+
+
+class ServerMetrics:
+    """Counters shared by all request threads."""
+    
+    def __init__(self):
+        self.started = time.time()
+        self.queued = 0
+        self.in_flight = 0
+        self.requests = {}
+        self.pages = {}
+        self.page_latency = Histogram(PAGE_LATENCY_BUCKETS)
+        self.request_latency = Histogram(REQUEST_LATENCY_BUCKETS)
+        self._recent_pages = deque()
+        self._lock = threading.Lock()
+    
+    def add_queued(self, delta):
+        with self._lock:
+            self.queued += delta
+    
+    def add_in_flight(self, delta):
+        with self._lock:
+            self.in_flight += delta
+    
+    def record_page(self, result):
+        latency = sum(result.timing.get(stage) or 0.0 for stage in PAGE_STAGES)
+        with self._lock:
+            self.pages[result.source] = self.pages.get(result.source, 0) + 1
+            self.page_latency.observe(latency)
+            self._recent_pages.append(time.monotonic())
+    
+    def record_request(self, status, seconds=None):
+        with self._lock:
+            self.requests[status] = self.requests.get(status, 0) + 1
+            if seconds is not None:
+                self.request_latency.observe(seconds)
+    
+    def pages_per_second(self):
+        """Pages finished per second over the last RATE_WINDOW_S seconds."""
+        now = time.monotonic()
+        while self._recent_pages and self._recent_pages[0] < now - RATE_WINDOW_S:
+            self._recent_pages.popleft()
+        window = min(RATE_WINDOW_S, max(time.time() - self.started, 1e-9))
+        return len(self._recent_pages) / window
+    
+    def render(self, budget=None):
+        """Return all metrics in the Prometheus text format."""
+        with self._lock:
+            lines = [
+                "# HELP pdf_ocr_queue_depth Requests waiting for a free slot",
+                "# TYPE pdf_ocr_queue_depth gauge",
+                f"pdf_ocr_queue_depth {self.queued}",
+                "# HELP pdf_ocr_in_flight Requests being extracted",
+                "# TYPE pdf_ocr_in_flight gauge",
+                f"pdf_ocr_in_flight {self.in_flight}",
+                "# HELP pdf_ocr_pages_per_second Pages finished per second, "
+                f"last {RATE_WINDOW_S}s",
+                "# TYPE pdf_ocr_pages_per_second gauge",
+                f"pdf_ocr_pages_per_second {self.pages_per_second():.3f}",
+                "# HELP pdf_ocr_requests_total Finished requests by HTTP status",
+                "# TYPE pdf_ocr_requests_total counter",
+            ]
+            lines += [
+                f'pdf_ocr_requests_total{{status="{status}"}} {count}'
+                for status, count in sorted(self.requests.items())
+            ]
+            lines += [
+                "# HELP pdf_ocr_pages_total Pages extracted by source",
+                "# TYPE pdf_ocr_pages_total counter",
+            ]
+            lines += [
+                f'pdf_ocr_pages_total{{source="{source}"}} {count}'
+                for source, count in sorted(self.pages.items())
+            ]
+            lines += self.page_latency.render(
+                "pdf_ocr_page_latency_seconds",
+                "Memory wait, render, preprocessing and OCR time per page"
+            )
+            lines += self.request_latency.render(
+                "pdf_ocr_request_latency_seconds", "Time from request to last page"
+            )
+        if budget is not None:
+            lines += [
+                "# HELP pdf_ocr_memory_reserved_bytes Estimated memory of pages in progress",
+                "# TYPE pdf_ocr_memory_reserved_bytes gauge",
+                f"pdf_ocr_memory_reserved_bytes {budget.used_bytes}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+class ExtractionServer(ThreadingHTTPServer):
+    """
+    HTTP server owning the warm processor, OCR pool and admission limits.
+    
+    Up to max_concurrent requests are extracted at a time; up to max_queue
+    more wait for a slot, and further requests are turned away with 503.
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, processor, port=DEFAULT_PORT, ocr_workers=None, max_concurrent=4,
+                 max_queue=16, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB,
+                 max_upload_mb=DEFAULT_MAX_UPLOAD_MB, allow_paths=None):
+        """
+        Start listening and warm up the OCR workers.
+        
+        Args:
+            processor (PDFProcessor): Processor shared by all requests
+            port (int): Port on 127.0.0.1
+            ocr_workers (int): OCR worker processes shared by all requests
+            max_concurrent (int): Requests extracted at the same time
+            max_queue (int): Requests that may wait for a slot
+            memory_budget_mb (float): RAM budget for rendered pages of all requests
+            max_upload_mb (float): Largest accepted upload
+            allow_paths (str): Optional folder whose PDFs may be requested by
+                               path. Without it only uploads are accepted.
+        """
+        super().__init__((HOST, port), ExtractionRequestHandler)
+        self.allowed_hosts = {f"{HOST}:{self.server_port}", f"localhost:{self.server_port}"}
+        self.path_root = os.path.realpath(allow_paths) if allow_paths else None
+        self.processor = processor
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_upload_bytes = int(max_upload_mb * 1024 * 1024)
+        self.metrics = ServerMetrics()
+        self.budget = MemoryBudget(memory_budget_mb)
+        self.slots = threading.BoundedSemaphore(self.max_concurrent)
+        self.ocr_workers = ocr_workers or processor.max_workers
+        self.ocr_pool = processor.create_ocr_pool(self.ocr_workers)
+        self._admission = threading.Lock()
+        self._warm_up()
+    
+    def _warm_up(self):
+        """Start every OCR worker now, so the first request doesn't pay for it."""
+        futures = [self.ocr_pool.submit(os.getpid) for _ in range(self.ocr_workers)]
+        for future in futures:
+            future.result()
+    
+    def try_enqueue(self):
+        """
+        Admit a request to the queue.
+        
+        Returns:
+            bool: False if the queue is full
+        """
+        with self._admission:
+            waiting = self.metrics.queued + self.metrics.in_flight - self.max_concurrent
+            if waiting >= self.max_queue:
+                return False
+            self.metrics.add_queued(1)
+            return True
+    
+    def resolve_path(self, pdf_path):
+        """
+        Resolve a requested PDF path inside the allowed folder.
+        
+        Args:
+            pdf_path (str): Absolute path, or relative to the allowed folder
+        
+        Returns:
+            str: The real path, or None if it is outside the folder
+        """
+        resolved = os.path.realpath(os.path.join(self.path_root, pdf_path))
+        if os.path.commonpath([self.path_root, resolved]) != self.path_root:
+            return None
+        return resolved
+    
+    def server_close(self):
+        super().server_close()
+        # Also called when binding the port fails, before the pool exists
+        if getattr(self, "ocr_pool", None) is not None:
+            self.ocr_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_timeout(value):
+    """
+    Parse a timeout given in seconds.
+    
+    Args:
+        value (str): Number of seconds
+    
+    Returns:
+        float: The timeout
+    
+    Raises:
+        ValueError: If value is not a finite number greater than zero
+    """
+    seconds = float(value)
+    if not (math.isfinite(seconds) and seconds > 0):
+        raise ValueError(f"Timeout must be a positive number of seconds, not {value}")
+    return seconds
+
+
+class ExtractionRequestHandler(BaseHTTPRequestHandler):
+    """Handles one HTTP request on a server thread."""
+    
+    server_version = "PDF_OCR"
+    
+    def log_message(self, format, *args):
+        sys.stderr.write(f"[{self.log_date_time_string()}] {format % args}\n")
+    
+    def _send_text(self, status, body, content_type="text/plain; charset=utf-8",
+                   headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _send_error(self, status, message, headers=None):
+        self._send_text(status, json.dumps({"error": message}) + "\n",
+                        "application/json", headers)
+        self.server.metrics.record_request(status)
+    
+    def _check_host(self):
+        """Refuse requests addressed to another host name, e.g. after DNS rebinding."""
+        if self.headers.get("Host", "").lower() in self.server.allowed_hosts:
+            return True
+        self._send_error(403, "requests must be addressed to 127.0.0.1 or localhost")
+        return False
+    
+    def do_GET(self):
+        if not self._check_host():
+            return
+        path = urlparse(self.path).path
+        if path == "/metrics":
+            self._send_text(200, self.server.metrics.render(self.server.budget),
+                            "text/plain; version=0.0.4; charset=utf-8")
+        elif path == "/health":
+            self._send_text(200, "ok\n")
+        else:
+            self._send_error(404, "not found")
+    
+    def do_POST(self):
+        if not self._check_host():
+            return
+        url = urlparse(self.path)
+        if url.path != "/extract":
+            self._send_error(404, "not found")
+            return
+        
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        mode = query.get("mode", "hybrid")
+        if mode not in EXTRACTION_MODES:
+            self._send_error(400, f"mode must be one of: {', '.join(EXTRACTION_MODES)}")
+            return
+        try:
+            page_timeout = query.get("page_timeout")
+            if page_timeout is not None:
+                page_timeout = parse_timeout(page_timeout)
+        except ValueError:
+            self._send_error(400, "page_timeout must be a positive number of seconds")
+            return
+        
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_error(411, "a request body with Content-Length is required")
+            return
+        if length > self.server.max_upload_bytes:
+            self._send_error(413, "upload too large")
+            return
+        
+        if not self.server.try_enqueue():
+            self._send_error(503, "server busy, try again later", {"Retry-After": "5"})
+            return
+        
+        temp_path = None
+        admitted = False
+        try:
+            content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+            body = self.rfile.read(length)
+            if content_type == "application/json":
+                if self.server.path_root is None:
+                    self._send_error(403, "requests by path are disabled; start the "
+                                          "server with --allow-paths DIR")
+                    return
+                try:
+                    pdf_path = json.loads(body)["path"]
+                    if not isinstance(pdf_path, str):
+                        raise TypeError(pdf_path)
+                except (ValueError, KeyError, TypeError):
+                    self._send_error(400, 'expected JSON like {"path": "file.pdf"}')
+                    return
+                requested, pdf_path = pdf_path, self.server.resolve_path(pdf_path)
+                if pdf_path is None:
+                    self._send_error(403, f"{requested} is outside the allowed folder")
+                    return
+                if not os.path.isfile(pdf_path):
+                    self._send_error(404, f"PDF file not found: {requested}")
+                    return
+            elif content_type == "application/pdf":
+                with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+                    f.write(body)
+                    temp_path = pdf_path = f.name
+            else:
+                self._send_error(415, "Content-Type must be application/pdf or application/json")
+                return
+            body = None
+            
+            with self.server.slots:
+                self.server.metrics.add_queued(-1)
+                self.server.metrics.add_in_flight(1)
+                admitted = True
+                try:
+                    self._stream_pages(pdf_path, mode, query.get("pages"), page_timeout)
+                finally:
+                    self.server.metrics.add_in_flight(-1)
+        finally:
+            if not admitted:
+                self.server.metrics.add_queued(-1)
+            if temp_path:
+                os.remove(temp_path)
+    
+    def _stream_pages(self, pdf_path, mode, pages, page_timeout):
+        """Extract a PDF and write each page as an NDJSON line as it finishes."""
+        start = time.perf_counter()
+        results = self.server.processor.iter_pages(
+            pdf_path,
+            mode=mode,
+            pages=pages,
+            page_timeout=page_timeout,
+            memory=self.server.budget.share(),
+            ocr_pool=self.server.ocr_pool if mode != "text" else None
+        )
+        
+        # Validation errors (bad page range, unreadable PDF) surface on the
+        # first page, before any response has been sent
+        try:
+            first = next(results, None)
+        except (ValueError, RuntimeError, OSError) as e:
+            self._send_error(400, str(e))
+            return
+        except Exception as e:
+            self._send_error(500, str(e))
+            return
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        
+        def write(record):
+            self.wfile.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+        
+        count = 0
+        status = 200
+        try:
+            result = first
+            while result is not None:
+                self.server.metrics.record_page(result)
+                write({
+                    "page": result.page,
+                    "source": result.source,
+                    "text": result.text,
+                    "timing": result.timing,
+                })
+                count += 1
+                result = next(results, None)
+            write({"done": True, "pages": count,
+                   "seconds": round(time.perf_counter() - start, 3)})
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away: closing the iterator stops its pages
+            status = 499
+        except Exception as e:
+            status = 500
+            try:
+                write({"error": str(e), "pages": count})
+            except OSError:
+                pass
+        finally:
+            results.close()
+            self.server.metrics.record_request(status, time.perf_counter() - start)
+
+
+def build_parser():
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Serve PDF text extraction and OCR on localhost."
+    )
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help="Port on 127.0.0.1 (default: %(default)s)")
+    parser.add_argument("--ocr-workers", type=int,
+                        help="OCR worker processes shared by all requests (default: CPU cores)")
+    parser.add_argument("--max-concurrent", type=int, default=4,
+                        help="Requests extracted at the same time (default: %(default)s)")
+    parser.add_argument("--max-queue", type=int, default=16,
+                        help="Requests that may wait for a slot before new ones get "
+                             "503 (default: %(default)s)")
+    parser.add_argument("--memory-budget", type=float, default=DEFAULT_MEMORY_BUDGET_MB,
+                        metavar="MB",
+                        help="RAM that rendered pages of all requests may use together "
+                             "(default: %(default)s)")
+    parser.add_argument("--max-upload", type=float, default=DEFAULT_MAX_UPLOAD_MB,
+                        metavar="MB", help="Largest accepted upload (default: %(default)s)")
+    parser.add_argument("--allow-paths", metavar="DIR",
+                        help="Also accept JSON requests naming a PDF by path, for "
+                             "files under DIR only (default: uploads only)")
+    parser.add_argument("--dpi", type=dpi_argument, default=DEFAULT_DPI)
+    parser.add_argument("--lang", default="eng")
+    parser.add_argument("--engine", choices=("auto",) + OCR_ENGINES, default="auto")
+    parser.add_argument("--preprocess", action="store_true")
+    parser.add_argument("--blank-threshold", type=float, default=DEFAULT_BLANK_THRESHOLD)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Don't read or write the OCR result cache")
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    args = build_parser().parse_args(argv)
+    if args.allow_paths and not os.path.isdir(args.allow_paths):
+        print(f"error: --allow-paths folder not found: {args.allow_paths}", file=sys.stderr)
+        return 2
+    try:
+        processor = PDFProcessor(
+            max_workers=args.ocr_workers,
+            dpi=args.dpi,
+            lang=args.lang,
+            cache=OCRCache(enabled=not args.no_cache),
+            engine=args.engine,
+            preprocess=args.preprocess,
+            blank_threshold=args.blank_threshold
+        )
+        server = ExtractionServer(
+            processor,
+            port=args.port,
+            ocr_workers=args.ocr_workers,
+            max_concurrent=args.max_concurrent,
+            max_queue=args.max_queue,
+            memory_budget_mb=args.memory_budget,
+            max_upload_mb=args.max_upload,
+            allow_paths=args.allow_paths
+        )
+    except (RuntimeError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    
+    print(f"Serving on http://{HOST}:{server.server_port} "
+          f"({server.ocr_workers} OCR workers, engine {processor.engine})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Shared Buffer Module
+Fixed pool of shared memory buffers that hand rendered page pixels to the OCR
+worker processes, instead of pickling every page image through a pipe.
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+
+from PIL import Image
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python built without shared memory support
+    resource_tracker = shared_memory = None
+
+
+# Buffers are allocated in multiples of this size, so pages of about the same
+# size reuse the same buffers
+BUFFER_GRANULARITY = 1024 * 1024
+
+# Seconds between checks for cancellation while waiting for a free buffer
+BUFFER_POLL_INTERVAL = 0.1
+
+
+class SharedPage(namedtuple("SharedPage", "name mode width height dpi nbytes")):
+    """
+    Rendered page whose pixels are in a shared memory buffer.
+    
+    Only this small description is pickled when the page is sent to an OCR
+    worker; the worker reads the pixels from the buffer with load_shared_page().
+    
+    Attributes:
+        name (str): Name of the SharedMemory block
+        mode (str): PIL mode of the pixels, "RGB" or "L"
+        width (int): Width in pixels
+        height (int): Height in pixels
+        dpi (int): Resolution the page was rendered at
+        nbytes (int): Bytes of pixel data at the start of the buffer
+    """
+    
+    __slots__ = ()
+
+
+def prepare_workers():
+    """
+    Call before starting worker processes that will read shared pages.
+    
+    On POSIX, every process that opens a shared memory block registers it
+    with a resource tracker, which deletes blocks it thinks were leaked when
+    its process tree exits. Workers started while no tracker runs yet start
+    their own and would delete buffers the parent still uses; starting the
+    tracker first makes them share the parent's.
+    """
+    if resource_tracker is not None and os.name == "posix":
+        resource_tracker.ensure_running()
+
+
+def load_shared_page(page):
+    """
+    Turn a SharedPage into a PIL image, in an OCR worker process.
+    
+    Image.frombytes() copies the pixels out of the mapped buffer into the
+    image, so the buffer can be released as soon as this returns. That copy,
+    made in the worker, replaces pickling the image and sending it through
+    a pipe.
+    
+    Args:
+        page (SharedPage): Page written by SharedBufferPool.share()
+    
+    Returns:
+        PIL.Image.Image: Image with the resolution in image.info["dpi"]
+    """
+    block = shared_memory.SharedMemory(name=page.name)
+    try:
+        image = Image.frombytes(page.mode, (page.width, page.height), block.buf[:page.nbytes])
+    finally:
+        block.close()
+    image.info["dpi"] = (page.dpi, page.dpi)
+    return image
+
+
+class SharedBufferPool:
+    """
+    A fixed number of shared memory buffers, reused from page to page.
+    
+    A buffer is taken for each rendered page and given back once its OCR has
+    finished. Buffers only grow when a page doesn't fit any free one, so a
+    document is processed with a constant number of large allocations no
+    matter how many pages it has. When every buffer is in use, share() waits
+    for one to be released.
+    """
+    
+    def __init__(self, slots):
+        """
+        Initialize the pool; buffers are allocated on first use.
+        
+        Args:
+            slots (int): Maximum number of buffers
+        """
+        self.slots = max(1, slots)
+        self.allocations = 0
+        # Seconds share() spent waiting for a buffer to be released
+        self.wait_s = 0.0
+        self._free = []
+        self._in_use = {}
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    @staticmethod
+    def available():
+        """True if this Python supports shared memory."""
+        return shared_memory is not None
+    
+    def _allocate(self, nbytes):
+        size = -(-nbytes // BUFFER_GRANULARITY) * BUFFER_GRANULARITY
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self.allocations += 1
+        return block
+    
+    @staticmethod
+    def _destroy(block):
+        block.close()
+        block.unlink()
+    
+    def _acquire(self, nbytes, check=None):
+        """Take a free buffer of at least nbytes, growing or allocating one if needed."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise OSError("Shared buffer pool is closed")
+                fitting = [block for block in self._free if block.size >= nbytes]
+                if fitting:
+                    block = min(fitting, key=lambda block: block.size)
+                    self._free.remove(block)
+                    break
+                if len(self._free) + len(self._in_use) < self.slots:
+                    block = self._allocate(nbytes)
+                    break
+                if self._free:
+                    # Every free buffer is too small: replace one with a larger one
+                    too_small = self._free.pop()
+                    self._destroy(too_small)
+                    block = self._allocate(nbytes)
+                    break
+                waited = time.perf_counter()
+                self._condition.wait(BUFFER_POLL_INTERVAL)
+                self.wait_s += time.perf_counter() - waited
+                if check is not None:
+                    check()
+            self._in_use[block.name] = block
+            return block
+    
+    def share(self, pixels, mode, width, height, dpi, check=None):
+        """
+        Copy rendered pixels into a buffer of the pool.
+        
+        Args:
+            pixels: Bytes-like pixel data, e.g. a pixmap's samples_mv
+            mode (str): PIL mode of the pixels
+            width (int): Width in pixels
+            height (int): Height in pixels
+            dpi (int): Resolution the page was rendered at
+            check (callable): Optional, called while waiting for a free buffer;
+                              an exception it raises is passed on
+        
+        Returns:
+            SharedPage: Description of the page to send to a worker
+        
+        Raises:
+            OSError: If shared memory can't be allocated
+        """
+        pixels = memoryview(pixels).cast("B")
+        nbytes = pixels.nbytes
+        block = self._acquire(nbytes, check)
+        block.buf[:nbytes] = pixels
+        return SharedPage(block.name, mode, width, height, dpi, nbytes)
+    
+    def release(self, name):
+        """Give the buffer of a page back once its worker is done with it."""
+        with self._condition:
+            block = self._in_use.pop(name, None)
+            if block is None:
+                return
+            if self._closed:
+                self._destroy(block)
+            else:
+                self._free.append(block)
+                self._condition.notify()
+    
+    def close(self):
+        """
+        Free the idle buffers and stop handing out new ones.
+        
+        Buffers still in use by a worker are freed when they are released,
+        so a page whose OCR is still running after close() isn't cut off.
+        """
+        with self._condition:
+            self._closed = True
+            for block in self._free:
+                self._destroy(block)
+            self._free = []
+            self._condition.notify_all()
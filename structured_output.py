@@ -0,0 +1,409 @@
+"""
+Structured Output Module
+Word-level layout of extracted pages and writers that save it as JSON Lines,
+hOCR or a searchable PDF, one page at a time.
+
+Word boxes are in PDF points with the origin at the top left of the page,
+whether they came from the text layer or from OCR, so every writer can treat
+pages the same way.
+"""
+
+import html
+import json
+import os
+
+import fitz  # PyMuPDF
+
+try:
+    import pymupdf_fonts  # adds Noto Sans as fitz.Font("notos")
+except ImportError:  # optional, the built-in fallback font is used alone then
+    pymupdf_fonts = None
+
+
+# Format name -> file suffix of the output written for it
+OUTPUT_SUFFIXES = {
+    "txt": ".txt",
+    "json": ".jsonl",
+    "hocr": ".hocr",
+    "pdf": ".searchable.pdf",
+}
+
+# Formats whose writers need word boxes
+LAYOUT_FORMATS = ("json", "hocr", "pdf")
+
+# Tesseract TSV columns
+TSV_COLUMNS = (
+    "level", "page_num", "block_num", "par_num", "line_num", "word_num",
+    "left", "top", "width", "height", "conf", "text",
+)
+
+# TSV level of a single word
+TSV_WORD_LEVEL = 5
+
+# Fonts of the searchable PDF's text layer, tried in order for each word:
+# Noto Sans when pymupdf-fonts is installed, then MuPDF's built-in Droid Sans
+# Fallback, which covers Latin, Greek, Cyrillic, Chinese, Japanese and Korean
+TEXT_LAYER_FONTS = (("notos",) if pymupdf_fonts is not None else ()) + ("cjk",)
+
+
+def parse_tsv(tsv):
+    """
+    Read the words out of Tesseract's TSV output.
+    
+    Args:
+        tsv (str): Output of image_to_data() or GetTSVText(), with or
+                   without the header row
+    
+    Returns:
+        list: One dict per word with text, left, top, width, height (pixels),
+              conf (0-100) and the block, par and line it belongs to
+    """
+    words = []
+    for row in tsv.splitlines():
+        fields = row.split("\t")
+        if len(fields) != len(TSV_COLUMNS) or not fields[0].isdigit():
+            continue
+        record = dict(zip(TSV_COLUMNS, fields))
+        if int(record["level"]) != TSV_WORD_LEVEL or not record["text"].strip():
+            continue
+        words.append({
+            "text": record["text"],
+            "left": int(record["left"]),
+            "top": int(record["top"]),
+            "width": int(record["width"]),
+            "height": int(record["height"]),
+            "conf": float(record["conf"]),
+            "block": int(record["block_num"]),
+            "par": int(record["par_num"]),
+            "line": int(record["line_num"]),
+        })
+    return words
+
+
+def words_to_points(words, dpi, offset=(0, 0)):
+    """
+    Convert OCR word boxes from image pixels to PDF points.
+    
+    Args:
+        words (list): Words from parse_tsv()
+        dpi (int): Resolution the page was rendered at
+        offset (tuple): (left, top) of the OCR image within the rendered page,
+                        when margins were trimmed before OCR
+    
+    Returns:
+        list: Word dicts with text, bbox [x0, y0, x1, y1], conf, block, par, line
+    """
+    scale = 72 / dpi
+    left, top = offset
+    return [
+        {
+            "text": word["text"],
+            "bbox": [
+                round((word["left"] + left) * scale, 2),
+                round((word["top"] + top) * scale, 2),
+                round((word["left"] + left + word["width"]) * scale, 2),
+                round((word["top"] + top + word["height"]) * scale, 2),
+            ],
+            "conf": word["conf"],
+            "block": word["block"],
+            "par": word["par"],
+            "line": word["line"],
+        }
+        for word in words
+    ]
+
+
+def text_layer_words(page):
+    """
+    Read the words of a page's embedded text layer.
+    
+    Args:
+        page (fitz.Page): Page to read
+    
+    Returns:
+        list: Word dicts as from words_to_points(), with conf None
+    """
+    # Text layer coordinates ignore /Rotate; rendered pages don't
+    to_rotated = page.rotation_matrix
+    return [
+        {
+            "text": text,
+            "bbox": [round(value, 2) for value in fitz.Rect(x0, y0, x1, y1) * to_rotated],
+            "conf": None,
+            "block": block,
+            "par": 0,
+            "line": line,
+        }
+        for x0, y0, x1, y1, text, block, line, _ in page.get_text("words")
+    ]
+
+
+def output_paths(output_base, formats):
+    """
+    Name the files written for each format.
+    
+    Args:
+        output_base (Path): Output path without its suffix
+        formats (list): Format names from OUTPUT_SUFFIXES
+    
+    Returns:
+        dict: {format: Path}
+    """
+    return {
+        name: output_base.with_name(output_base.name + OUTPUT_SUFFIXES[name])
+        for name in formats
+    }
+
+
+class _StreamWriter:
+    """
+    Base class of the writers: output goes to a ".partial" file that is only
+    renamed into place by close(), so an interrupted job never leaves a
+    truncated file that looks complete.
+    """
+    
+    def __init__(self, path, pdf_path):
+        """
+        Initialize the writer.
+        
+        Args:
+            path (Path): File to write
+            pdf_path (str): PDF the pages come from
+        """
+        self.path = path
+        self.pdf_path = pdf_path
+        self._temp_path = path.with_name(path.name + ".partial")
+        self._file = None
+    
+    def _open(self, mode="w"):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._temp_path, mode, encoding="utf-8")
+    
+    def write_page(self, result):
+        """Add one PageResult to the output."""
+        raise NotImplementedError
+    
+    def _finish(self):
+        """Write anything that follows the last page."""
+    
+    def close(self):
+        """Finish the output and move it into place."""
+        self._finish()
+        if self._file is not None:
+            self._file.close()
+        os.replace(self._temp_path, self.path)
+    
+    def abort(self):
+        """Discard the partial output."""
+        if self._file is not None:
+            self._file.close()
+        try:
+            os.remove(self._temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class TextWriter(_StreamWriter):
+    """Plain text in the "--- Page N ---" format of PDFProcessor's methods."""
+    
+    def __init__(self, path, pdf_path):
+        super().__init__(path, pdf_path)
+        self._open()
+        self._first = True
+    
+    def write_page(self, result):
+        if not self._first:
+            self._file.write("\n")
+        self._file.write(f"--- Page {result.page} ---\n{result.text}\n")
+        self._first = False
+
+
+class JSONLinesWriter(_StreamWriter):
+    """
+    One JSON object per line and page: page number, source, size in points,
+    text and words with their boxes and confidences.
+    """
+    
+    def __init__(self, path, pdf_path):
+        super().__init__(path, pdf_path)
+        self._open()
+    
+    def write_page(self, result):
+        layout = result.layout or {}
+        record = {
+            "page": result.page,
+            "source": result.source,
+            "width": layout.get("width"),
+            "height": layout.get("height"),
+            "dpi": layout.get("dpi"),
+            "text": result.text,
+            "words": layout.get("words", []),
+        }
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class HOCRWriter(_StreamWriter):
+    """
+    hOCR document with one ocr_page per page, lines and words.
+    
+    Boxes are in PDF points, so each page is described as a 72 DPI image.
+    """
+    
+    def __init__(self, path, pdf_path):
+        super().__init__(path, pdf_path)
+        self._open()
+        title = html.escape(os.path.basename(pdf_path))
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN"\n'
+            '    "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="en" lang="en">\n'
+            '<head>\n'
+            f'  <title>{title}</title>\n'
+            '  <meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>\n'
+            '  <meta name="ocr-system" content="pdf_ocr"/>\n'
+            '  <meta name="ocr-capabilities" content="ocr_page ocr_line ocrx_word"/>\n'
+            '</head>\n'
+            '<body>\n'
+        )
+    
+    @staticmethod
+    def _bbox(box):
+        return "bbox " + " ".join(str(int(round(value))) for value in box)
+    
+    def write_page(self, result):
+        layout = result.layout or {}
+        page = result.page
+        width = layout.get("width", 0)
+        height = layout.get("height", 0)
+        self._file.write(
+            f"  <div class='ocr_page' id='page_{page}' "
+            f"title='{self._bbox((0, 0, width, height))}; ppageno {page - 1}; "
+            f"scan_res 72 72'>\n"
+        )
+        
+        lines = {}
+        for word in layout.get("words", []):
+            lines.setdefault((word["block"], word["par"], word["line"]), []).append(word)
+        
+        for line_index, words in enumerate(lines.values(), start=1):
+            box = (
+                min(word["bbox"][0] for word in words),
+                min(word["bbox"][1] for word in words),
+                max(word["bbox"][2] for word in words),
+                max(word["bbox"][3] for word in words),
+            )
+            self._file.write(
+                f"   <span class='ocr_line' id='line_{page}_{line_index}' "
+                f"title='{self._bbox(box)}'>"
+            )
+            for word_index, word in enumerate(words, start=1):
+                title = self._bbox(word["bbox"])
+                if word["conf"] is not None:
+                    title += f"; x_wconf {int(round(word['conf']))}"
+                self._file.write(
+                    f"<span class='ocrx_word' id='word_{page}_{line_index}_{word_index}' "
+                    f"title='{title}'>{html.escape(word['text'])}</span> "
+                )
+            self._file.write("</span>\n")
+        self._file.write("  </div>\n")
+    
+    def _finish(self):
+        self._file.write("</body>\n</html>\n")
+
+
+class SearchablePDFWriter(_StreamWriter):
+    """
+    Copy of the source PDF with an invisible text layer on its OCR'd pages.
+    
+    Each recognized word is drawn in render mode 3 (invisible) over its box,
+    stretched to the box width, so the page looks unchanged but its text can
+    be searched, selected and copied. Only OCR words are drawn: words from the
+    page's own text layer (conf None), as found on pages restored from a
+    checkpoint or on region OCR pages, are already there. Only the pages
+    written are kept in the output.
+    
+    Words are drawn in the first of TEXT_LAYER_FONTS that has all their
+    characters, embedded as Unicode fonts so copied text comes out right in
+    any script they cover; words no font covers are left out. The fonts are
+    subset to the characters used before the file is saved.
+    
+    PyMuPDF edits pages in place as they arrive; the file itself can only be
+    written once, when the last page is done.
+    """
+    
+    def __init__(self, path, pdf_path):
+        super().__init__(path, pdf_path)
+        self._doc = fitz.open(pdf_path)
+        self._pages = []
+        self._fonts = [fitz.Font(name) for name in TEXT_LAYER_FONTS]
+    
+    def _font_for(self, text):
+        """Return the index of the first text layer font with every character of text."""
+        for index, font in enumerate(self._fonts):
+            if all(font.has_glyph(ord(char)) for char in text):
+                return index
+        return None
+    
+    def write_page(self, result):
+        self._pages.append(result.page - 1)
+        if result.source == "text" or not result.layout:
+            return
+        
+        page = self._doc[result.page - 1]
+        # Word boxes are in the rotated page's coordinates, as rendered, and
+        # each word is stretched along its own baseline
+        to_page = page.derotation_matrix
+        rotation = fitz.Matrix(page.rotation)
+        inserted = set()
+        for word in result.layout["words"]:
+            if word["conf"] is None:
+                continue
+            index = self._font_for(word["text"])
+            if index is None:
+                continue
+            font = self._fonts[index]
+            x0, y0, x1, y1 = word["bbox"]
+            fontsize = max((y1 - y0) * 0.9, 1.0)
+            length = font.text_length(word["text"], fontsize=fontsize)
+            if length <= 0:
+                continue
+            fontname = f"OCRText{index}"
+            if index not in inserted:
+                # Stored once in the file and shared by every page using it
+                page.insert_font(fontname=fontname, fontbuffer=font.buffer)
+                inserted.add(index)
+            origin = fitz.Point(x0, y1 - (y1 - y0) * 0.2) * to_page
+            page.insert_text(
+                origin,
+                word["text"],
+                fontname=fontname,
+                fontsize=fontsize,
+                render_mode=3,
+                rotate=page.rotation,
+                morph=(origin, ~rotation * fitz.Matrix((x1 - x0) / length, 1) * rotation),
+            )
+    
+    def close(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self._pages != list(range(self._doc.page_count)):
+            self._doc.select(self._pages)
+        try:
+            self._doc.subset_fonts()
+        except ImportError:  # PyMuPDF versions that subset with fontTools
+            pass
+        self._doc.save(str(self._temp_path), garbage=3, deflate=True)
+        self._doc.close()
+        os.replace(self._temp_path, self.path)
+    
+    def abort(self):
+        self._doc.close()
+        super().abort()
+
+
+WRITER_CLASSES = {
+    "txt": TextWriter,
+    "json": JSONLinesWriter,
+    "hocr": HOCRWriter,
+    "pdf": SearchablePDFWriter,
+}
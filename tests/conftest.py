@@ -0,0 +1,114 @@
+"""
+Shared fixtures: a stub tesseract executable and small generated PDFs.
+
+The stub answers like Tesseract without recognizing anything: the text of a
+page is "OCR <width>x<height>" of the image it was given, so tests run
+without the real binary and can still tell which image was OCR'd. Its word
+boxes hold one word, "OCR" or the value of STUB_OCR_WORD.
+"""
+
+import os
+import stat
+import sys
+import textwrap
+
+import fitz  # PyMuPDF
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+STUB_TESSERACT = textwrap.dedent("""\
+    #!{python}
+    import os, sys, time
+    from PIL import Image
+    args = sys.argv[1:]
+    if "--version" in args:
+        print("tesseract 5.3.0")
+        sys.exit(0)
+    if "--list-langs" in args:
+        print("List of available languages (1):\\neng")
+        sys.exit(0)
+    image, out = args[0], args[1]
+    size = Image.open(image).size
+    time.sleep(float(os.environ.get("STUB_OCR_DELAY", "0")))
+    formats = [arg for arg in args[2:] if arg in ("txt", "tsv")] or ["txt"]
+    if "tessedit_create_tsv=1" in args:
+        formats.append("tsv")
+    for name in formats:
+        with open(out + "." + name, "w", encoding="utf-8") as f:
+            if name == "tsv":
+                f.write("level\\tpage_num\\tblock_num\\tpar_num\\tline_num\\tword_num\\t"
+                        "left\\ttop\\twidth\\theight\\tconf\\ttext\\n")
+                f.write("5\\t1\\t1\\t1\\t1\\t1\\t100\\t100\\t200\\t40\\t95.5\\t%s\\n"
+                        % os.environ.get("STUB_OCR_WORD", "OCR"))
+            else:
+                f.write("OCR %dx%d\\n" % size)
+""")
+
+
+@pytest.fixture
+def stub_tesseract(tmp_path_factory, monkeypatch):
+    """Put the stub tesseract first on PATH; set STUB_OCR_DELAY to slow it down."""
+    if os.name != "posix":
+        pytest.skip("the stub tesseract is a script with a #! line")
+    import pytesseract
+    
+    bin_dir = tmp_path_factory.mktemp("bin")
+    path = bin_dir / "tesseract"
+    path.write_text(STUB_TESSERACT.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", "tesseract")
+    return path
+
+
+@pytest.fixture
+def processor(stub_tesseract):
+    """Factory for PDFProcessors that OCR with the stub tesseract and no cache."""
+    from pdf_processor import PDFProcessor
+    
+    def make(**kwargs):
+        kwargs.setdefault("max_workers", 1)
+        kwargs.setdefault("engine", "pytesseract")
+        return PDFProcessor(**kwargs)
+    return make
+
+
+def _scanned_page(doc, text):
+    """Add a page holding nothing but an image of some text."""
+    source = fitz.open()
+    page = source.new_page(width=300, height=200)
+    page.insert_text((20, 40), text, fontsize=14)
+    image = page.get_pixmap(dpi=100).tobytes("png")
+    doc.new_page(width=300, height=200).insert_image(fitz.Rect(0, 0, 300, 200), stream=image)
+
+
+def make_pdf(path, pages):
+    """
+    Write a PDF whose pages are described by strings: "text:<words>" for a
+    page with a text layer, "scan:<words>" for an image-only page and
+    "blank" for an empty page.
+    """
+    doc = fitz.open()
+    for spec in pages:
+        kind, _, words = spec.partition(":")
+        if kind == "text":
+            doc.new_page(width=300, height=200).insert_text((20, 40), words, fontsize=12)
+        elif kind == "scan":
+            _scanned_page(doc, words)
+        else:
+            doc.new_page(width=300, height=200)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def pdf_factory(tmp_path):
+    """Factory writing make_pdf() files into the test's temporary folder."""
+    def make(name, pages):
+        return make_pdf(tmp_path / name, pages)
+    return make
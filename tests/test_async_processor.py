@@ -0,0 +1,40 @@
+"""Tests of the asyncio front end."""
+
+import asyncio
+import threading
+
+from async_processor import AsyncPDFProcessor
+
+
+def test_async_extraction_matches_sync(processor, pdf_factory):
+    pdf = pdf_factory("doc.pdf", ["text:Native words", "scan:Scanned"])
+    extractor = processor()
+    
+    async def run():
+        async with AsyncPDFProcessor(extractor) as async_extractor:
+            return await async_extractor.extract_text_hybrid(pdf)
+    
+    assert asyncio.run(run()) == extractor.extract_text_hybrid(pdf)
+
+
+def test_ocr_pool_starts_off_the_event_loop(processor, pdf_factory):
+    pdf = pdf_factory("doc.pdf", ["scan:Scanned"])
+    extractor = processor()
+    create_ocr_pool = extractor.create_ocr_pool
+    started_in = []
+    
+    def record_thread(*args, **kwargs):
+        started_in.append(threading.current_thread())
+        return create_ocr_pool(*args, **kwargs)
+    extractor.create_ocr_pool = record_thread
+    
+    async def run():
+        async with AsyncPDFProcessor(extractor) as async_extractor:
+            await asyncio.gather(
+                async_extractor.extract_text_with_ocr(pdf),
+                async_extractor.extract_text_with_ocr(pdf),
+            )
+    asyncio.run(run())
+    
+    assert len(started_in) == 1
+    assert started_in[0] is not threading.main_thread()
@@ -0,0 +1,116 @@
+"""Tests of the OCR cache and the page fingerprints it is keyed by."""
+
+import fitz  # PyMuPDF
+
+from ocr_cache import OCRCache
+from pdf_processor import page_fingerprint
+
+
+def fingerprint(path, page_num=1):
+    with fitz.open(path) as doc:
+        return page_fingerprint(doc, page_num)
+
+
+def annotate(source, target, text):
+    with fitz.open(source) as doc:
+        doc[0].add_freetext_annot(fitz.Rect(20, 150, 200, 190), text)
+        doc.save(target)
+
+
+def edit_annotation(source, target, text):
+    with fitz.open(source) as doc:
+        page = doc[0]
+        annot = page.first_annot
+        annot.set_info(content=text)
+        annot.update()
+        doc.save(target)
+
+
+def test_identical_pages_share_a_fingerprint(pdf_factory):
+    first = pdf_factory("first.pdf", ["scan:Same page"])
+    second = pdf_factory("second.pdf", ["text:Other", "scan:Same page"])
+    
+    assert fingerprint(first) == fingerprint(second, 2)
+
+
+def test_annotations_change_the_fingerprint(pdf_factory, tmp_path):
+    plain = pdf_factory("plain.pdf", ["scan:Annotated page"])
+    annotated = tmp_path / "annotated.pdf"
+    edited = tmp_path / "edited.pdf"
+    annotate(plain, annotated, "Approved")
+    edit_annotation(annotated, edited, "Rejected")
+    
+    fingerprints = {fingerprint(plain), fingerprint(annotated), fingerprint(edited)}
+    
+    assert len(fingerprints) == 3
+
+
+def test_edited_annotation_misses_the_cache(processor, pdf_factory, tmp_path):
+    plain = pdf_factory("plain.pdf", ["scan:Annotated page"])
+    annotated = tmp_path / "annotated.pdf"
+    edited = tmp_path / "edited.pdf"
+    annotate(plain, annotated, "Approved")
+    edit_annotation(annotated, edited, "Rejected")
+    cache = OCRCache(cache_dir=tmp_path / "cache")
+    extractor = processor(cache=cache)
+    
+    extractor.extract_text_with_ocr(str(annotated))
+    extractor.extract_text_with_ocr(str(annotated))
+    assert (cache.hits, cache.misses) == (1, 1)
+    
+    extractor.extract_text_with_ocr(str(edited))
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.close()
+
+
+def test_cache_round_trips_and_counts(tmp_path):
+    cache = OCRCache(cache_dir=tmp_path)
+    key = OCRCache.make_key("page", {"dpi": 300, "lang": "eng"})
+    
+    assert cache.get(key) is None
+    cache.put(key, "Hello")
+    assert cache.get(key) == "Hello"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    cache.close()
+
+
+def test_settings_are_part_of_the_key():
+    assert OCRCache.make_key("page", {"dpi": 300}) != OCRCache.make_key("page", {"dpi": 200})
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr("ocr_cache.time.time", lambda: next(clock))
+    cache = OCRCache(cache_dir=tmp_path, max_size_mb=25 / (1024 * 1024))
+    
+    cache.put("a", "x" * 10)
+    cache.put("b", "x" * 10)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+    cache.put("c", "x" * 10)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["size_bytes"] == 20
+    cache.close()
+
+
+def test_entry_larger_than_the_cache_is_not_kept(tmp_path):
+    cache = OCRCache(cache_dir=tmp_path, max_size_mb=10 / (1024 * 1024))
+    
+    cache.put("big", "x" * 100)
+    
+    assert cache.get("big") is None
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = OCRCache(cache_dir=tmp_path, enabled=False)
+    
+    cache.put("key", "text")
+    
+    assert cache.get("key") is None
+    assert not (tmp_path / "ocr_cache.sqlite3").exists()
@@ -0,0 +1,33 @@
+"""Tests of job cancellation while OCR is running."""
+
+import threading
+import time
+
+import pytest
+
+from pdf_processor import CancelToken, ExtractionCancelled
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_cancel_stops_the_page_in_progress(processor, pdf_factory, monkeypatch, max_workers):
+    monkeypatch.setenv("STUB_OCR_DELAY", "30")
+    pdf = pdf_factory("one_page.pdf", ["scan:Slow page"])
+    token = CancelToken()
+    timer = threading.Timer(0.5, token.cancel)
+    
+    start = time.monotonic()
+    timer.start()
+    with pytest.raises(ExtractionCancelled) as cancelled:
+        list(processor(max_workers=max_workers).iter_pages(pdf, mode="ocr", cancel_token=token))
+    
+    assert time.monotonic() - start < 10
+    assert cancelled.value.completed_pages == 0
+
+
+def test_uncancelled_single_worker_job_finishes(processor, pdf_factory):
+    pdf = pdf_factory("two_pages.pdf", ["scan:One", "text:Two words here"])
+    
+    results = list(processor().iter_pages(pdf, mode="hybrid", cancel_token=CancelToken()))
+    
+    assert [(result.page, result.source) for result in results] == [(1, "ocr"), (2, "text")]
+    assert results[0].text.startswith("OCR ")
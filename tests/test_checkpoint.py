@@ -0,0 +1,70 @@
+"""Tests of checkpoint files and resuming interrupted jobs."""
+
+import json
+
+from ocr_checkpoint import OCRCheckpoint
+
+SETTINGS = {"mode": "ocr", "dpi": 300}
+
+
+def test_pages_survive_reopening(pdf_factory, tmp_path):
+    pdf = pdf_factory("doc.pdf", ["text:one"])
+    checkpoint = OCRCheckpoint(tmp_path / "job.checkpoint.jsonl")
+    
+    assert checkpoint.open(pdf, SETTINGS) == {}
+    checkpoint.add(1, "Page one", "ocr")
+    checkpoint.close()
+    
+    assert checkpoint.open(pdf, SETTINGS) == {1: ("Page one", "ocr", None)}
+    checkpoint.close()
+
+
+def test_truncated_line_is_dropped_and_overwritten(pdf_factory, tmp_path):
+    pdf = pdf_factory("doc.pdf", ["text:one"])
+    path = tmp_path / "job.checkpoint.jsonl"
+    checkpoint = OCRCheckpoint(path)
+    checkpoint.open(pdf, SETTINGS)
+    checkpoint.add(1, "Page one", "ocr")
+    checkpoint.add(2, "Page two", "ocr")
+    checkpoint.close()
+    # A crash while writing page 2 leaves half a line behind
+    path.write_bytes(path.read_bytes()[:-10])
+    
+    assert checkpoint.open(pdf, SETTINGS) == {1: ("Page one", "ocr", None)}
+    checkpoint.add(2, "Page two again", "ocr")
+    checkpoint.close()
+    
+    lines = path.read_bytes().splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[-1])["text"] == "Page two again"
+
+
+def test_checkpoint_of_other_settings_or_file_is_discarded(pdf_factory, tmp_path):
+    pdf = pdf_factory("doc.pdf", ["text:one"])
+    checkpoint = OCRCheckpoint(tmp_path / "job.checkpoint.jsonl")
+    checkpoint.open(pdf, SETTINGS)
+    checkpoint.add(1, "Page one", "ocr")
+    checkpoint.close()
+    
+    assert checkpoint.open(pdf, {**SETTINGS, "dpi": 200}) == {}
+    checkpoint.add(1, "Page one at 200 dpi", "ocr")
+    checkpoint.close()
+    
+    pdf_factory("doc.pdf", ["text:changed"])
+    assert checkpoint.open(pdf, {**SETTINGS, "dpi": 200}) == {}
+    checkpoint.close()
+
+
+def test_interrupted_job_resumes_unfinished_pages(processor, pdf_factory, tmp_path):
+    pdf = pdf_factory("doc.pdf", ["scan:First", "scan:Second", "scan:Third"])
+    path = tmp_path / "doc.checkpoint.jsonl"
+    extractor = processor()
+    first_run = extractor.extract_text_with_ocr(pdf, checkpoint=OCRCheckpoint(path))
+    # Keep the header and page 1, and cut page 2 short
+    lines = path.read_bytes().splitlines(keepends=True)
+    path.write_bytes(b"".join(lines[:2]) + lines[2][:5])
+    
+    results = list(extractor.iter_pages(pdf, mode="ocr", checkpoint=OCRCheckpoint(path)))
+    
+    assert [result.source for result in results] == ["checkpoint", "ocr", "ocr"]
+    assert extractor.extract_text_with_ocr(pdf, checkpoint=OCRCheckpoint(path)) == first_run
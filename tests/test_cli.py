@@ -0,0 +1,76 @@
+"""Tests of the batch command-line interface."""
+
+import cli
+
+
+def run_cli(*args):
+    return cli.main([*args, "--no-cache", "--engine", "pytesseract", "-q"])
+
+
+def test_second_run_ignores_searchable_pdfs(stub_tesseract, pdf_factory, tmp_path):
+    pdf_factory("report.v1.pdf", ["scan:Hello"])
+    
+    assert run_cli(str(tmp_path), "-r", "--formats", "txt", "pdf") == 0
+    assert run_cli(str(tmp_path), "-r", "--formats", "txt", "pdf", "--force") == 0
+    
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "report.v1.pdf", "report.v1.searchable.pdf", "report.v1.txt"
+    ]
+
+
+def test_glob_ignores_searchable_pdfs(tmp_path):
+    (tmp_path / "a.pdf").write_bytes(b"")
+    (tmp_path / "a.searchable.pdf").write_bytes(b"")
+    
+    inputs = cli.collect_inputs([str(tmp_path / "*.pdf")])
+    
+    assert [path for path, _ in inputs] == [str(tmp_path / "a.pdf")]
+
+
+def test_output_dir_keeps_dotted_names(tmp_path):
+    path = cli.output_path_for("in/report.v1.pdf", cli.Path("report.v1"), str(tmp_path))
+    assert path == tmp_path / "report.v1.txt"
+
+
+def test_clashing_outputs_are_refused(pdf_factory, tmp_path, capsys):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    pdf_factory("a/x.pdf", ["text:one"])
+    pdf_factory("b/x.pdf", ["text:two"])
+    
+    status = run_cli(str(tmp_path / "*" / "x.pdf"), "-o", str(tmp_path / "out"), "-m", "text")
+    
+    assert status == 2
+    assert "same output" in capsys.readouterr().err
+    assert not (tmp_path / "out").exists()
+
+
+def test_output_goes_next_to_the_pdf_by_default():
+    path = cli.output_path_for("in/report.v1.pdf", cli.Path("report.v1"), None)
+    assert path == cli.Path("in/report.v1.txt")
+
+
+def test_same_names_in_subfolders_are_kept_apart(stub_tesseract, pdf_factory, tmp_path):
+    (tmp_path / "in" / "a").mkdir(parents=True)
+    (tmp_path / "in" / "b").mkdir()
+    pdf_factory("in/a/x.pdf", ["text:one"])
+    pdf_factory("in/b/x.pdf", ["text:two"])
+    out = tmp_path / "out"
+    
+    assert run_cli(str(tmp_path / "in"), "-r", "-o", str(out), "-m", "text") == 0
+    
+    assert "one" in (out / "a" / "x.txt").read_text(encoding="utf-8")
+    assert "two" in (out / "b" / "x.txt").read_text(encoding="utf-8")
+
+
+def test_up_to_date_outputs_are_skipped(stub_tesseract, pdf_factory, tmp_path):
+    pdf_factory("doc.pdf", ["text:one"])
+    output = tmp_path / "doc.txt"
+    assert run_cli(str(tmp_path / "doc.pdf"), "-m", "text") == 0
+    output.write_text("kept", encoding="utf-8")
+    
+    assert run_cli(str(tmp_path / "doc.pdf"), "-m", "text") == 0
+    assert output.read_text(encoding="utf-8") == "kept"
+    
+    assert run_cli(str(tmp_path / "doc.pdf"), "-m", "text", "--force") == 0
+    assert "one" in output.read_text(encoding="utf-8")
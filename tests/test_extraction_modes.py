@@ -0,0 +1,42 @@
+"""Tests of the extraction modes and their entry points."""
+
+import pytest
+
+from pdf_processor import BLANK_PAGE_TEXT, EMPTY_RESULT_TEXT, EXTRACTION_MODES
+
+
+@pytest.mark.parametrize("mode", EXTRACTION_MODES)
+def test_extract_with_profile_supports_every_mode(processor, pdf_factory, tmp_path, mode):
+    pdf = pdf_factory("doc.pdf", ["text:Some native words", "scan:Scanned"])
+    
+    text, profile = processor().extract_with_profile(
+        pdf, mode=mode, report_path=str(tmp_path / "profile.csv")
+    )
+    
+    assert "--- Page 1 ---" in text
+    assert [page["page"] for page in profile.pages] == [1, 2]
+    assert (tmp_path / "profile.csv").exists()
+
+
+def test_extract_with_profile_rejects_unknown_mode(processor, pdf_factory):
+    pdf = pdf_factory("doc.pdf", ["text:Some native words"])
+    
+    with pytest.raises(ValueError, match="Unknown extraction mode"):
+        processor().extract_with_profile(pdf, mode="fast")
+
+
+@pytest.mark.parametrize("mode", ["hybrid", "regions"])
+def test_all_blank_document_reports_no_text(processor, pdf_factory, mode):
+    pdf = pdf_factory("blank.pdf", ["blank", "blank"])
+    
+    text, _ = processor().extract_with_profile(pdf, mode=mode)
+    
+    assert text == EMPTY_RESULT_TEXT[mode]
+
+
+def test_blank_pages_are_marked_among_others(processor, pdf_factory):
+    pdf = pdf_factory("doc.pdf", ["text:Some native words", "blank"])
+    
+    text = processor().extract_text_hybrid(pdf)
+    
+    assert "--- Page 2 ---\n" + BLANK_PAGE_TEXT in text
@@ -0,0 +1,47 @@
+"""Tests of page range selection."""
+
+import pytest
+
+from pdf_processor import parse_page_range
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("1-3,7", [1, 2, 3, 7]),
+    ("8-", [8, 9, 10]),
+    ("-2", [1, 2]),
+    ("3, 1 ,3", [1, 3]),
+    ("2-4,3-5", [2, 3, 4, 5]),
+    ("5-5", [5]),
+])
+def test_parse_page_range(spec, expected):
+    assert parse_page_range(spec, 10) == expected
+
+
+@pytest.mark.parametrize("spec, message", [
+    ("a", "Invalid page range"),
+    ("1-x", "Invalid page range"),
+    ("0", "outside pages 1-10"),
+    ("9-11", "outside pages 1-10"),
+    ("5-3", "outside pages 1-10"),
+    (",", "No pages selected"),
+])
+def test_parse_page_range_rejects(spec, message):
+    with pytest.raises(ValueError, match=message):
+        parse_page_range(spec, 10)
+
+
+def test_iter_pages_yields_only_selected_pages(processor, pdf_factory):
+    pdf = pdf_factory("doc.pdf", ["text:one", "text:two", "text:three", "text:four"])
+    
+    pages = [page.page for page in processor().iter_pages(pdf, mode="text", pages="2,4")]
+    
+    assert pages == [2, 4]
+
+
+def test_extraction_keeps_original_page_numbers(processor, pdf_factory):
+    pdf = pdf_factory("doc.pdf", ["text:one", "text:two", "scan:three"])
+    
+    text = processor().extract_text_hybrid(pdf, pages="2-")
+    
+    assert "--- Page 1 ---" not in text
+    assert "--- Page 2 ---" in text and "--- Page 3 ---" in text
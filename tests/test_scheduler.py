@@ -0,0 +1,67 @@
+"""Tests of memory admission and how waiting for it is reported."""
+
+import threading
+import time
+
+from ocr_profile import ExtractionProfile
+from scheduler import MemoryBudget
+
+MB = 1024 * 1024
+
+
+def acquire_in_thread(budget, nbytes, admitted, name):
+    def run():
+        budget.acquire(nbytes)
+        admitted.append(name)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for_queue(budget, length):
+    deadline = time.monotonic() + 5
+    while len(budget._queue) < length and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_budget_admits_in_request_order():
+    budget = MemoryBudget(limit_mb=10)
+    budget.acquire(8 * MB)
+    admitted = []
+    
+    large = acquire_in_thread(budget, 6 * MB, admitted, "large")
+    wait_for_queue(budget, 1)
+    small = acquire_in_thread(budget, 1 * MB, admitted, "small")
+    wait_for_queue(budget, 2)
+    time.sleep(0.3)
+    # The small request fits but must not overtake the large one
+    assert admitted == []
+    
+    budget.release(8 * MB)
+    large.join(5)
+    small.join(5)
+    assert admitted == ["large", "small"]
+    assert budget.used_bytes == 7 * MB
+
+
+def test_page_larger_than_budget_is_admitted_alone():
+    budget = MemoryBudget(limit_mb=1)
+    budget.acquire(5 * MB)
+    
+    assert budget.used_bytes == 5 * MB
+    budget.release(5 * MB)
+    assert budget.used_bytes == 0
+
+
+def test_admission_wait_is_reported_as_wait_s(processor, pdf_factory):
+    pdf = pdf_factory("scan.pdf", ["scan:Waiting page"])
+    budget = MemoryBudget(limit_mb=1)
+    budget.acquire(1)
+    threading.Timer(1.0, budget.release, (1,)).start()
+    
+    profile = ExtractionProfile()
+    list(processor().iter_pages(pdf, mode="ocr", profile=profile, memory=budget.share()))
+    
+    page = profile.pages[0]
+    assert page["wait_s"] >= 0.8
+    assert page["render_s"] < 0.5
@@ -0,0 +1,63 @@
+"""Tests of the local extraction server."""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from server import ExtractionServer, parse_timeout
+
+
+@pytest.fixture
+def server(processor):
+    server = ExtractionServer(processor(), port=0, ocr_workers=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(5)
+
+
+def post(server, path, body):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=30)
+    try:
+        connection.request("POST", path, body, {"Content-Type": "application/pdf"})
+        response = connection.getresponse()
+        return response.status, response.read().decode("utf-8")
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("value", ["2.5", "1e3"])
+def test_parse_timeout_accepts_positive_seconds(value):
+    assert parse_timeout(value) == float(value)
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "inf", "nan", "soon"])
+def test_parse_timeout_rejects(value):
+    with pytest.raises(ValueError):
+        parse_timeout(value)
+
+
+@pytest.mark.parametrize("value", ["0", "-5", "inf", "nan", "soon"])
+def test_invalid_page_timeout_is_a_bad_request(server, pdf_factory, value):
+    with open(pdf_factory("doc.pdf", ["text:one"]), "rb") as f:
+        body = f.read()
+    
+    status, text = post(server, f"/extract?mode=text&page_timeout={value}", body)
+    
+    assert status == 400
+    assert "page_timeout" in json.loads(text)["error"]
+
+
+def test_extract_streams_pages(server, pdf_factory):
+    with open(pdf_factory("doc.pdf", ["text:one", "scan:two"]), "rb") as f:
+        body = f.read()
+    
+    status, text = post(server, "/extract?mode=hybrid&page_timeout=30", body)
+    
+    lines = [json.loads(line) for line in text.splitlines()]
+    assert status == 200
+    assert [line.get("page") for line in lines[:2]] == [1, 2]
@@ -0,0 +1,103 @@
+"""Tests of the shared memory buffers that carry page images to OCR workers."""
+
+import threading
+from multiprocessing import shared_memory
+
+import pytest
+from PIL import Image
+
+from shared_buffers import SharedBufferPool, load_shared_page
+
+pytestmark = pytest.mark.skipif(
+    not SharedBufferPool.available(), reason="needs shared memory support"
+)
+
+
+def share_image(pool, image, check=None):
+    return pool.share(image.tobytes(), image.mode, image.width, image.height, 150, check)
+
+
+def block_exists(name):
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    block.close()
+    return True
+
+
+@pytest.fixture
+def pool():
+    pool = SharedBufferPool(slots=1)
+    yield pool
+    pool.close()
+
+
+def test_shared_page_round_trips(pool):
+    image = Image.new("RGB", (40, 30), (10, 20, 30))
+    
+    page = share_image(pool, image)
+    loaded = load_shared_page(page)
+    pool.release(page.name)
+    
+    assert loaded.tobytes() == image.tobytes()
+    assert loaded.info["dpi"] == (150, 150)
+
+
+def test_released_buffer_is_reused(pool):
+    image = Image.new("L", (100, 100))
+    
+    first = share_image(pool, image)
+    pool.release(first.name)
+    second = share_image(pool, image)
+    pool.release(second.name)
+    
+    assert second.name == first.name
+    assert pool.allocations == 1
+
+
+def test_share_waits_for_a_released_buffer(pool):
+    image = Image.new("L", (10, 10))
+    first = share_image(pool, image)
+    threading.Timer(0.5, pool.release, (first.name,)).start()
+    
+    second = share_image(pool, image)
+    pool.release(second.name)
+    
+    assert pool.wait_s >= 0.3
+
+
+def test_check_abandons_the_wait(pool):
+    image = Image.new("L", (10, 10))
+    page = share_image(pool, image)
+    
+    def check():
+        raise TimeoutError
+    
+    with pytest.raises(TimeoutError):
+        share_image(pool, image, check)
+    pool.release(page.name)
+
+
+def test_close_keeps_buffers_in_use_until_released(pool):
+    image = Image.new("L", (20, 20), 128)
+    page = share_image(pool, image)
+    
+    pool.close()
+    assert load_shared_page(page).tobytes() == image.tobytes()
+    
+    pool.release(page.name)
+    assert not block_exists(page.name)
+
+
+def test_close_frees_idle_buffers_and_refuses_new_pages(pool):
+    image = Image.new("L", (20, 20))
+    page = share_image(pool, image)
+    pool.release(page.name)
+    
+    pool.close()
+    
+    assert not block_exists(page.name)
+    with pytest.raises(OSError):
+        share_image(pool, image)
+
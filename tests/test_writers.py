@@ -0,0 +1,113 @@
+"""Tests of the text, JSON Lines, hOCR and searchable PDF writers."""
+
+import json
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pytest
+
+from pdf_processor import PageResult
+from structured_output import (
+    WRITER_CLASSES, output_paths, parse_tsv, text_layer_words, words_to_points
+)
+
+TSV = (
+    "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\t"
+    "left\ttop\twidth\theight\tconf\ttext\n"
+    "4\t1\t1\t1\t1\t0\t100\t100\t400\t40\t-1\t\n"
+    "5\t1\t1\t1\t1\t1\t100\t100\t200\t40\t91.5\tHello\n"
+    "5\t1\t1\t1\t1\t2\t320\t100\t180\t40\t88\tworld\n"
+    "5\t1\t1\t1\t1\t3\t520\t100\t10\t40\t0\t \n"
+)
+
+
+def write_all(pdf, results, output_base):
+    paths = output_paths(Path(output_base), WRITER_CLASSES)
+    for name, path in paths.items():
+        writer = WRITER_CLASSES[name](path, pdf)
+        for result in results:
+            writer.write_page(result)
+        writer.close()
+    return paths
+
+
+def test_parse_tsv_keeps_only_words():
+    words = parse_tsv(TSV)
+    
+    assert [word["text"] for word in words] == ["Hello", "world"]
+    assert words[0]["conf"] == 91.5 and words[0]["line"] == 1
+
+
+def test_words_to_points_scales_and_offsets():
+    words = words_to_points(parse_tsv(TSV), dpi=144, offset=(20, 10))
+    
+    assert words[0]["bbox"] == [60.0, 55.0, 160.0, 75.0]
+
+
+def test_text_layer_words_have_no_confidence(pdf_factory):
+    pdf = pdf_factory("doc.pdf", ["text:Native words"])
+    
+    with fitz.open(pdf) as doc:
+        words = text_layer_words(doc[0])
+    
+    assert [word["text"] for word in words] == ["Native", "words"]
+    assert all(word["conf"] is None for word in words)
+
+
+def test_writers_save_every_format(processor, pdf_factory, tmp_path):
+    pdf = pdf_factory("doc.pdf", ["text:Native words", "scan:Scanned"])
+    results = list(processor().iter_pages(pdf, mode="hybrid", layout=True))
+    
+    paths = write_all(pdf, results, tmp_path / "out" / "doc")
+    
+    text = paths["txt"].read_text(encoding="utf-8")
+    assert text.startswith("--- Page 1 ---\nNative words")
+    assert "--- Page 2 ---\nOCR" in text
+    
+    records = [json.loads(line) for line in paths["json"].read_text(encoding="utf-8").splitlines()]
+    assert [record["source"] for record in records] == ["text", "ocr"]
+    assert records[1]["words"][0]["text"] == "OCR"
+    assert records[1]["width"] == 300
+    
+    hocr = paths["hocr"].read_text(encoding="utf-8")
+    assert hocr.count("class='ocr_page'") == 2
+    assert "x_wconf 96" in hocr
+    
+    with fitz.open(paths["pdf"]) as doc:
+        assert doc.page_count == 2
+        assert doc[0].get_text().split() == ["Native", "words"]
+        assert doc[1].get_text().split() == ["OCR"]
+    assert not list(tmp_path.glob("out/*.partial"))
+
+
+def test_searchable_pdf_keeps_only_written_pages(processor, pdf_factory, tmp_path):
+    pdf = pdf_factory("doc.pdf", ["scan:One", "scan:Two", "scan:Three"])
+    results = list(processor().iter_pages(pdf, mode="ocr", pages="2", layout=True))
+    
+    paths = write_all(pdf, results, tmp_path / "doc")
+    
+    with fitz.open(paths["pdf"]) as doc:
+        assert doc.page_count == 1
+        assert doc[0].get_text().split() == ["OCR"]
+
+
+def test_aborted_writer_leaves_nothing(tmp_path):
+    path = tmp_path / "doc.txt"
+    writer = WRITER_CLASSES["txt"](path, "doc.pdf")
+    writer.write_page(PageResult(1, "Partial", "ocr", {}))
+    
+    writer.abort()
+    
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("word", ["Grüße", "Привет", "日本語", "한국어"])
+def test_searchable_pdf_keeps_non_latin_words(processor, pdf_factory, tmp_path, monkeypatch, word):
+    monkeypatch.setenv("STUB_OCR_WORD", word)
+    pdf = pdf_factory("doc.pdf", ["scan:Scanned"])
+    results = list(processor().iter_pages(pdf, mode="ocr", layout=True))
+    
+    paths = write_all(pdf, results, tmp_path / "doc")
+    
+    with fitz.open(paths["pdf"]) as doc:
+        assert doc[0].get_text().split() == [word]